@@ -0,0 +1,33 @@
+"""
+ASGI config for pod_project project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Besides the Django application, it serves the live push channel (pod.live.push)
+on LIVE_PUSH_PATH, used when USE_LIVE_PUSH is True.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
+"""
+
+import os
+from django.core.asgi import get_asgi_application
+from django.conf import settings
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pod.settings")
+proxy_host = getattr(settings, "PROXY_HOST", None)
+proxy_port = getattr(settings, "PROXY_PORT", None)
+if proxy_host and proxy_port:
+    os.environ["http_proxy"] = os.environ["https_proxy"] = f"{proxy_host}:{proxy_port}"
+
+django_application = get_asgi_application()
+
+# The applications are loaded by get_asgi_application
+from pod.live.push import LIVE_PUSH_PATH, push_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """Serve the live push channel, and Django for all the other requests."""
+    if scope["type"] == "http" and scope["path"] == LIVE_PUSH_PATH:
+        await push_application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -0,0 +1,44 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('podfile', '0001_initial'),
+        ('authentication', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('sites', '0002_alter_domain_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='owner',
+            name='userpicture',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='podfile.customimagemodel', verbose_name='Picture'),
+        ),
+        migrations.AddField(
+            model_name='groupsite',
+            name='group',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='auth.group'),
+        ),
+        migrations.AddField(
+            model_name='groupsite',
+            name='sites',
+            field=models.ManyToManyField(to='sites.Site'),
+        ),
+        migrations.AddField(
+            model_name='accessgroup',
+            name='sites',
+            field=models.ManyToManyField(to='sites.Site'),
+        ),
+        migrations.AddField(
+            model_name='accessgroup',
+            name='users',
+            field=models.ManyToManyField(blank=True, to='authentication.Owner'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BBB_Meeting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('meeting_id', models.CharField(help_text='Id of the BBB meeting.', max_length=200, verbose_name='Meeting id')),
+                ('internal_meeting_id', models.CharField(help_text='Internal id of the BBB meeting.', max_length=200, verbose_name='Internal meeting id')),
+                ('meeting_name', models.CharField(help_text='Name of the BBB meeting.', max_length=200, verbose_name='Meeting name')),
+                ('session_date', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Session date')),
+                ('encoding_step', models.IntegerField(choices=[(0, 'Publish is possible'), (1, 'Waiting for encoding'), (2, 'Encoding in progress'), (3, 'Already published')], default=0, help_text='Encoding step for conversion of the BBB presentation to video file.', verbose_name='Encoding step')),
+                ('recorded', models.BooleanField(default=False, help_text='BBB presentation recorded?', verbose_name='Recorded')),
+                ('recording_available', models.BooleanField(default=False, help_text='BBB presentation recording is available?', verbose_name='Recording available')),
+                ('recording_url', models.CharField(help_text='URL of the recording of the BBB presentation.', max_length=200, verbose_name='Recording url')),
+                ('thumbnail_url', models.CharField(help_text='URL of the recording thumbnail of the BBB presentation.', max_length=200, verbose_name='Thumbnail url')),
+                ('last_date_in_progress', models.DateTimeField(default=django.utils.timezone.now, help_text='Last date where BBB session was in progress.', verbose_name='Last date in progress')),
+                ('encoded_by', models.ForeignKey(blank=True, help_text='User who converted the BBB presentation to video file.', limit_choices_to={'is_staff': True}, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Meeting',
+                'verbose_name_plural': 'Meetings',
+                'ordering': ['session_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Livestream',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateTimeField(default=django.utils.timezone.now, help_text='Start date of the live.', verbose_name='Start date')),
+                ('end_date', models.DateTimeField(blank=True, help_text='End date of the live.', null=True, verbose_name='End date')),
+                ('status', models.IntegerField(choices=[(0, 'Live not started'), (1, 'Live in progress'), (2, 'Live stopped')], default=0, verbose_name='Live status')),
+                ('server', models.CharField(blank=True, help_text='Server/process performing the live.', max_length=20, null=True, verbose_name='Server')),
+                ('is_restricted', models.BooleanField(default=False, help_text='Is live only accessible to authenticated users?', verbose_name='Restricted access')),
+                ('broadcaster_id', models.IntegerField(blank=True, help_text='Broadcaster in charge to perform live.', null=True, verbose_name='Broadcaster')),
+                ('show_chat', models.BooleanField(default=True, help_text='Do you want to show the public chat in the live?', verbose_name='Show public chat')),
+                ('download_meeting', models.BooleanField(default=False, help_text='Do you want to save the video of this meeting, at the end of the live, directly in “Dashboard”?', verbose_name='Save meeting in dashboard')),
+                ('enable_chat', models.BooleanField(default=False, help_text='Do you want a chat on the live page for students? Messages sent in this live page’s chat will end up in BigBlueButton’s public chat.', verbose_name='Enable chat')),
+                ('redis_hostname', models.CharField(blank=True, help_text='Redis hostname, useful for chat', max_length=200, null=True, verbose_name='Redis hostname')),
+                ('redis_port', models.IntegerField(blank=True, help_text='Redis port, useful for chat', null=True, verbose_name='Redis port')),
+                ('redis_channel', models.CharField(blank=True, help_text='Redis channel, useful for chat', max_length=200, null=True, verbose_name='Redis channel')),
+                ('meeting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='bbb.bbb_meeting', verbose_name='Meeting')),
+                ('user', models.ForeignKey(blank=True, help_text='Username / User id, that want to perform the live.', limit_choices_to={'is_staff': True}, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Livestream',
+                'verbose_name_plural': 'Livestreams',
+                'ordering': ['start_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Attendee',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('full_name', models.CharField(help_text='Full name of the user from BBB.', max_length=200, verbose_name='Full name')),
+                ('role', models.CharField(help_text='Role of the user from BBB.', max_length=200, verbose_name='User role')),
+                ('username', models.CharField(help_text='Username / User id, if the BBB user was matching a Pod user.', max_length=150, verbose_name='Username / User id')),
+                ('meeting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='bbb.bbb_meeting', verbose_name='Meeting')),
+                ('user', models.ForeignKey(blank=True, help_text='User from the Pod database, if user found.', limit_choices_to={'is_staff': True}, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Attendee',
+                'verbose_name_plural': 'Attendees',
+                'ordering': ['full_name'],
+            },
+        ),
+    ]
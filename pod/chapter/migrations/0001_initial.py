@@ -0,0 +1,28 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Chapter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=100, verbose_name='title')),
+                ('slug', models.SlugField(editable=False, help_text='Used to access this instance, the "slug" is a short label containing only letters, numbers, underscore or dash top.', max_length=105, unique=True, verbose_name='slug')),
+                ('time_start', models.PositiveIntegerField(default=0, help_text='Start time of the chapter, in seconds.', verbose_name='Start time')),
+            ],
+            options={
+                'verbose_name': 'Chapter',
+                'verbose_name_plural': 'Chapters',
+                'ordering': ['time_start'],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('video', '0001_initial'),
+        ('chapter', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chapter',
+            name='video',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='video.video', verbose_name='video'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='chapter',
+            unique_together={('title', 'time_start', 'video')},
+        ),
+    ]
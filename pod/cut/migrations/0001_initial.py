@@ -0,0 +1,27 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CutVideo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.TimeField()),
+                ('end', models.TimeField()),
+                ('duration', models.CharField(max_length=10)),
+            ],
+            options={
+                'verbose_name': 'Video cut',
+                'verbose_name_plural': 'Video cuts',
+            },
+        ),
+    ]
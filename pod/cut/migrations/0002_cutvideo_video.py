@@ -0,0 +1,22 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('cut', '0001_initial'),
+        ('video', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cutvideo',
+            name='video',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='video.video'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+import ckeditor.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('podfile', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Enrichment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=100, verbose_name='title')),
+                ('slug', models.SlugField(editable=False, help_text='Used to access this instance, the "slug" is a short label containing only letters, numbers, underscore or dash top.', max_length=105, unique=True, verbose_name='slug')),
+                ('stop_video', models.BooleanField(default=False, help_text='The video will pause when displaying the enrichment.', verbose_name='Stop video')),
+                ('start', models.PositiveIntegerField(default=0, help_text='Start of enrichment display in seconds.', verbose_name='Start')),
+                ('end', models.PositiveIntegerField(default=1, help_text='End of enrichment display in seconds.', verbose_name='End')),
+                ('type', models.CharField(blank=True, choices=[('image', 'image'), ('richtext', 'richtext'), ('weblink', 'weblink'), ('document', 'document'), ('embed', 'embed')], max_length=10, null=True, verbose_name='Type')),
+                ('richtext', ckeditor.fields.RichTextField(blank=True, verbose_name='Richtext')),
+                ('weblink', models.URLField(blank=True, null=True, verbose_name='Web link')),
+                ('embed', models.TextField(blank=True, help_text='Paste here a code from an external source to embed it.', null=True, verbose_name='Embed code')),
+            ],
+            options={
+                'verbose_name': 'Enrichment',
+                'verbose_name_plural': 'Enrichments',
+                'ordering': ['start'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EnrichmentGroup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+            options={
+                'verbose_name': 'Enrichment Video Group',
+                'verbose_name_plural': 'Enrichment Video Groups',
+                'ordering': ['video'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EnrichmentVtt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('src', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='podfile.customfilemodel', verbose_name='Subtitle file')),
+            ],
+            options={
+                'verbose_name': 'Enrichment Vtt',
+                'verbose_name_plural': 'Enrichments Vtt',
+                'ordering': ['video'],
+            },
+        ),
+    ]
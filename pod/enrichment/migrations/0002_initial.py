@@ -0,0 +1,49 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('podfile', '0001_initial'),
+        ('enrichment', '0001_initial'),
+        ('video', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrichmentvtt',
+            name='video',
+            field=models.OneToOneField(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='video.video', verbose_name='Video'),
+        ),
+        migrations.AddField(
+            model_name='enrichmentgroup',
+            name='groups',
+            field=models.ManyToManyField(blank=True, help_text='Select one or more groups who can access to the enrichment of the video', to='auth.Group', verbose_name='Groups'),
+        ),
+        migrations.AddField(
+            model_name='enrichmentgroup',
+            name='video',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='video.video', verbose_name='Video'),
+        ),
+        migrations.AddField(
+            model_name='enrichment',
+            name='document',
+            field=models.ForeignKey(blank=True, help_text='Integrate a document (PDF, text, html)', null=True, on_delete=django.db.models.deletion.CASCADE, to='podfile.customfilemodel', verbose_name='Document'),
+        ),
+        migrations.AddField(
+            model_name='enrichment',
+            name='image',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='podfile.customimagemodel', verbose_name='Image'),
+        ),
+        migrations.AddField(
+            model_name='enrichment',
+            name='video',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='video.video', verbose_name='video'),
+        ),
+    ]
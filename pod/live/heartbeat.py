@@ -0,0 +1,220 @@
+"""Esup-Pod live heartbeat stores.
+
+When USE_HEARTBEAT_CACHE is True, the heartbeats of the viewers are kept
+in Redis instead of the HeartBeat table, and written in the events
+by the live_viewcounter command. The cache must use django_redis.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+from .models import Event
+
+VIEW_EXPIRATION_DELAY = getattr(settings, "VIEW_EXPIRATION_DELAY", 60)
+TEST_SETTINGS = getattr(settings, "TEST_SETTINGS", False)
+
+# Record the heartbeat and return the number of viewers in one round trip.
+# KEYS: viewers sorted set, users hash, max viewers hash, events set
+# ARGV: viewkey, now, expiration delay, user id, event id
+BEAT_SCRIPT = """
+redis.call("zadd", KEYS[1], ARGV[2], ARGV[1])
+redis.call("zremrangebyscore", KEYS[1], "-inf", ARGV[2] - ARGV[3])
+redis.call("expire", KEYS[1], ARGV[3])
+if ARGV[4] ~= "" then
+    redis.call("hsetnx", KEYS[2], ARGV[1], ARGV[4])
+    redis.call("expire", KEYS[2], ARGV[3])
+end
+local count = redis.call("zcard", KEYS[1])
+local max_viewers = tonumber(redis.call("hget", KEYS[3], ARGV[5]) or "0")
+if count > max_viewers then
+    redis.call("hset", KEYS[3], ARGV[5], count)
+end
+redis.call("sadd", KEYS[4], ARGV[5])
+return count
+"""
+
+heartbeat_store = None
+heartbeat_store_lock = threading.Lock()
+
+
+class MemoryHeartbeatStore:
+    """Heartbeats of the viewers kept in the memory of the process, for the tests."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # event id: {viewkey: (last heartbeat, user id)} from the oldest heartbeat
+        self.viewers = {}
+        self.max_viewers = {}
+
+    def remove_expired(self, event_id, now):
+        viewers = self.viewers.get(event_id, {})
+        while viewers and next(iter(viewers.values()))[0] < now - VIEW_EXPIRATION_DELAY:
+            viewers.popitem(last=False)
+        return viewers
+
+    def beat(self, event_id, viewkey, user_id=None):
+        """Record a heartbeat of the viewer and return the number of viewers."""
+        now = time.time()
+        with self.lock:
+            viewers = self.viewers.setdefault(event_id, OrderedDict())
+            previous_user_id = viewers.pop(viewkey, (now, None))[1]
+            viewers[viewkey] = (now, previous_user_id or user_id)
+            count = len(self.remove_expired(event_id, now))
+            self.max_viewers[event_id] = max(self.max_viewers.get(event_id, 0), count)
+            return count
+
+    def count(self, event_id):
+        """Get the number of viewers of the event."""
+        with self.lock:
+            return len(self.remove_expired(event_id, time.time()))
+
+    def get_events(self):
+        """Get the ids of the events which had viewers."""
+        with self.lock:
+            return list(self.max_viewers)
+
+    def get_viewers(self, event_id):
+        """Get the max number of viewers and the ids of the users watching."""
+        with self.lock:
+            viewers = self.remove_expired(event_id, time.time())
+            user_ids = {user_id for last, user_id in viewers.values() if user_id}
+            return self.max_viewers.get(event_id, 0), user_ids
+
+    def remove_event(self, event_id):
+        """Forget an event without viewers."""
+        with self.lock:
+            if not self.remove_expired(event_id, time.time()):
+                self.viewers.pop(event_id, None)
+                self.max_viewers.pop(event_id, None)
+
+
+class RedisHeartbeatStore:
+    """Heartbeats of the viewers kept in Redis sorted sets by last heartbeat."""
+
+    def __init__(self, connection, prefix="pod:live_heartbeat"):
+        self.connection = connection
+        self.prefix = prefix
+        self.beat_script = connection.register_script(BEAT_SCRIPT)
+
+    def get_key(self, name, event_id=None):
+        if event_id is None:
+            return "%s:%s" % (self.prefix, name)
+        return "%s:%s:%s" % (self.prefix, name, event_id)
+
+    def beat(self, event_id, viewkey, user_id=None):
+        """Record a heartbeat of the viewer and return the number of viewers."""
+        return self.beat_script(
+            keys=[
+                self.get_key("viewers", event_id),
+                self.get_key("users", event_id),
+                self.get_key("max"),
+                self.get_key("events"),
+            ],
+            args=[viewkey, time.time(), VIEW_EXPIRATION_DELAY, user_id or "", event_id],
+        )
+
+    def count(self, event_id):
+        """Get the number of viewers of the event."""
+        key = self.get_key("viewers", event_id)
+        pipeline = self.connection.pipeline()
+        pipeline.zremrangebyscore(key, "-inf", time.time() - VIEW_EXPIRATION_DELAY)
+        pipeline.zcard(key)
+        return pipeline.execute()[1]
+
+    def get_events(self):
+        """Get the ids of the events which had viewers."""
+        return [
+            int(event_id) for event_id in self.connection.smembers(self.get_key("events"))
+        ]
+
+    def get_viewers(self, event_id):
+        """Get the max number of viewers and the ids of the users watching."""
+        viewers_key = self.get_key("viewers", event_id)
+        users_key = self.get_key("users", event_id)
+        pipeline = self.connection.pipeline()
+        pipeline.zremrangebyscore(
+            viewers_key, "-inf", time.time() - VIEW_EXPIRATION_DELAY
+        )
+        pipeline.zrange(viewers_key, 0, -1)
+        pipeline.hgetall(users_key)
+        pipeline.hget(self.get_key("max"), event_id)
+        removed, viewkeys, users, max_viewers = pipeline.execute()
+        expired = set(users) - set(viewkeys)
+        if expired:
+            self.connection.hdel(users_key, *expired)
+        user_ids = {int(users[viewkey]) for viewkey in viewkeys if viewkey in users}
+        return int(max_viewers or 0), user_ids
+
+    def remove_event(self, event_id):
+        """Forget an event without viewers."""
+        if not self.count(event_id):
+            pipeline = self.connection.pipeline()
+            pipeline.srem(self.get_key("events"), event_id)
+            pipeline.hdel(self.get_key("max"), event_id)
+            pipeline.execute()
+
+
+def get_heartbeat_store():
+    """Get the heartbeat store of the process, in the Redis of the cache.
+
+    The heartbeats are shared by the web workers and the live_viewcounter
+    command, so only the tests may keep them in the memory of the process.
+    """
+    global heartbeat_store
+    with heartbeat_store_lock:
+        if heartbeat_store is None:
+            try:
+                from django_redis import get_redis_connection
+
+                heartbeat_store = RedisHeartbeatStore(get_redis_connection("default"))
+            except (ImportError, NotImplementedError):
+                if not TEST_SETTINGS:
+                    raise ImproperlyConfigured(
+                        "USE_HEARTBEAT_CACHE needs a default cache using django_redis"
+                    )
+                heartbeat_store = MemoryHeartbeatStore()
+        return heartbeat_store
+
+
+def save_heartbeats():
+    """Write the max viewers and the viewers of the events from the store.
+
+    The events without viewers are then removed from the store.
+    Return the number of events updated.
+    """
+    store = get_heartbeat_store()
+    event_ids = store.get_events()
+    events = list(Event.objects.filter(id__in=event_ids))
+    viewers = {}
+    for event in events:
+        max_viewers, user_ids = store.get_viewers(event.id)
+        event.max_viewers = max(event.max_viewers, max_viewers)
+        # like the HeartBeat table, viewers are only saved during the event
+        if event.is_current():
+            viewers[event.id] = user_ids
+    through_model = Event.viewers.through
+    saved_viewers = through_model.objects.filter(event_id__in=viewers)
+    removed_ids = []
+    for through_id, event_id, user_id in saved_viewers.values_list(
+        "id", "event_id", "user_id"
+    ):
+        if user_id in viewers[event_id]:
+            viewers[event_id].remove(user_id)
+        else:
+            removed_ids.append(through_id)
+    with transaction.atomic():
+        Event.objects.bulk_update(events, ["max_viewers"])
+        through_model.objects.filter(id__in=removed_ids).delete()
+        through_model.objects.bulk_create(
+            through_model(event_id=event_id, user_id=user_id)
+            for event_id, user_ids in viewers.items()
+            for user_id in user_ids
+        )
+    for event_id in event_ids:
+        store.remove_event(event_id)
+    return len(events)
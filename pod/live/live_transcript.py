@@ -1,7 +1,7 @@
 from django.conf import settings
-from vosk import Model, KaldiRecognizer, SetLogLevel
-from webvtt import WebVTT, Caption
 from pod.main.tasks import task_end_live_transcription, task_start_live_transcription
+import os
+import select
 import threading
 import time
 import json
@@ -9,10 +9,21 @@ import subprocess
 
 LIVE_CELERY_TRANSCRIPTION = getattr(settings, "LIVE_CELERY_TRANSCRIPTION ", False)
 LIVE_VOSK_MODEL = getattr(settings, "LIVE_VOSK_MODEL", None)
+USE_LIVE_TRANSCRIPTION = getattr(settings, "USE_LIVE_TRANSCRIPTION", False)
+if USE_LIVE_TRANSCRIPTION:
+    from vosk import Model, KaldiRecognizer, SetLogLevel
+
+    SetLogLevel(-1)
+
 __SAMPLE_RATE__ = 16000
+# seconds to wait before reconnecting to the stream
+__RECONNECT_DELAY__ = 5
+# minimum seconds between two updates of the partial caption
+__PARTIAL_INTERVAL__ = 0.5
+# seconds to wait for the audio before checking if the transcription must stop
+__READ_TIMEOUT__ = 1
 threads = {}
 threads_to_stop = []
-SetLogLevel(-1)
 
 
 def timestring(seconds):
@@ -20,104 +31,143 @@ def timestring(seconds):
     seconds = seconds % 60
     hours = int(minutes / 60)
     minutes = int(minutes % 60)
-    return "%i:%02i:%06.3f" % (hours, minutes, seconds)
+    return "%02i:%02i:%06.3f" % (hours, minutes, seconds)
+
+
+def get_transcription_command(url):
+    """Get the ffmpeg command decoding the audio of the live stream to PCM."""
+    command = ["ffmpeg", "-loglevel", "quiet"]
+    if url.startswith("http"):
+        command += ["-reconnect", "1", "-reconnect_streamed", "1"]
+        command += ["-reconnect_delay_max", str(__RECONNECT_DELAY__)]
+    command += ["-i", url, "-vn", "-acodec", "pcm_s16le", "-ac", "1"]
+    command += ["-ar", str(__SAMPLE_RATE__), "-f", "s16le", "-"]
+    return command
+
+
+class LiveCaptions:
+    """
+    VTT files of a live transcription.
+
+    The final captions are appended to the VTT file, which the player reads
+    from its last position. The partial caption being recognized is written
+    in a small separate file, replaced at each update.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.partial_filepath = filepath + "_partial.vtt"
+        self.partial_time = 0
+        self.has_partial = False
+
+    def get_cue(self, words, offset):
+        """Get the VTT cue of the words of a recognizer result."""
+        return "\n%s --> %s\n%s\n" % (
+            timestring(offset + words[0]["start"]),
+            timestring(offset + words[-1]["end"]),
+            " ".join([w["word"] for w in words]),
+        )
+
+    def write_partial(self, cue):
+        """Replace the partial caption file, so that the player never reads a part."""
+        tmp_filepath = self.partial_filepath + ".tmp"
+        with open(tmp_filepath, "w") as vtt_file:
+            vtt_file.write("WEBVTT\n" + cue)
+        os.replace(tmp_filepath, self.partial_filepath)
+        self.has_partial = cue != ""
+
+    def clear(self):
+        """Empty the VTT files."""
+        with open(self.filepath, "w") as vtt_file:
+            vtt_file.write("WEBVTT\n")
+        self.write_partial("")
+
+    def add_result(self, result, offset):
+        """Append the caption of a final recognizer result, it ends the partial one."""
+        words = json.loads(result).get("result")
+        if words:
+            with open(self.filepath, "a") as vtt_file:
+                vtt_file.write(self.get_cue(words, offset))
+        if self.has_partial:
+            self.write_partial("")
+
+    def set_partial(self, result, offset):
+        """Write the partial recognizer result, at most every __PARTIAL_INTERVAL__ s."""
+        words = json.loads(result).get("partial_result")
+        if not words or time.time() - self.partial_time < __PARTIAL_INTERVAL__:
+            return
+        self.partial_time = time.time()
+        self.write_partial(self.get_cue(words, offset))
 
 
-def transcribe(url, slug, model, filepath):  # noqa: C901
+def read_audio(process, must_stop):
+    """
+    Read the PCM audio of the process until it ends or must_stop returns True.
+
+    The output is polled, so that a stalled stream does not delay the stop.
+    A sample is 2 bytes: an odd byte is kept for the next chunk.
+    """
+    output = process.stdout.fileno()
+    remainder = b""
+    while not must_stop():
+        ready, writable, errors = select.select([output], [], [], __READ_TIMEOUT__)
+        if not ready:
+            continue
+        # 4000 bytes = 0.125s of audio
+        data = os.read(output, 4000)
+        if len(data) == 0:
+            return
+        data = remainder + data
+        end = len(data) - len(data) % 2
+        remainder = data[end:]
+        if end > 0:
+            yield data[:end]
+
+
+def transcribe_stream(url, trans_model, captions, offset, must_stop):
+    """
+    Transcribe the live stream until it ends or must_stop returns True.
+
+    Captions are timed from the start of the transcription:
+    offset is the time in seconds at which this connection to the stream started.
+    """
+    rec = KaldiRecognizer(trans_model, __SAMPLE_RATE__)
+    rec.SetWords(True)
+    rec.SetPartialWords(True)
+    with subprocess.Popen(
+        get_transcription_command(url),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    ) as process:
+        for data in read_audio(process, must_stop):
+            if rec.AcceptWaveform(data):
+                captions.add_result(rec.Result(), offset)
+            else:
+                captions.set_partial(rec.PartialResult(), offset)
+        process.kill()
+    captions.add_result(rec.FinalResult(), offset)
+
+
+def transcribe(url, slug, model, filepath):
     # if url.endswith(".m3u8"):
     #    url = url.split(".m3u8")[0] + "_mid/index.m3u8"
     trans_model = Model(model)
-    rec = KaldiRecognizer(trans_model, __SAMPLE_RATE__)
-    rec.SetWords(True)
-    last_caption = None
     thread_id = threading.get_ident()
-    while LIVE_CELERY_TRANSCRIPTION or thread_id not in threads_to_stop:
-        start = time.time()
-        command = [
-            "ffmpeg",
-            "-y",
-            "-loglevel",
-            "quiet",
-            "-i",
-            url,
-            "-ss",
-            "00:00:00.005",
-            "-t",
-            "00:00:05",
-            "-acodec",
-            "pcm_s16le",
-            "-ac",
-            "1",
-            "-ar",
-            str(__SAMPLE_RATE__),
-            "-f",
-            "s16le",
-            "-",
-        ]
-        with subprocess.Popen(
-            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-        ) as process:
-            results = []
-            data = process.stdout.read(4000)
-            while True:
-                if len(data) == 0:
-                    break
-                else:
-                    data = process.stdout.read(4000)
-                if rec.AcceptWaveform(data):
-                    results.append(rec.Result())
-            results.append(rec.FinalResult())
-            vtt = WebVTT()
-            caption_text = ""
-            for _, res in enumerate(results):
-                words = json.loads(res).get("result")
-                if not words:
-                    continue
-                # start = timestring(words[0]["start"])
-                # end = timestring(words[-1]["end"])
-                content = " ".join([w["word"] for w in words])
-                caption_text += content + " "
-            if last_caption:
-                last_caption_text, current_caption_text = (
-                    last_caption.text.strip(),
-                    caption_text.strip(),
-                )
-                last_caption_words, current_caption_words = last_caption_text.split(
-                    " "
-                ), current_caption_text.split(" ")
-                current_caption_words1 = current_caption_words[
-                    1 : len(current_caption_words)
-                ]
-
-                for i in range(len(last_caption_words) - 1, 0, -1):
-                    if (
-                        last_caption_words[-i:] == current_caption_words[:i]
-                        or last_caption_words[-i:] == current_caption_words1[:i]
-                    ):
-                        caption_text = " ".join(current_caption_words[i:])
-                        break
-                if last_caption_text in caption_text:
-                    caption_text = caption_text.replace(last_caption_text, "").strip()
-                if caption_text in last_caption_text:
-                    caption_text = caption_text.replace(caption_text, "").strip()
-
-            current_start = timestring(0)
-            current_end = timestring(86400)
-            if caption_text != "":
-                caption = Caption(current_start, current_end, caption_text)
-                last_caption = caption
-                # print(caption_text)
-                vtt.captions.append(caption)
-                # save or return webvtt
-                vtt.save(filepath)
-
-        now = time.time() - start
-        if now < 5:
-            time.sleep(5 - now)
+
+    def must_stop():
+        return not LIVE_CELERY_TRANSCRIPTION and thread_id in threads_to_stop
+
+    captions = LiveCaptions(filepath)
+    captions.clear()
+    start = time.time()
+    # one ffmpeg process reads the stream, it is restarted if the stream is cut
+    while not must_stop():
+        transcribe_stream(url, trans_model, captions, time.time() - start, must_stop)
+        if not must_stop():
+            time.sleep(__RECONNECT_DELAY__)
     # print("stopped transcription")
     threads_to_stop.remove(thread_id)
-    vtt = WebVTT()
-    vtt.save(filepath)
+    captions.clear()
 
 
 def transcribe_live(url, slug, status, lang, filepath):
@@ -127,8 +177,7 @@ def transcribe_live(url, slug, status, lang, filepath):
             if status:
                 task_start_live_transcription.delay(url, slug, model, filepath)
             else:
-                vtt = WebVTT()
-                vtt.save(filepath)
+                LiveCaptions(filepath).clear()
                 task_end_live_transcription.delay(slug)
         else:
             if status:
@@ -140,8 +189,7 @@ def transcribe_live(url, slug, status, lang, filepath):
                 threads[slug] = t.ident
 
             else:
-                vtt = WebVTT()
-                vtt.save(filepath)
+                LiveCaptions(filepath).clear()
                 stop_thread = threads.get(slug, None)
                 if stop_thread:
                     threads_to_stop.append(stop_thread)
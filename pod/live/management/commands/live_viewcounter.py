@@ -1,11 +1,13 @@
 """Update viewcounter for live events."""
 
 from django.core.management.base import BaseCommand
+from pod.live.heartbeat import save_heartbeats
 from pod.live.models import HeartBeat, Event
 from django.utils import timezone
 from django.conf import settings
 
 VIEW_EXPIRATION_DELAY = getattr(settings, "VIEW_EXPIRATION_DELAY", 60)
+USE_HEARTBEAT_CACHE = getattr(settings, "USE_HEARTBEAT_CACHE", False)
 
 
 class Command(BaseCommand):
@@ -13,10 +15,6 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         """Handle the live_viewcounter command call."""
-        # Suppression des Heartbeat trop anciens
-        accepted_time = timezone.now() - timezone.timedelta(seconds=VIEW_EXPIRATION_DELAY)
-        HeartBeat.objects.filter(last_heartbeat__lt=accepted_time).delete()
-
         # Suppression des viewers des events finis de la journée
         q = Event.objects.filter(
             start_date__date=timezone.now().date(),
@@ -26,16 +24,25 @@ class Command(BaseCommand):
         for finished_event in q.all():
             finished_event.viewers.set([])
 
+        if USE_HEARTBEAT_CACHE:
+            # Maj des viewers et max_viewers depuis le cache
+            save_heartbeats()
+            return
+
+        # Suppression des Heartbeat trop anciens
+        accepted_time = timezone.now() - timezone.timedelta(seconds=VIEW_EXPIRATION_DELAY)
+        HeartBeat.objects.filter(last_heartbeat__lt=accepted_time).delete()
+
         # Maj des viewers des events en cours
-        events = Event.objects.all()
+        now = timezone.now()
+        events = Event.objects.filter(start_date__lte=now, end_date__gte=now)
 
         for event in events:
-            if event.is_current():
-                hbs = HeartBeat.objects.filter(event=event)
-                hbs = hbs.exclude(user=None)
-                users = []
-                for hb in hbs:
-                    if hb.user not in users:
-                        users.append(hb.user)
-                event.viewers.set(users)
-                event.save()
+            hbs = HeartBeat.objects.filter(event=event)
+            hbs = hbs.exclude(user=None)
+            users = []
+            for hb in hbs:
+                if hb.user not in users:
+                    users.append(hb.user)
+            event.viewers.set(users)
+            event.save()
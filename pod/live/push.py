@@ -0,0 +1,198 @@
+"""Esup-Pod live push channel.
+
+The ASGI application (pod/asgi.py) streams Server-Sent Events to the live pages:
+the number of viewers, the broadcaster status and the recording status of the event.
+The data of a channel is computed once every LIVE_PUSH_DELAY seconds
+and sent to all its subscribers.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .heartbeat import get_heartbeat_store
+from .models import Event, HeartBeat
+
+logger = logging.getLogger(__name__)
+
+USE_LIVE_PUSH = getattr(settings, "USE_LIVE_PUSH", False)
+LIVE_PUSH_PATH = getattr(settings, "LIVE_PUSH_PATH", "/live/push/")
+LIVE_PUSH_DELAY = getattr(settings, "LIVE_PUSH_DELAY", 5)
+USE_HEARTBEAT_CACHE = getattr(settings, "USE_HEARTBEAT_CACHE", False)
+
+PUSH_SALT = "pod.live.push"
+# A live page must be reloaded to subscribe again after one day
+PUSH_TOKEN_MAX_AGE = 24 * 3600
+
+
+def get_push_token(event=None, broadcaster=None):
+    """Get the signed token to subscribe to the channel of an event or broadcaster.
+
+    The token is given to the pages which checked the access to the event.
+    """
+    if event is not None:
+        return signing.dumps(["event", event.id], salt=PUSH_SALT)
+    return signing.dumps(["broadcaster", broadcaster.id], salt=PUSH_SALT)
+
+
+def get_push_url(event=None, broadcaster=None):
+    """Get the URL of the channel of an event or broadcaster, empty without push."""
+    if not USE_LIVE_PUSH:
+        return ""
+    return "%s?token=%s" % (LIVE_PUSH_PATH, get_push_token(event, broadcaster))
+
+
+def publish_record_status(event_id, recording, duration=0):
+    """Publish the recording status of the event to its channel."""
+    cache.set(
+        "live_push_record_%s" % event_id,
+        {"recording": recording, "duration": duration, "time": time.time()},
+        PUSH_TOKEN_MAX_AGE,
+    )
+
+
+def get_push_data(channel):
+    """Get the data sent to the subscribers of a channel.
+
+    The channel is ("event", event id) or ("broadcaster", broadcaster id),
+    the current event of the broadcaster is then used.
+    """
+    close_old_connections()
+    kind, object_id = channel
+    if kind == "broadcaster":
+        now = timezone.now()
+        events = Event.objects.filter(
+            broadcaster_id=object_id, start_date__lte=now, end_date__gte=now
+        )
+    else:
+        events = Event.objects.filter(id=object_id)
+    events = list(events.values_list("id", "broadcaster__status")[:2])
+    if len(events) != 1:
+        return {"event": None, "viewers": 0}
+    event_id, status = events[0]
+    if USE_HEARTBEAT_CACHE:
+        viewers = get_heartbeat_store().count(event_id)
+    else:
+        viewers = HeartBeat.objects.filter(event_id=event_id).count()
+    data = {"event": event_id, "status": status, "viewers": viewers}
+    record = cache.get("live_push_record_%s" % event_id)
+    if record is not None:
+        data["recording"] = record["recording"]
+        if record["recording"]:
+            data["duration"] = int(record["duration"] + time.time() - record["time"])
+    return data
+
+
+class PushHub:
+    """Subscribers of the channels, fed by one ticker task per channel."""
+
+    def __init__(self, delay=LIVE_PUSH_DELAY):
+        self.delay = delay
+        self.subscribers = {}
+        self.tickers = {}
+
+    def subscribe(self, channel):
+        """Get a queue receiving the data of the channel."""
+        # a slow subscriber only gets the last data
+        queue = asyncio.Queue(maxsize=1)
+        self.subscribers.setdefault(channel, set()).add(queue)
+        if channel not in self.tickers:
+            self.tickers[channel] = asyncio.ensure_future(self.tick(channel))
+        return queue
+
+    def unsubscribe(self, channel, queue):
+        """Remove the queue, and stop the ticker of a channel without subscribers."""
+        subscribers = self.subscribers.get(channel, set())
+        subscribers.discard(queue)
+        if not subscribers:
+            self.subscribers.pop(channel, None)
+            ticker = self.tickers.pop(channel, None)
+            if ticker is not None:
+                ticker.cancel()
+
+    def publish(self, channel, data):
+        """Send the data to all the subscribers of the channel."""
+        for queue in self.subscribers.get(channel, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(data)
+
+    async def tick(self, channel):
+        """Compute the data of the channel every delay seconds."""
+        while True:
+            try:
+                data = await sync_to_async(get_push_data, thread_sensitive=False)(channel)
+                self.publish(channel, data)
+            except Exception as err:
+                logger.error("Unable to get the live data of %s: %s" % (channel, err))
+            await asyncio.sleep(self.delay)
+
+
+push_hub = PushHub()
+
+
+async def wait_disconnect(receive):
+    """Wait until the client is disconnected."""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def push_application(scope, receive, send):
+    """ASGI application streaming the channel of the token as Server-Sent Events."""
+    token = parse_qs(scope["query_string"].decode()).get("token", [""])[0]
+    try:
+        channel = tuple(signing.loads(token, salt=PUSH_SALT, max_age=PUSH_TOKEN_MAX_AGE))
+    except signing.BadSignature:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 403,
+                "headers": [(b"content-type", b"text/plain")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"Forbidden"})
+        return
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                # do not buffer the events in nginx
+                (b"x-accel-buffering", b"no"),
+            ],
+        }
+    )
+    queue = push_hub.subscribe(channel)
+    disconnect = asyncio.ensure_future(wait_disconnect(receive))
+    try:
+        while True:
+            data = asyncio.ensure_future(queue.get())
+            await asyncio.wait({data, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnect.done():
+                data.cancel()
+                break
+            message = "data: %s\n\n" % json.dumps(data.result(), cls=DjangoJSONEncoder)
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": message.encode(),
+                    "more_body": True,
+                }
+            )
+    finally:
+        push_hub.unsubscribe(channel, queue)
+        disconnect.cancel()
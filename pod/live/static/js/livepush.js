@@ -0,0 +1,17 @@
+/**
+ * Esup-Pod live push channel.
+ *
+ * Receives the viewers count, the broadcaster status and the recording status
+ * of the event from live_push_url, and dispatches them in a "livepush" event.
+ */
+document.addEventListener("DOMContentLoaded", function () {
+  if (typeof live_push_url === "undefined" || !live_push_url) return;
+  if (typeof window.EventSource === "undefined") return;
+
+  const source = new EventSource(live_push_url);
+  source.onmessage = function (message) {
+    document.dispatchEvent(
+      new CustomEvent("livepush", { detail: JSON.parse(message.data) }),
+    );
+  };
+});
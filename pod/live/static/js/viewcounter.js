@@ -29,6 +29,19 @@ document.addEventListener("DOMContentLoaded", function () {
       param = "&eventid=" + live_element.dataset.eventid;
 
     let url = "/live/ajax_calls/heartbeat/?key=" + secret + param;
+    let use_push = typeof live_push_url !== "undefined" && live_push_url !== "";
+
+    function setViewersNumber(viewers) {
+      let viewers_number = document.getElementById("viewcount");
+      if (viewers_number !== null) {
+        viewers_number.innerHTML = viewers;
+      }
+    }
+
+    // Viewers count pushed by the server
+    document.addEventListener("livepush", function (event) {
+      setViewersNumber(event.detail.viewers);
+    });
 
     function sendHeartBeat() {
       fetch(url, {
@@ -42,9 +55,8 @@ document.addEventListener("DOMContentLoaded", function () {
           else return Promise.reject(response);
         })
         .then((result) => {
-          let viewers_number = document.getElementById("viewcount");
-          if (viewers_number !== null) {
-            viewers_number.innerHTML = result.viewers;
+          if (!use_push) {
+            setViewersNumber(result.viewers);
           }
           let viewers_list = document.getElementById("viewers-ul");
           if (viewers_list !== null) {
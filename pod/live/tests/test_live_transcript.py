@@ -0,0 +1,182 @@
+"""Unit tests for the live transcription."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.test import TestCase
+
+from pod.live import live_transcript
+from pod.live.live_transcript import LiveCaptions
+
+
+def get_words(*words):
+    """Get the words of a recognizer result, one per second."""
+    return [
+        {"word": word, "start": index, "end": index + 0.5}
+        for index, word in enumerate(words)
+    ]
+
+
+class FakeRecognizer:
+    """Recognizer ending a caption at the second chunk of audio."""
+
+    def __init__(self, model, sample_rate):
+        self.chunks = []
+
+    def SetWords(self, words):
+        pass
+
+    def SetPartialWords(self, words):
+        pass
+
+    def AcceptWaveform(self, data):
+        self.chunks.append(data)
+        return len(self.chunks) == 2
+
+    def Result(self):
+        return json.dumps({"result": get_words("bonjour", "à", "tous")})
+
+    def PartialResult(self):
+        return json.dumps({"partial_result": get_words("en", "cours")})
+
+    def FinalResult(self):
+        return json.dumps({"result": get_words("fin")})
+
+
+def get_python_command(code):
+    """Get the command of a process writing the audio with python code."""
+    return [sys.executable, "-c", code]
+
+
+class LiveTranscriptTestCase(TestCase):
+    """Test case for the live transcription."""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir)
+        self.filepath = os.path.join(self.work_dir, "broadcaster.vtt")
+
+    def read(self, filepath):
+        with open(filepath) as vtt_file:
+            return vtt_file.read()
+
+    def test_transcription_command(self):
+        """Test the reconnection of ffmpeg to the http streams only."""
+        command = live_transcript.get_transcription_command("http://live/index.m3u8")
+        self.assertEqual(command[-1], "-")
+        self.assertIn("-reconnect_streamed", command)
+        self.assertIn("http://live/index.m3u8", command)
+        command = live_transcript.get_transcription_command("rtmp://live/stream")
+        self.assertNotIn("-reconnect_streamed", command)
+        self.assertEqual(command[command.index("-ar") + 1], "16000")
+        print(" --->  test_transcription_command: OK!")
+
+    @mock.patch.object(live_transcript, "__PARTIAL_INTERVAL__", 0)
+    def test_live_captions(self):
+        """Test that the final captions are appended and the partial one replaced."""
+        captions = LiveCaptions(self.filepath)
+        captions.clear()
+        self.assertEqual(self.read(self.filepath), "WEBVTT\n")
+        captions.set_partial(json.dumps({"partial_result": get_words("en")}), 10)
+        self.assertEqual(
+            self.read(self.filepath + "_partial.vtt"),
+            "WEBVTT\n\n00:00:10.000 --> 00:00:10.500\nen\n",
+        )
+        captions.add_result(json.dumps({"result": get_words("en", "direct")}), 10)
+        captions.add_result(json.dumps({"result": []}), 10)
+        captions.add_result(json.dumps({"result": get_words("oui")}), 70)
+        self.assertEqual(
+            self.read(self.filepath),
+            "WEBVTT\n"
+            "\n00:00:10.000 --> 00:00:11.500\nen direct\n"
+            "\n00:01:10.000 --> 00:01:10.500\noui\n",
+        )
+        self.assertEqual(self.read(self.filepath + "_partial.vtt"), "WEBVTT\n")
+        with mock.patch.object(live_transcript, "__PARTIAL_INTERVAL__", 60):
+            captions.set_partial(json.dumps({"partial_result": get_words("en")}), 10)
+            captions.set_partial(json.dumps({"partial_result": get_words("non")}), 10)
+        self.assertIn("\nen\n", self.read(self.filepath + "_partial.vtt"))
+        print(" --->  test_live_captions: OK!")
+
+    @mock.patch.object(live_transcript, "__PARTIAL_INTERVAL__", 0)
+    def test_transcribe_stream(self):
+        """Test the captions of the audio read from the ffmpeg process."""
+        captions = LiveCaptions(self.filepath)
+        captions.clear()
+        recognizers = []
+
+        def get_recognizer(*args):
+            recognizers.append(FakeRecognizer(*args))
+            return recognizers[-1]
+
+        with mock.patch.object(
+            live_transcript, "KaldiRecognizer", side_effect=get_recognizer, create=True
+        ), mock.patch.object(
+            live_transcript,
+            "get_transcription_command",
+            return_value=get_python_command(
+                "import sys; sys.stdout.buffer.write(bytes(9001))"
+            ),
+        ):
+            live_transcript.transcribe_stream(
+                "http://live", "model", captions, 10, lambda: False
+            )
+        chunks = recognizers[0].chunks
+        self.assertGreaterEqual(len(chunks), 3)
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 9000)
+        self.assertTrue(all(len(chunk) % 2 == 0 for chunk in chunks))
+        self.assertEqual(
+            self.read(self.filepath),
+            "WEBVTT\n"
+            "\n00:00:10.000 --> 00:00:12.500\nbonjour à tous\n"
+            "\n00:00:10.000 --> 00:00:10.500\nfin\n",
+        )
+        self.assertEqual(self.read(self.filepath + "_partial.vtt"), "WEBVTT\n")
+        print(" --->  test_transcribe_stream: OK!")
+
+    @mock.patch.object(live_transcript, "__READ_TIMEOUT__", 0.1)
+    def test_stop_stalled_stream(self):
+        """Test that the transcription stops while the stream sends nothing."""
+        start = time.time()
+        with subprocess.Popen(
+            get_python_command("import time; time.sleep(30)"),
+            stdout=subprocess.PIPE,
+        ) as process:
+            chunks = list(
+                live_transcript.read_audio(process, lambda: time.time() - start > 0.3)
+            )
+            process.kill()
+        self.assertEqual(chunks, [])
+        self.assertLess(time.time() - start, 5)
+        print(" --->  test_stop_stalled_stream: OK!")
+
+    @mock.patch.object(live_transcript, "Model", create=True)
+    @mock.patch.object(live_transcript, "LIVE_CELERY_TRANSCRIPTION", False)
+    @mock.patch.object(live_transcript, "__RECONNECT_DELAY__", 0)
+    def test_transcribe_reconnect(self, model):
+        """Test that the stream is read again until the transcription is stopped."""
+        offsets = []
+
+        def transcribe_stream(url, trans_model, captions, offset, must_stop):
+            offsets.append(offset)
+            with open(self.filepath, "a") as vtt_file:
+                vtt_file.write("\n00:00:01.000 --> 00:00:02.000\nbonjour\n")
+            if len(offsets) == 3:
+                live_transcript.threads_to_stop.append(threading.get_ident())
+
+        with mock.patch.object(
+            live_transcript, "transcribe_stream", side_effect=transcribe_stream
+        ):
+            live_transcript.transcribe("http://live", "slug", "model", self.filepath)
+        self.assertEqual(len(offsets), 3)
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertNotIn(threading.get_ident(), live_transcript.threads_to_stop)
+        self.assertEqual(self.read(self.filepath), "WEBVTT\n")
+        print(" --->  test_transcribe_reconnect: OK!")
@@ -0,0 +1,104 @@
+"""Unit tests for the live push channel."""
+
+import asyncio
+import json
+from unittest import mock
+
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from pod.live import push
+from pod.live.heartbeat import MemoryHeartbeatStore
+from pod.live.models import Building, Broadcaster, Event
+from pod.video.models import Type
+
+
+class LivePushTestCase(TestCase):
+    """Test case for the live push channel."""
+
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def setUp(self):
+        user = User.objects.create(username="pod", password="podv3")
+        building = Building.objects.create(name="building1")
+        self.broadcaster = Broadcaster.objects.create(
+            name="broadcaster1",
+            url="http://test.live",
+            status=True,
+            building=building,
+        )
+        self.event = Event.objects.create(
+            title="event1",
+            owner=user,
+            broadcaster=self.broadcaster,
+            type=Type.objects.get(id=1),
+        )
+
+    def test_push_data(self):
+        """Test the data of the event and broadcaster channels."""
+        store = MemoryHeartbeatStore()
+        store.beat(self.event.id, "viewer_key")
+        push.publish_record_status(self.event.id, True, 30)
+        with mock.patch.object(push, "USE_HEARTBEAT_CACHE", True), mock.patch(
+            "pod.live.heartbeat.heartbeat_store", store
+        ):
+            data = push.get_push_data(("event", self.event.id))
+            self.assertEqual(
+                push.get_push_data(("broadcaster", self.broadcaster.id)), data
+            )
+        self.assertEqual(data["event"], self.event.id)
+        self.assertEqual(data["viewers"], 1)
+        self.assertTrue(data["status"])
+        self.assertTrue(data["recording"])
+        self.assertGreaterEqual(data["duration"], 30)
+        self.assertEqual(push.get_push_data(("event", 0)), {"event": None, "viewers": 0})
+        print(" --->  test_push_data of LivePushTestCase: OK!")
+
+    def test_push_hub(self):
+        """Test that the data is computed once per tick for all the subscribers."""
+
+        async def subscribe():
+            hub = push.PushHub(delay=0.05)
+            queues = [hub.subscribe(("event", 1)) for i in range(3)]
+            data = [await queue.get() for queue in queues]
+            for queue in queues:
+                hub.unsubscribe(("event", 1), queue)
+            self.assertEqual(hub.tickers, {})
+            return data
+
+        with mock.patch.object(
+            push, "get_push_data", return_value={"viewers": 2}
+        ) as get_push_data:
+            data = asyncio.run(subscribe())
+        self.assertEqual(data, [{"viewers": 2}] * 3)
+        self.assertEqual(get_push_data.call_count, 1)
+        print(" --->  test_push_hub of LivePushTestCase: OK!")
+
+    def test_push_application(self):
+        """Test the Server-Sent Events of the ASGI application."""
+
+        async def request(token):
+            communicator = ApplicationCommunicator(
+                push.push_application,
+                {"type": "http", "path": "/live/push/", "query_string": token},
+            )
+            await communicator.send_input({"type": "http.request"})
+            start = await communicator.receive_output()
+            body = await communicator.receive_output()
+            await communicator.send_input({"type": "http.disconnect"})
+            await communicator.wait()
+            return start, body
+
+        start, body = asyncio.run(request(b"token=bad"))
+        self.assertEqual(start["status"], 403)
+        token = push.get_push_token(event=self.event)
+        with mock.patch.object(push, "get_push_data", return_value={"viewers": 2}):
+            start, body = asyncio.run(request(("token=%s" % token).encode()))
+        self.assertEqual(start["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream"), start["headers"])
+        self.assertTrue(body["more_body"])
+        self.assertEqual(json.loads(body["body"].decode()[6:]), {"viewers": 2})
+        print(" --->  test_push_application of LivePushTestCase: OK!")
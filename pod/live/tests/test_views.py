@@ -2,11 +2,13 @@
 
 import json
 from http import HTTPStatus
+from unittest import mock
 
 import httmock
 from django.conf import settings
 from django.contrib.auth.models import Permission
 from django.contrib.auth.models import User, Group
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management import call_command
 from django.http import Http404
 from django.test import Client, RequestFactory
@@ -17,8 +19,11 @@ from httmock import HTTMock, all_requests
 
 from pod.authentication.models import AccessGroup
 from pod.live.forms import EventForm, EventPasswordForm
+from pod.live import heartbeat, views
+from pod.live.heartbeat import MemoryHeartbeatStore
+from pod.live.management.commands import live_viewcounter
 from pod.live.models import Building, Broadcaster, HeartBeat, Event
-from pod.main.models import Configuration
+from pod.main.models import Configuration, update_site_chrome_version
 from pod.video.models import Type
 from pod.video.models import Video
 
@@ -343,6 +348,66 @@ class LiveViewsTestCase(TestCase):
         self.assertEqual(eventOne.viewers.count(), 1)  # the anonymous in not set
         print(" --->  test_heartbeat number of logged viewers after command: OK!")
 
+    def test_heartbeat_cache(self):
+        """Test the heartbeats kept in the cache."""
+        store = MemoryHeartbeatStore()
+        patches = [
+            mock.patch.object(views, "USE_HEARTBEAT_CACHE", True),
+            mock.patch.object(live_viewcounter, "USE_HEARTBEAT_CACHE", True),
+            mock.patch.object(heartbeat, "heartbeat_store", store),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        user = User.objects.create(username="randomviewer", first_name="Jean")
+        heartbeat_url = reverse("live:heartbeat")
+        for viewer, key in ((None, "anonymous_key"), (user, "logged_user_key")):
+            if viewer:
+                self.client.force_login(viewer)
+            response = self.client.get(
+                "%s?key=%s&eventid=1" % (heartbeat_url, key),
+                HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+            )
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"viewers": 2, "viewers_list": []})
+        response = self.client.get(
+            "%s?key=logged_user_key&broadcasterid=1" % heartbeat_url,
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+        self.assertEqual(response.json()["viewers"], 2)
+        self.assertFalse(HeartBeat.objects.exists())
+        print(" --->  test_heartbeat_cache count viewers: OK!")
+
+        call_command("live_viewcounter")
+        event = Event.objects.get(id=1)
+        self.assertEqual(event.max_viewers, 2)
+        self.assertEqual(list(event.viewers.all()), [user])
+        print(" --->  test_heartbeat_cache save viewers: OK!")
+
+        # make the anonymous heartbeat expire
+        last_heartbeat, user_id = store.viewers[1]["anonymous_key"]
+        store.viewers[1]["anonymous_key"] = (last_heartbeat - 3600, user_id)
+        store.viewers[1].move_to_end("anonymous_key", last=False)
+        self.assertEqual(store.count(1), 1)
+        call_command("live_viewcounter")
+        self.assertEqual(Event.objects.get(id=1).max_viewers, 2)
+        self.assertEqual(store.get_events(), [1])
+        print(" --->  test_heartbeat_cache expire viewers: OK!")
+
+    def test_heartbeat_store(self):
+        """Test that the heartbeats are only kept in memory by the tests."""
+        patches = [
+            mock.patch.object(heartbeat, "heartbeat_store", None),
+            mock.patch.dict("sys.modules", {"django_redis": None}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        with mock.patch.object(heartbeat, "TEST_SETTINGS", False):
+            self.assertRaises(ImproperlyConfigured, heartbeat.get_heartbeat_store)
+        self.assertIsInstance(heartbeat.get_heartbeat_store(), MemoryHeartbeatStore)
+        print(" --->  test_heartbeat_store: OK!")
+
     def test_edit_events(self):
         """Test if event edit works correctly."""
         self.client = Client()
@@ -1647,6 +1712,8 @@ class LiveViewsTestCase(TestCase):
         """Test immediate event maintenance."""
         Configuration.objects.get(key="maintenance_mode").delete()
         Configuration.objects.create(key="maintenance_mode", value=1)
+        # the change is rolled back after the test, not the cached configurations
+        self.addCleanup(update_site_chrome_version)
 
         self.client = Client()
         self.superuser = User.objects.create_superuser(
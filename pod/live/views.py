@@ -33,6 +33,8 @@ from django.views.decorators.csrf import ensure_csrf_cookie, csrf_protect
 from rest_framework import status
 
 from pod.bbb.models import Livestream
+from .heartbeat import get_heartbeat_store
+from .push import get_push_url, publish_record_status
 from .forms import EventPasswordForm, EventForm, EventDeleteForm, EventImmediateForm
 from .models import (
     Building,
@@ -54,6 +56,8 @@ from ..main.views import in_maintenance
 from ..video.models import Video, Type
 
 HEARTBEAT_DELAY = getattr(settings, "HEARTBEAT_DELAY", 45)
+# Keep the heartbeats in the cache, saved in the events by live_viewcounter
+USE_HEARTBEAT_CACHE = getattr(settings, "USE_HEARTBEAT_CACHE", False)
 
 USE_BBB = getattr(settings, "USE_BBB", False)
 USE_BBB_LIVE = getattr(settings, "USE_BBB_LIVE", False)
@@ -139,6 +143,7 @@ def direct(request, slug):
             "display_event_btn": can_manage_event(request.user),
             "broadcaster": broadcaster,
             "heartbeat_delay": HEARTBEAT_DELAY,
+            "live_push_url": get_push_url(broadcaster=broadcaster),
             "page_title": _("Live “%s”") % broadcaster.name,
         },
     )
@@ -179,6 +184,32 @@ def heartbeat(request):
     return HttpResponseBadRequest()
 
 
+def count_heartbeats(current_event, event_id, key, current_user):
+    """Save the heartbeat of the viewer if event_id is set, and count the viewers."""
+    if USE_HEARTBEAT_CACHE:
+        heartbeat_store = get_heartbeat_store()
+        if event_id is None:
+            return heartbeat_store.count(current_event.id)
+        user_id = None if current_user.is_anonymous else current_user.id
+        return heartbeat_store.beat(current_event.id, key, user_id)
+
+    if event_id is not None:
+        viewer_heartbeat, created = HeartBeat.objects.get_or_create(
+            viewkey=key, event_id=event_id
+        )
+        if created and not current_user.is_anonymous:
+            viewer_heartbeat.user = current_user
+        viewer_heartbeat.last_heartbeat = timezone.now()
+        viewer_heartbeat.save()
+
+    heartbeats_count = HeartBeat.objects.filter(event_id=current_event.id).count()
+
+    if current_event.max_viewers < heartbeats_count:
+        current_event.max_viewers = heartbeats_count
+        current_event.save()
+    return heartbeats_count
+
+
 def manage_heartbeat(broadcaster_id, event_id, key, current_user):
     mimetype = "application/json"
     current_event = None
@@ -186,12 +217,13 @@ def manage_heartbeat(broadcaster_id, event_id, key, current_user):
     # Admin's supervision only
     if broadcaster_id is not None:
         # find current event with broadcaster id
-        Event.objects.filter()
-        query = Event.objects.filter(broadcaster_id=broadcaster_id)
-        ids = [evt.id for evt in query if evt.is_current()]
+        now = timezone.now()
+        current_events = Event.objects.filter(
+            broadcaster_id=broadcaster_id, start_date__lte=now, end_date__gte=now
+        )[:2]
 
         # no current event
-        if len(ids) != 1:
+        if len(current_events) != 1:
             return HttpResponse(
                 json.dumps(
                     {
@@ -202,18 +234,13 @@ def manage_heartbeat(broadcaster_id, event_id, key, current_user):
                 mimetype,
             )
 
-        current_event = get_object_or_404(Event, id=ids[0])
+        current_event = current_events[0]
 
     # save viewer's heartbeat
     if event_id is not None:
         current_event = get_object_or_404(Event, id=event_id)
-        viewer_heartbeat, created = HeartBeat.objects.get_or_create(
-            viewkey=key, event_id=event_id
-        )
-        if created and not current_user.is_anonymous:
-            viewer_heartbeat.user = current_user
-        viewer_heartbeat.last_heartbeat = timezone.now()
-        viewer_heartbeat.save()
+
+    heartbeats_count = count_heartbeats(current_event, event_id, key, current_user)
 
     viewers = current_event.viewers.values("first_name", "last_name", "is_superuser")
 
@@ -223,12 +250,6 @@ def manage_heartbeat(broadcaster_id, event_id, key, current_user):
         or current_user in current_event.additional_owners.all()
     )
 
-    heartbeats_count = HeartBeat.objects.filter(event_id=current_event.id).count()
-
-    if current_event.max_viewers < heartbeats_count:
-        current_event.max_viewers = heartbeats_count
-        current_event.save()
-
     return HttpResponse(
         json.dumps(
             {
@@ -362,6 +383,7 @@ def render_event_template(request, evemnt, user_owns_event):
             "use_split": use_split(evemnt.broadcaster),
             "can_manage_stream": can_manage_stream(evemnt.broadcaster),
             "heartbeat_delay": HEARTBEAT_DELAY,
+            "live_push_url": get_push_url(event=evemnt),
         },
     )
 
@@ -781,6 +803,7 @@ def event_startrecord(event_id, broadcaster_id):
 
     curr_event = Event.objects.get(pk=event_id)
     curr_event.is_recording_stopped = False
+    publish_record_status(event_id, True)
 
     return JsonResponse({"success": True})
 
@@ -853,6 +876,7 @@ def event_stoprecord(event_id, broadcaster_id):
     curr_event = Event.objects.get(pk=event_id)
     curr_event.is_recording_stopped = True
     curr_event.save()
+    publish_record_status(event_id, False)
 
     return transform_to_video(
         broadcaster,
@@ -884,12 +908,9 @@ def event_info_record(event_id, broadcaster_id):
     current_record_info = get_info_current_record(broadcaster)
 
     if current_record_info.get("durationInSeconds") != "":
-        return JsonResponse(
-            {
-                "success": True,
-                "duration": int(current_record_info.get("durationInSeconds")),
-            }
-        )
+        duration = int(current_record_info.get("durationInSeconds"))
+        publish_record_status(event_id, True, duration)
+        return JsonResponse({"success": True, "duration": duration})
 
     return JsonResponse({"success": False, "error": ""})
 
@@ -2,6 +2,7 @@
 
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pod.settings")
@@ -25,3 +26,16 @@ app.conf.task_routes = {
 @app.task(bind=True)
 def debug_task(self):
     print("Request: {0!r}".format(self.request))
+
+
+@worker_process_init.connect
+def warm_up_transcription_models(**kwargs):
+    """Load the transcription models when a worker process starts."""
+    from django.conf import settings
+
+    if getattr(settings, "USE_TRANSCRIPTION", False) and getattr(
+        settings, "TRANSCRIPTION_MODEL_WARM_UP", False
+    ):
+        from pod.video_encode_transcript.transcript_model import start_warm_up_models
+
+        start_warm_up_models()
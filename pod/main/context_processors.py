@@ -1,10 +1,8 @@
 from django.conf import settings as django_settings
 from django.core.exceptions import ImproperlyConfigured
 
-from pod.main.models import LinkFooter
-from django.core.exceptions import ObjectDoesNotExist
-
-from pod.main.models import Configuration
+from pod.main.models import get_configuration, get_configuration_flag
+from pod.main.models import get_link_footers
 from django.contrib.sites.shortcuts import get_current_site
 from django.utils.translation import ugettext_lazy as _
 
@@ -88,24 +86,10 @@ USE_NOTIFICATIONS = getattr(django_settings, "USE_NOTIFICATIONS", True)
 
 def context_settings(request):
     """Return all context settings."""
-    maintenance_mode = False
-    maintenance_text_short = ""
-    maintenance_sheduled = False
-    maintenance_text_sheduled = ""
-    try:
-        maintenance_mode = Configuration.objects.get(key="maintenance_mode")
-        maintenance_mode = True if maintenance_mode.value == "1" else False
-        maintenance_text_short = Configuration.objects.get(
-            key="maintenance_text_short"
-        ).value
-
-        maintenance_sheduled = Configuration.objects.get(key="maintenance_sheduled")
-        maintenance_sheduled = True if (maintenance_sheduled.value == "1") else False
-        maintenance_text_sheduled = Configuration.objects.get(
-            key="maintenance_text_sheduled"
-        ).value
-    except ObjectDoesNotExist:
-        pass
+    maintenance_mode = get_configuration_flag("maintenance_mode")
+    maintenance_text_short = get_configuration("maintenance_text_short")
+    maintenance_sheduled = get_configuration_flag("maintenance_sheduled")
+    maintenance_text_sheduled = get_configuration("maintenance_text_sheduled")
 
     new_settings = {}
     for sett in TEMPLATE_VISIBLE_SETTINGS:
@@ -150,7 +134,7 @@ def context_settings(request):
 
 
 def context_footer(request):
-    linkFooter = LinkFooter.objects.all().filter(sites=get_current_site(request))
+    linkFooter = get_link_footers(get_current_site(request))
     return {
         "LINK_FOOTER": linkFooter,
     }
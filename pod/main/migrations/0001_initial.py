@@ -0,0 +1,72 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+import pod.main.models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('flatpages', '0001_initial'),
+        ('sites', '0002_alter_domain_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdditionalChannelTab',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Name of the tab', max_length=40, verbose_name='Value')),
+            ],
+            options={
+                'verbose_name': 'Additional channels Tab',
+                'verbose_name_plural': 'Additional channel Tabs',
+            },
+        ),
+        migrations.CreateModel(
+            name='Configuration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.SlugField(editable=False, help_text='Key of the configuration', max_length=100, unique=True, verbose_name='Key')),
+                ('value', models.CharField(help_text='Value of the configuration', max_length=255, verbose_name='Value')),
+                ('description', models.CharField(editable=False, help_text='Description of the configuration', max_length=255, verbose_name='Description')),
+                ('description_fr', models.CharField(editable=False, help_text='Description of the configuration', max_length=255, null=True, verbose_name='Description')),
+                ('description_en', models.CharField(editable=False, help_text='Description of the configuration', max_length=255, null=True, verbose_name='Description')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CustomFileModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.ImageField(blank=True, max_length=255, null=True, upload_to=pod.main.models.get_upload_path_files, verbose_name='Image')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CustomImageModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.ImageField(blank=True, max_length=255, null=True, upload_to=pod.main.models.get_upload_path_files, verbose_name='Image')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LinkFooter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=250, verbose_name='Title')),
+                ('title_fr', models.CharField(max_length=250, null=True, verbose_name='Title')),
+                ('title_en', models.CharField(max_length=250, null=True, verbose_name='Title')),
+                ('order', models.PositiveSmallIntegerField(blank=True, default=1, null=True, verbose_name='order')),
+                ('url', models.CharField(blank=True, help_text='This field allows you to add an url.', max_length=250, null=True, verbose_name='Web link')),
+                ('page', models.ForeignKey(blank=True, help_text='Select the page of Pod you want to link with.', null=True, on_delete=django.db.models.deletion.CASCADE, to='flatpages.flatpage')),
+                ('sites', models.ManyToManyField(to='sites.Site')),
+            ],
+            options={
+                'verbose_name': 'bottom menu',
+                'verbose_name_plural': 'bottom menu',
+                'ordering': ['order', 'title'],
+            },
+        ),
+    ]
@@ -6,13 +6,22 @@ from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
 from django.template.defaultfilters import slugify
 from django.dispatch import receiver
-from django.db.models.signals import post_save
-from django.db import connection
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.db import connection, transaction
+from django.core.cache import cache
 import os
 import mimetypes
+import uuid
 
 FILES_DIR = getattr(settings, "FILES_DIR", "files")
 
+CACHE_CONFIGURATION_TIMEOUT = getattr(settings, "CACHE_CONFIGURATION_TIMEOUT", 3600)
+# Cache key of the version of the configurations and footer links,
+# changed each time one of them is saved or deleted
+SITE_CHROME_VERSION_KEY = "main_site_chrome_version"
+# Values of the current version kept by the process: {name: (version, value)}
+site_chrome_values = {}
+
 
 def get_nextautoincrement(model):
     cursor = connection.cursor()
@@ -193,3 +202,75 @@ class AdditionalChannelTab(models.Model):
     class Meta:
         verbose_name = _("Additional channels Tab")
         verbose_name_plural = _("Additional channel Tabs")
+
+
+def get_site_chrome_version():
+    """Get the version of the configurations and footer links."""
+    version = cache.get(SITE_CHROME_VERSION_KEY)
+    if version is None:
+        cache.add(SITE_CHROME_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(SITE_CHROME_VERSION_KEY)
+    return version
+
+
+def update_site_chrome_version():
+    """Change the version so the processes reload the configurations and footer links."""
+    cache.set(SITE_CHROME_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_site_chrome_value(name, load):
+    """Get the value name of the current version from the process, the cache or load().
+
+    On a warm cache, the value is read without any database query.
+    """
+    version = get_site_chrome_version()
+    local_version, value = site_chrome_values.get(name, (None, None))
+    if local_version == version:
+        return value
+    key = "main_site_chrome_%s_%s" % (name, version)
+    value = cache.get(key)
+    if value is None:
+        value = load()
+        cache.set(key, value, CACHE_CONFIGURATION_TIMEOUT)
+    site_chrome_values[name] = (version, value)
+    return value
+
+
+def get_configurations():
+    """Get the values of all the configurations by key, read by one query."""
+    return get_site_chrome_value(
+        "configurations",
+        lambda: dict(Configuration.objects.values_list("key", "value")),
+    )
+
+
+def get_configuration(key, default=""):
+    """Get the value of the configuration key, default if it does not exist."""
+    return get_configurations().get(key, default)
+
+
+def get_configuration_flag(key):
+    """Get True if the configuration key is enabled ("1")."""
+    return get_configuration(key) == "1"
+
+
+def get_link_footers(site):
+    """Get the footer links of the site, with their pages."""
+    return get_site_chrome_value(
+        "link_footers_%s" % site.id,
+        lambda: list(LinkFooter.objects.filter(sites=site).select_related("page")),
+    )
+
+
+@receiver(post_save, sender=Configuration)
+@receiver(post_delete, sender=Configuration)
+@receiver(post_save, sender=LinkFooter)
+@receiver(post_delete, sender=LinkFooter)
+@receiver(m2m_changed, sender=LinkFooter.sites.through)
+@receiver(post_save, sender=FlatPage)
+@receiver(post_delete, sender=FlatPage)
+def clear_site_chrome(sender, **kwargs):
+    """Reload the configurations and footer links after a change."""
+    update_site_chrome_version()
+    # the values read by other requests before the commit are reloaded too
+    transaction.on_commit(update_site_chrome_version)
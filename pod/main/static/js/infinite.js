@@ -66,6 +66,10 @@ class InfiniteLoader {
     this.next_page_number = page;
     this.current_page_number = page - 1;
     this.nextPage = nextPage;
+    // cursor of the next page, when the list is paginated by keyset
+    this.next_cursor = this.videos_list
+      ? this.videos_list.dataset.nextcursor
+      : undefined;
     this.callBackBeforeLoad = callBackBeforeLoad;
     this.callBackAfterLoad = callBackAfterLoad;
     this.url = url;
@@ -96,6 +100,7 @@ class InfiniteLoader {
           this.nextPage = false;
         }
         this.nextPage = html.getElementById("videos_list").dataset.nextpage;
+        this.next_cursor = html.getElementById("videos_list").dataset.nextcursor;
         let element = this.videos_list;
 
         element.innerHTML += html.getElementById("videos_list").innerHTML;
@@ -118,6 +123,9 @@ class InfiniteLoader {
     if (!url) return;
     if (nextPage == "false") return;
     url = url + page;
+    if (this.next_cursor) {
+      url = url + "&after=" + encodeURIComponent(this.next_cursor);
+    }
     const response = await fetch(url, {
       method: "GET",
       headers: {
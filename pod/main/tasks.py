@@ -13,6 +13,15 @@ def task_start_encode(self, video_id):
     encode_video(video_id)
 
 
+@app.task(bind=True)
+def task_start_encode_chunk(self, chunk_command):
+    """Encode a chunk of a video with Celery."""
+    print("CELERY START ENCODE CHUNK")
+    from pod.video_encode_transcript.encoding_utils import launch_cmd
+
+    return launch_cmd(chunk_command)
+
+
 @app.task(bind=True)
 def task_start_transcript(self, video_id):
     """Start video transcripting with Celery."""
@@ -22,6 +31,15 @@ def task_start_transcript(self, video_id):
     main_threaded_transcript(video_id)
 
 
+@app.task(bind=True)
+def task_update_index(self, index_ids, delete_ids):
+    """Index or delete videos in Elasticsearch with Celery."""
+    print("CELERY UPDATE INDEX OF VIDEOS %s" % (index_ids + delete_ids))
+    from pod.video_search.utils import update_index_es
+
+    update_index_es(index_ids, delete_ids)
+
+
 @app.task(bind=True)
 def task_start_bbb_encode(self, meeting_id):
     """Start BBB meeting encoding with Celery."""
@@ -9,6 +9,7 @@ from ..settings import AUTH_PASSWORD_VALIDATORS, USE_I18N, USE_L10N
 from ..settings import ROOT_URLCONF, WSGI_APPLICATION, TEMPLATES
 from ..settings import INSTALLED_APPS, MIDDLEWARE, AUTHENTICATION_BACKENDS
 import os
+import tempfile
 from bs4 import BeautifulSoup
 import requests
 
@@ -90,6 +91,9 @@ MEETING_DISABLE_RECORD = False
 
 USE_IMPORT_VIDEO = True
 
+# the videos saved without Elasticsearch are not added to the log directory
+ES_RETRY_FILE = os.path.join(tempfile.mkdtemp(), "es_retry.log")
+
 # xAPI settings
 USE_XAPI = True
 USE_XAPI_VIDEO = True
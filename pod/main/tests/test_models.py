@@ -4,7 +4,9 @@ from django.test import TestCase
 from django.contrib.flatpages.models import FlatPage
 from django.conf import settings
 from django.contrib.sites.models import Site
-from pod.main.models import Configuration, AdditionalChannelTab
+from pod.main.models import Configuration, AdditionalChannelTab, LinkFooter
+from pod.main.models import get_configuration, get_configuration_flag
+from pod.main.models import get_link_footers, update_site_chrome_version
 
 SITE_ID = getattr(settings, "SITE_ID", 1)
 
@@ -113,6 +115,29 @@ class ConfigurationTestCase(TestCase):
         self.assertEquals(Configuration.objects.filter(key="maintenance_mode").count(), 0)
         print("--->  test_delete_object of ConfigurationTestCase: OK !")
 
+    def test_site_chrome_cache(self):
+        """Test that the configurations and footer links are cached until a change."""
+        # the changes are rolled back after the test, not the cache
+        self.addCleanup(update_site_chrome_version)
+        site = Site.objects.get(id=SITE_ID)
+        LinkFooter.objects.all().delete()
+        page = FlatPage.objects.create(title="Legal", url="/legal/")
+        LinkFooter.objects.create(title="Legal notice", page=page)
+        self.assertFalse(get_configuration_flag("maintenance_mode"))
+        self.assertEqual(len(get_link_footers(site)), 1)
+        with self.assertNumQueries(0):
+            self.assertFalse(get_configuration_flag("maintenance_mode"))
+            self.assertEqual(get_configuration("missing", "default"), "default")
+            self.assertEqual(get_link_footers(site)[0].get_url(), "/legal/")
+        conf = Configuration.objects.get(key="maintenance_mode")
+        conf.value = "1"
+        conf.save()
+        page.url = "/legal-notice/"
+        page.save()
+        self.assertTrue(get_configuration_flag("maintenance_mode"))
+        self.assertEqual(get_link_footers(site)[0].get_url(), "/legal-notice/")
+        print("   --->  test_site_chrome_cache of ConfigurationTestCase: OK!")
+
 
 class AdditionalChannelTabTestCase(TestCase):
     def setUp(self):
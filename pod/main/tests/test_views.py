@@ -13,7 +13,7 @@ from django.core.exceptions import PermissionDenied
 from captcha.models import CaptchaStore
 from http import HTTPStatus
 from pod.main import context_processors
-from pod.main.models import Configuration
+from pod.main.models import Configuration, update_site_chrome_version
 import tempfile
 import os
 import importlib
@@ -136,6 +136,8 @@ class MaintenanceViewsTestCase(TestCase):
         conf = Configuration.objects.get(key="maintenance_mode")
         conf.value = "1"
         conf.save()
+        # the change is rolled back after the test, not the cached configurations
+        self.addCleanup(update_site_chrome_version)
 
         response = self.client.get(url)
         self.assertEqual(response.status_code, 302)
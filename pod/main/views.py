@@ -40,7 +40,7 @@ import os
 import mimetypes
 import json
 from django.contrib.auth.decorators import login_required
-from .models import Configuration
+from .models import get_configuration, get_configuration_flag
 from honeypot.decorators import check_honeypot
 
 
@@ -94,9 +94,7 @@ LOGIN_URL = getattr(settings, "LOGIN_URL", "/authentication_login/")
 
 def in_maintenance():
     """Return true if maintenance_mode is ON."""
-    return (
-        True if Configuration.objects.get(key="maintenance_mode").value == "1" else False
-    )
+    return get_configuration_flag("maintenance_mode")
 
 
 @csrf_protect
@@ -344,7 +342,7 @@ def user_autocomplete(request):
 
 def maintenance(request):
     """Render the maintenance page with configured text."""
-    text = Configuration.objects.get(key="maintenance_text_disabled").value
+    text = get_configuration("maintenance_text_disabled")
     return render(request, "maintenance.html", {"text": text})
 
 
@@ -0,0 +1,53 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Playlist',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_created', models.DateTimeField(auto_created=True, default=django.utils.timezone.now, editable=False, verbose_name='Creation date')),
+                ('name', models.CharField(default='Playlist', help_text='Please choose a title between 1 and 250 characters.', max_length=250, verbose_name='Title')),
+                ('description', models.TextField(blank=True, default='', help_text='Please choose a description. This description is empty by default.', verbose_name='Description')),
+                ('password', models.TextField(blank=True, default='', help_text='Please choose a password if this playlist is password-protected.', verbose_name='Password')),
+                ('visibility', models.CharField(choices=[('public', 'Public'), ('protected', 'Password-protected'), ('private', 'Private')], default='private', help_text="\n            Please chosse a right of access among 'public', 'password-protected', 'private'.\n            ", max_length=9, verbose_name='Right of access')),
+                ('autoplay', models.BooleanField(default=True, help_text='Please choose if this playlist is an autoplay playlist or not.', verbose_name='Autoplay')),
+                ('promoted', models.BooleanField(default=False, help_text='Selecting this setting causes your playlist to be promoted on the page listing promoted public playlists. However, if this setting is deactivated, your playlist will still be accessible to everyone.<br>For general use, we recommend that you leave this setting disabled.', verbose_name='Promoted')),
+                ('editable', models.BooleanField(default=True, help_text='Please choose if this playlist is editable or not.', verbose_name='Editable')),
+                ('slug', models.SlugField(editable=False, help_text='Used to access this instance, the "slug" is a short label containing only letters, numbers, underscore or dash top.', max_length=105, unique=True, verbose_name='slug')),
+                ('date_updated', models.DateTimeField(auto_now=True, verbose_name='Update date')),
+            ],
+            options={
+                'verbose_name': 'Playlist',
+                'verbose_name_plural': 'Playlists',
+                'ordering': ['name', 'owner', 'visibility', 'date_updated'],
+                'get_latest_by': 'date_updated',
+            },
+        ),
+        migrations.CreateModel(
+            name='PlaylistContent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_added', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Addition date')),
+                ('rank', models.IntegerField(default=1, editable=False, verbose_name='Rank')),
+                ('playlist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='playlist.playlist', verbose_name='Playlist')),
+            ],
+            options={
+                'verbose_name': 'Playlist content',
+                'verbose_name_plural': 'Playlist contents',
+                'ordering': ['playlist', 'rank'],
+                'get_latest_by': 'rank',
+            },
+        ),
+    ]
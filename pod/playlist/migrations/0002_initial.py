@@ -0,0 +1,44 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('video', '0001_initial'),
+        ('playlist', '0001_initial'),
+        ('sites', '0002_alter_domain_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playlistcontent',
+            name='video',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='video.video', verbose_name='Video'),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='additional_owners',
+            field=models.ManyToManyField(blank=True, help_text='You can add additional owners to the playlist.', related_name='owners_playlists', to=settings.AUTH_USER_MODEL, verbose_name='Additional owners'),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='owner',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='User'),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='site',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, related_name='site_playlist', to='sites.site', verbose_name='Site'),
+        ),
+        migrations.AddConstraint(
+            model_name='playlistcontent',
+            constraint=models.UniqueConstraint(fields=('playlist', 'video'), name='unique_playlist_video'),
+        ),
+    ]
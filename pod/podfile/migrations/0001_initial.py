@@ -0,0 +1,68 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import pod.podfile.models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserFolder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, verbose_name='Name')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('access_groups', models.ManyToManyField(blank=True, help_text='Select one or more groups who can access in read only to this folder', to='authentication.AccessGroup', verbose_name='Groups')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='Owner')),
+                ('users', models.ManyToManyField(blank=True, help_text='Select one or more users who can access in read only to this folder', related_name='shared_files', to=settings.AUTH_USER_MODEL, verbose_name='Users')),
+            ],
+            options={
+                'verbose_name': 'User directory',
+                'verbose_name_plural': 'User directories',
+                'ordering': ['name'],
+                'unique_together': {('name', 'owner')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CustomImageModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, verbose_name='Name')),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True)),
+                ('file', models.ImageField(max_length=255, upload_to=pod.podfile.models.get_upload_path_files)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='podfile_customimagemodel_created', to=settings.AUTH_USER_MODEL)),
+                ('folder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='podfile.userfolder')),
+            ],
+            options={
+                'verbose_name': 'Image',
+                'verbose_name_plural': 'Images',
+            },
+        ),
+        migrations.CreateModel(
+            name='CustomFileModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, verbose_name='Name')),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True)),
+                ('file', models.FileField(max_length=255, upload_to=pod.podfile.models.get_upload_path_files)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='podfile_customfilemodel_created', to=settings.AUTH_USER_MODEL)),
+                ('folder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='podfile.userfolder')),
+            ],
+            options={
+                'verbose_name': 'Document',
+                'verbose_name_plural': 'Documents',
+            },
+        ),
+    ]
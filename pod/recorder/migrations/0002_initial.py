@@ -0,0 +1,56 @@
+# Generated by Django 3.2.23 on 2026-10-18 17:53
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('video', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('sites', '0002_alter_domain_unique'),
+        ('recorder', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recorder',
+            name='channel',
+            field=models.ManyToManyField(blank=True, to='video.Channel', verbose_name='Channels'),
+        ),
+        migrations.AddField(
+            model_name='recorder',
+            name='discipline',
+            field=models.ManyToManyField(blank=True, to='video.Discipline', verbose_name='Disciplines'),
+        ),
+        migrations.AddField(
+            model_name='recorder',
+            name='restrict_access_to_groups',
+            field=models.ManyToManyField(blank=True, help_text='Select one or more groups who can access to this video', to='auth.Group', verbose_name='Groups'),
+        ),
+        migrations.AddField(
+            model_name='recorder',
+            name='sites',
+            field=models.ManyToManyField(to='sites.Site'),
+        ),
+        migrations.AddField(
+            model_name='recorder',
+            name='theme',
+            field=models.ManyToManyField(blank=True, help_text='Hold down "Control", or "Command" on a Mac, to select more than one.', to='video.Theme', verbose_name='Themes'),
+        ),
+        migrations.AddField(
+            model_name='recorder',
+            name='type',
+            field=models.ForeignKey(help_text='Video type by default.', on_delete=django.db.models.deletion.CASCADE, to='video.type'),
+        ),
+        migrations.AddField(
+            model_name='recorder',
+            name='user',
+            field=models.ForeignKey(blank=True, help_text='Manager of this recorder. This manager will receive recorder emails and he will be the owner of the published videos. If no user is selected, this recorder will use manual assign system.', limit_choices_to={'is_staff': True}, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='User'),
+        ),
+    ]
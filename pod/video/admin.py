@@ -658,6 +658,11 @@ class ViewCountAdmin(admin.ModelAdmin):
             qs = qs.filter(video__sites=get_current_site(request))
         return qs
 
+    def delete_queryset(self, request, queryset):
+        """Delete the view counts one by one, to remove them from the rollups."""
+        for view_count in queryset:
+            view_count.delete()
+
 
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ("title", "owner", "videos_count")
@@ -63,6 +63,31 @@ def fix_transcript(sender, **kwargs):
     print("fix_transcript --> OK")
 
 
+def fix_encoded(sender, **kwargs):
+    """
+    Encoded state of the videos is stored in the is_encoded field
+    This fix set its value from the encodings of the previous videos
+    """
+    from pod.video.models import Video
+    from pod.video_encode_transcript.models import update_videos_encoded
+
+    print("Start fix_encoded")
+    update_videos_encoded(Video.objects.all())
+    print("fix_encoded --> OK")
+
+
+def fix_theme_closure(sender, **kwargs):
+    """
+    Links of the themes to their descendants are stored in the ThemeClosure table
+    This fix set them from the parents of the previous themes
+    """
+    from pod.video.models import rebuild_theme_closure
+
+    print("Start fix_theme_closure")
+    rebuild_theme_closure()
+    print("fix_theme_closure --> OK")
+
+
 def update_video_passwords(sender, **kwargs):
     """Encrypt all video passwords."""
     from pod.video.models import Video
@@ -96,6 +121,8 @@ class VideoConfig(AppConfig):
         post_migrate.connect(set_default_site, sender=self)
         post_migrate.connect(self.send_previous_data, sender=self)
         post_migrate.connect(fix_transcript, sender=self)
+        post_migrate.connect(fix_encoded, sender=self)
+        post_migrate.connect(fix_theme_closure, sender=self)
         # post_migrate.connect(update_video_passwords, sender=self)
 
     def execute_query(self, query, mapping_dict):
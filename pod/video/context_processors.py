@@ -5,16 +5,13 @@ from pod.video.models import Discipline
 from pod.video.models import Video
 
 from django.db.models import Count, Sum
-from django.db.models import Q
-from django.db.models import Exists
-from django.db.models import OuterRef
 
 from datetime import timedelta
+import math
+import random
+import time
 from django.core.cache import cache
 from django.contrib.sites.shortcuts import get_current_site
-from pod.video_encode_transcript.models import EncodingVideo
-from pod.video_encode_transcript.models import PlaylistVideo
-from pod.video_encode_transcript.models import EncodingAudio
 
 CHUNK_SIZE = getattr(django_settings, "CHUNK_SIZE", 100000)
 HIDE_USER_FILTER = getattr(django_settings, "HIDE_USER_FILTER", False)
@@ -25,44 +22,26 @@ SITE_ID = getattr(django_settings, "SITE_ID", 1)
 __AVAILABLE_VIDEO_FILTER__ = {
     "encoding_in_progress": False,
     "is_draft": False,
+    "is_encoded": True,
     "sites": SITE_ID,
 }
 
 CHANNELS_PER_BATCH = getattr(django_settings, "CHANNELS_PER_BATCH", 10)
 
+# Weight of the computation time in the early refresh of the video data
+VIDEO_DATA_REFRESH_BETA = 1
+# Seconds a request may compute the video data before another one does it too
+VIDEO_DATA_LOCK_TIMEOUT = 60
+# Times a request waits 0.1 second for the video data computed by another one
+VIDEO_DATA_LOCK_WAIT = 20
+
 
 def get_available_videos_filter(request=None):
     """Return the base filter to get the available videos of the site."""
     __AVAILABLE_VIDEO_FILTER__["sites"] = get_current_site(request)
 
-    return (
-        Video.objects.filter(**__AVAILABLE_VIDEO_FILTER__)
-        .defer("video", "slug", "owner", "additional_owners", "description")
-        .filter(
-            Q(
-                Exists(
-                    EncodingVideo.objects.filter(
-                        video=OuterRef("pk"), encoding_format="video/mp4"
-                    )
-                )
-            )
-            | Q(
-                Exists(
-                    PlaylistVideo.objects.filter(
-                        video=OuterRef("pk"),
-                        name="playlist",
-                        encoding_format="application/x-mpegURL",
-                    )
-                )
-            )
-            | Q(
-                Exists(
-                    EncodingAudio.objects.filter(
-                        video=OuterRef("pk"), name="audio", encoding_format="video/mp4"
-                    )
-                )
-            )
-        )
+    return Video.objects.filter(**__AVAILABLE_VIDEO_FILTER__).defer(
+        "video", "slug", "owner", "additional_owners", "description"
     )
 
 
@@ -80,54 +59,101 @@ def context_video_settings(request):
     return new_settings
 
 
-def context_video_data(request):
-    """Get video data in cache, if not, create and add it in cache."""
-    types = cache.get("TYPES")
-    if types is None:
-        types = (
-            Type.objects.filter(
-                sites=get_current_site(request),
-                video__is_draft=False,
-                video__sites=get_current_site(request),
-            )
-            .distinct()
-            .annotate(video_count=Count("video", distinct=True))
-        )
-        cache.set("TYPES", types, timeout=CACHE_VIDEO_DEFAULT_TIMEOUT)
-
-    disciplines = cache.get("DISCIPLINES")
-    if disciplines is None:
-        disciplines = (
-            Discipline.objects.filter(
-                site=get_current_site(request),
-                video__is_draft=False,
-                video__sites=get_current_site(request),
-            )
-            .distinct()
-            .annotate(video_count=Count("video", distinct=True))
-        )
-        cache.set("DISCIPLINES", disciplines, timeout=CACHE_VIDEO_DEFAULT_TIMEOUT)
-
-    VIDEOS_COUNT = cache.get("VIDEOS_COUNT")
-    VIDEOS_DURATION = cache.get("VIDEOS_DURATION")
-    if VIDEOS_COUNT is None:
-        v_filter = get_available_videos_filter(request)
-        aggregate_videos = v_filter.aggregate(
-            duration=Sum("duration"), number=Count("id")
-        )
-        VIDEOS_COUNT = aggregate_videos["number"]
-        cache.set("VIDEOS_COUNT", VIDEOS_COUNT, timeout=CACHE_VIDEO_DEFAULT_TIMEOUT)
-        VIDEOS_DURATION = (
+def get_video_data(site):
+    """Compute the types, disciplines, number and duration of the videos of the site.
+
+    The types and disciplines are evaluated, so their lists are cached
+    instead of their queries.
+    """
+    types = (
+        Type.objects.filter(sites=site, video__is_draft=False, video__sites=site)
+        .distinct()
+        .annotate(video_count=Count("video", distinct=True))
+        .select_related("icon")
+    )
+    disciplines = (
+        Discipline.objects.filter(site=site, video__is_draft=False, video__sites=site)
+        .distinct()
+        .annotate(video_count=Count("video", distinct=True))
+        .select_related("icon")
+    )
+    available_video_filter = dict(__AVAILABLE_VIDEO_FILTER__, sites=site)
+    aggregate_videos = Video.objects.filter(**available_video_filter).aggregate(
+        duration=Sum("duration"), number=Count("id")
+    )
+    return {
+        "TYPES": list(types),
+        "DISCIPLINES": list(disciplines),
+        "VIDEOS_COUNT": aggregate_videos["number"],
+        "VIDEOS_DURATION": (
             str(timedelta(seconds=aggregate_videos["duration"]))
             if aggregate_videos["duration"]
             else 0
-        )
-        cache.set("VIDEOS_DURATION", VIDEOS_DURATION, timeout=CACHE_VIDEO_DEFAULT_TIMEOUT)
-
-    return {
-        "TYPES": types,
-        "DISCIPLINES": disciplines,
-        "VIDEOS_COUNT": VIDEOS_COUNT,
-        "VIDEOS_DURATION": VIDEOS_DURATION,
-        "CHANNELS_PER_BATCH": CHANNELS_PER_BATCH,
+        ),
     }
+
+
+def get_video_data_cache_key(site):
+    """Get the cache key of the video data of the site."""
+    return "VIDEO_DATA_%s" % site.id
+
+
+def is_video_data_fresh(cached_data):
+    """Check if the cached video data can still be used.
+
+    The data is refreshed early with a probability growing as its expiry
+    comes closer and as its computation is longer, so the requests do not
+    all recompute it when it expires.
+    """
+    data, compute_time, expiry = cached_data
+    early = compute_time * VIDEO_DATA_REFRESH_BETA * -math.log(1 - random.random())
+    return time.time() + early < expiry
+
+
+def refresh_video_data(site):
+    """Compute the video data of the site and put it in the cache.
+
+    The data is kept twice as long as its timeout, so the other requests
+    use the expired data while it is computed.
+    """
+    start = time.time()
+    data = get_video_data(site)
+    compute_time = time.time() - start
+    cache.set(
+        get_video_data_cache_key(site),
+        (data, compute_time, time.time() + CACHE_VIDEO_DEFAULT_TIMEOUT),
+        timeout=2 * CACHE_VIDEO_DEFAULT_TIMEOUT,
+    )
+    return data
+
+
+def wait_video_data(site):
+    """Wait for the video data computed by another request, compute it if too long."""
+    for i in range(VIDEO_DATA_LOCK_WAIT):
+        time.sleep(0.1)
+        cached_data = cache.get(get_video_data_cache_key(site))
+        if cached_data is not None:
+            return cached_data[0]
+    return get_video_data(site)
+
+
+def get_cached_video_data(site):
+    """Get the video data of the site from the cache, computed by one request at once."""
+    cached_data = cache.get(get_video_data_cache_key(site))
+    if cached_data is not None and is_video_data_fresh(cached_data):
+        return cached_data[0]
+    lock_key = "%s_LOCK" % get_video_data_cache_key(site)
+    if not cache.add(lock_key, True, timeout=VIDEO_DATA_LOCK_TIMEOUT):
+        if cached_data is not None:
+            return cached_data[0]
+        return wait_video_data(site)
+    try:
+        return refresh_video_data(site)
+    finally:
+        cache.delete(lock_key)
+
+
+def context_video_data(request):
+    """Get video data in cache, if not, create and add it in cache."""
+    video_data = get_cached_video_data(get_current_site(request))
+    return dict(video_data, CHANNELS_PER_BATCH=CHANNELS_PER_BATCH)
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
-from django.core.cache import cache
-from pod.video.context_processors import context_video_data
+from django.contrib.sites.models import Site
+from pod.video.context_processors import refresh_video_data
 from django.core import serializers
 import json
 
@@ -9,21 +9,24 @@ class Command(BaseCommand):
     """Command to store video data in cache."""
 
     help = (
-        "Store video data in django cache : "
-        + "types, discipline, video count and videos duration"
+        "Store video data of each site in django cache : "
+        + "types, discipline, video count and videos duration. "
+        + "Run it more often than CACHE_VIDEO_DEFAULT_TIMEOUT "
+        + "so the requests never compute them."
     )
 
     def handle(self, *args, **options):
         """Function called to store video data in cache."""
-        cache.delete_many(["DISCIPLINES", "VIDEOS_COUNT", "VIDEOS_DURATION", "TYPES"])
-        video_data = context_video_data(request=None)
         msg = "Successfully store video data in cache"
-        for data in video_data:
-            try:
-                msg += "\n %s : %s" % (
-                    data,
-                    json.dumps(serializers.serialize("json", video_data[data])),
-                )
-            except (TypeError, AttributeError):
-                msg += "\n %s : %s" % (data, video_data[data])
+        for site in Site.objects.all():
+            video_data = refresh_video_data(site)
+            msg += "\n%s" % site.domain
+            for data in video_data:
+                try:
+                    msg += "\n %s : %s" % (
+                        data,
+                        json.dumps(serializers.serialize("json", video_data[data])),
+                    )
+                except (TypeError, AttributeError):
+                    msg += "\n %s : %s" % (data, video_data[data])
         self.stdout.write(self.style.SUCCESS(msg))
@@ -0,0 +1,24 @@
+"""Flush the buffered view counts."""
+
+from django.core.management.base import BaseCommand
+
+from pod.video.utils import flush_view_counts
+
+
+class Command(BaseCommand):
+    """Command to write the views counted in the cache into the database."""
+
+    help = (
+        "Write the views counted in the cache when VIEW_COUNT_BUFFER is True "
+        + "into the view counts of the videos. Run it periodically, e.g. every minute."
+    )
+
+    def handle(self, *args, **options):
+        """Function called to flush the view counts."""
+        nb_views = flush_view_counts()
+        if nb_views is None:
+            self.stdout.write(self.style.WARNING("A flush is already running"))
+        else:
+            self.stdout.write(
+                self.style.SUCCESS("Successfully flush %s views" % nb_views)
+            )
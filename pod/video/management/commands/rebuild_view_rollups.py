@@ -0,0 +1,27 @@
+"""Rebuild the view count rollups."""
+
+from django.core.management.base import BaseCommand
+
+from pod.video.utils import rebuild_view_rollups
+
+import time
+
+
+class Command(BaseCommand):
+    """Command to compute the view count rollups of all videos."""
+
+    help = (
+        "Compute again the daily, monthly, yearly and total rollups of views, "
+        + "playlist and favorite additions used by the statistics."
+    )
+
+    def handle(self, *args, **options):
+        """Function called to rebuild the rollups."""
+        start = time.time()
+        nb_rollups = rebuild_view_rollups()
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Successfully rebuild %s rollups in %.2fs"
+                % (nb_rollups, time.time() - start)
+            )
+        )
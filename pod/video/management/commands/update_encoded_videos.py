@@ -0,0 +1,20 @@
+"""Repair the encoded state of the videos."""
+
+from django.core.management.base import BaseCommand
+
+from pod.video.models import Video
+from pod.video_encode_transcript.models import update_videos_encoded
+
+
+class Command(BaseCommand):
+    """Command to compute again the encoded state of all videos."""
+
+    help = (
+        "Compute again the encoded state of the videos from their mp4, "
+        + "HLS playlist and audio encodings."
+    )
+
+    def handle(self, *args, **options):
+        """Function called to update the encoded state of the videos."""
+        nb_videos = update_videos_encoded(Video.objects.all())
+        self.stdout.write(self.style.SUCCESS("Successfully update %s videos" % nb_videos))
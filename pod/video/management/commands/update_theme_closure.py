@@ -0,0 +1,19 @@
+"""Repair the links of the themes to their descendants."""
+
+from django.core.management.base import BaseCommand
+
+from pod.video.models import rebuild_theme_closure
+
+
+class Command(BaseCommand):
+    """Command to compute again the links of all themes."""
+
+    help = (
+        "Compute again the links of the themes to their descendants "
+        + "from the parent of each theme."
+    )
+
+    def handle(self, *args, **options):
+        """Function called to update the links of the themes."""
+        nb_themes = rebuild_theme_closure()
+        self.stdout.write(self.style.SUCCESS("Successfully update %s themes" % nb_themes))
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.23 on 2026-10-18 18:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ViewCountRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('month', 'Month'), ('year', 'Year'), ('total', 'Total')], editable=False, max_length=5, verbose_name='Period')),
+                ('date', models.DateField(editable=False, verbose_name='Date')),
+                ('views', models.IntegerField(default=0, editable=False, verbose_name='Number of view')),
+                ('playlist_additions', models.IntegerField(default=0, editable=False, verbose_name='Number of playlist additions')),
+                ('favorite_additions', models.IntegerField(default=0, editable=False, verbose_name='Number of favorite additions')),
+                ('video', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, to='video.video', verbose_name='Video')),
+            ],
+            options={
+                'verbose_name': 'View count rollup',
+                'verbose_name_plural': 'View count rollups',
+                'unique_together': {('video', 'period', 'date')},
+            },
+        ),
+    ]
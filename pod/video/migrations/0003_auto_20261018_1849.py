@@ -0,0 +1,22 @@
+# Generated by Django 3.2.23 on 2026-10-18 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video', '0002_viewcountrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='is_encoded',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Is encoded'),
+        ),
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['is_encoded', 'is_draft', 'encoding_in_progress'], name='video_available_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.23 on 2026-10-18 19:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video', '0003_auto_20261018_1849'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThemeClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(default=0)),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='video.theme')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='video.theme')),
+            ],
+            options={
+                'verbose_name': 'Theme closure',
+                'verbose_name_plural': 'Theme closures',
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+    ]
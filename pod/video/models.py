@@ -9,8 +9,11 @@ import json
 import logging
 import hashlib
 import datetime
+import uuid
 
 from django.db import models
+from django.db import transaction
+from django.db import IntegrityError
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import get_language
@@ -21,10 +24,11 @@ from django.urls import reverse
 from django.core.exceptions import ValidationError
 from django.core.exceptions import ObjectDoesNotExist
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
 from django.templatetags.static import static
 from django.dispatch import receiver
 from django.utils.html import format_html
-from django.db.models.signals import pre_delete, post_delete
+from django.db.models.signals import pre_delete, post_delete, m2m_changed
 from tagging.models import Tag
 from datetime import date
 from django.utils import timezone
@@ -41,6 +45,7 @@ from django.contrib.auth.hashers import make_password
 from sorl.thumbnail import get_thumbnail
 from pod.authentication.models import AccessGroup
 from pod.main.models import get_nextautoincrement
+from pod.playlist.apps import FAVORITE_PLAYLIST_NAME
 from pod.main.lang_settings import ALL_LANG_CHOICES as __ALL_LANG_CHOICES__
 from pod.main.lang_settings import PREF_LANG_CHOICES as __PREF_LANG_CHOICES__
 from django.db.models import Count, Case, When, Value, BooleanField, Q
@@ -215,9 +220,58 @@ if USE_TRANSCRIPTION:
     TRANSCRIPTION_MODEL_PARAM = getattr(settings, "TRANSCRIPTION_MODEL_PARAM", {})
     TRANSCRIPTION_TYPE = getattr(settings, "TRANSCRIPTION_TYPE", "STT")
 
+CACHE_VIDEO_THUMBNAIL_TIMEOUT = getattr(
+    settings, "CACHE_VIDEO_THUMBNAIL_TIMEOUT", 24 * 3600
+)
+CACHE_CHANNEL_THEMES_TIMEOUT = getattr(
+    settings, "CACHE_CHANNEL_THEMES_TIMEOUT", 24 * 3600
+)
+CHANNEL_DIRECTORY_VERSION_KEY = "video_channel_directory_version"
+# Sizes of the thumbnails cached for each image, None for the image itself
+THUMBNAIL_GEOMETRIES = (None, "100x100", "x170")
+
 # FUNCTIONS
 
 
+def get_thumbnail_cache_key(image_id, geometry=None):
+    """Get the cache key of the url of an image resized to geometry."""
+    return "video_thumbnail_%s_%s" % (image_id, geometry or "file")
+
+
+def get_image_url(image, geometry=None):
+    """Get the url of the image resized to geometry, empty if its file does not exist."""
+    if not image.file_exist():
+        return ""
+    if geometry is None:
+        return image.file.url
+    return get_thumbnail(image.file, geometry, crop="center", quality=72).url
+
+
+def prefetch_thumbnail_urls(videos, geometry=None):
+    """Set the thumbnail urls of the videos, read from the cache or in one query."""
+    videos = [video for video in videos if video.thumbnail_id]
+    keys = {get_thumbnail_cache_key(video.thumbnail_id, geometry) for video in videos}
+    urls = cache.get_many(keys)
+    missing_ids = {
+        video.thumbnail_id
+        for video in videos
+        if get_thumbnail_cache_key(video.thumbnail_id, geometry) not in urls
+    }
+    if missing_ids:
+        images = CustomImageModel.objects.in_bulk(missing_ids)
+        missing_urls = {
+            get_thumbnail_cache_key(image_id, geometry): (
+                get_image_url(images[image_id], geometry) if image_id in images else ""
+            )
+            for image_id in missing_ids
+        }
+        cache.set_many(missing_urls, timeout=CACHE_VIDEO_THUMBNAIL_TIMEOUT)
+        urls.update(missing_urls)
+    for video in videos:
+        key = get_thumbnail_cache_key(video.thumbnail_id, geometry)
+        video.__dict__.setdefault("_thumbnail_urls", {})[key] = urls[key]
+
+
 def get_transcription_choices():
     if USE_TRANSCRIPTION:
         transcript_lang = TRANSCRIPTION_MODEL_PARAM.get(TRANSCRIPTION_TYPE, {}).keys()
@@ -394,19 +448,7 @@ class Channel(models.Model):
 
     def get_all_theme(self):
         """Return the list of all child themes in current channel."""
-        list_theme = []
-        themes = self.themes.filter(parentId=None).order_by("title")
-        for theme in themes:
-            list_theme.append(
-                {
-                    "id": theme.id,
-                    "title": "%s" % theme.title,
-                    "slug": "%s" % theme.slug,
-                    "url": "%s" % theme.get_absolute_url(),
-                    "child": theme.get_all_children_tree(),
-                }
-            )
-        return list_theme
+        return get_channel_themes(self.id)
 
     def get_all_theme_json(self):
         """Return theme list in json format."""
@@ -504,45 +546,34 @@ class Theme(models.Model):
 
     def get_all_children_tree(self):
         """Get a tree of all theme children."""
-        children = []
-        try:
-            child_list = self.children.all().order_by("title")
-        except AttributeError:
-            return children
-        for child in child_list:
-            children.append(
-                {
-                    "id": child.id,
-                    "title": "%s" % child.title,
-                    "slug": "%s" % child.slug,
-                    "url": "%s" % child.get_absolute_url(),
-                    "child": child.get_all_children_tree(),
-                }
-            )
-        return children
+        theme = find_theme(get_channel_themes(self.channel_id), self.id)
+        return theme["child"] if theme else []
 
     def get_all_children_flat(self):
-        """Get a flat list of all theme children."""
-        children = [self]
-        try:
-            child_list = self.children.all()
-        except AttributeError:
-            return children
-        for child in child_list:
-            children.extend(child.get_all_children_flat())
-        return children
+        """Get a flat list of the theme and all its children, in one query."""
+        if self.pk is None:
+            return [self]
+        return [
+            link.descendant
+            for link in ThemeClosure.objects.filter(ancestor_id=self.pk)
+            .select_related("descendant")
+            .order_by("depth", "descendant__title")
+        ]
 
     def get_all_children_tree_json(self):
         """Get a json tree of all theme children."""
         return json.dumps(self.get_all_children_tree())
 
     def get_all_parents(self):
-        """Get a list of all theme parents."""
-        parents = [self]
-        if self.parentId is not None:
-            parent = self.parentId
-            parents.extend(parent.get_all_parents())
-        return parents
+        """Get a list of the theme and all its parents, in one query."""
+        if self.pk is None:
+            return [self] + (self.parentId.get_all_parents() if self.parentId else [])
+        return [
+            link.ancestor
+            for link in ThemeClosure.objects.filter(descendant_id=self.pk)
+            .select_related("ancestor__channel")
+            .order_by("depth")
+        ]
 
     def clean(self):
         """Validate Theme fields."""
@@ -589,6 +620,163 @@ class Theme(models.Model):
         unique_together = ("channel", "slug")
 
 
+class ThemeClosure(models.Model):
+    """Link of a theme to each of its descendants, at any depth.
+
+    Each theme is linked to itself with a depth of 0.
+    """
+
+    ancestor = models.ForeignKey(
+        Theme, related_name="descendant_links", on_delete=models.CASCADE
+    )
+    descendant = models.ForeignKey(
+        Theme, related_name="ancestor_links", on_delete=models.CASCADE
+    )
+    depth = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        """Metadata subclass of theme closure object."""
+
+        verbose_name = _("Theme closure")
+        verbose_name_plural = _("Theme closures")
+        unique_together = ("ancestor", "descendant")
+
+
+def get_channel_themes_key(channel_id, language=None):
+    """Get the cache key of the theme tree of a channel, in the active language."""
+    language = language or get_language() or settings.LANGUAGE_CODE
+    return "channel_themes_%s_%s" % (channel_id, language)
+
+
+def get_channel_themes(channel_id):
+    """
+    Get the theme tree of the channel, from the cache or from one query.
+
+    The titles are translated, so a tree is kept for each language.
+    """
+    key = get_channel_themes_key(channel_id)
+    themes = cache.get(key)
+    if themes is None:
+        nodes = {}
+        children = {}
+        for theme in (
+            Theme.objects.filter(channel_id=channel_id)
+            .order_by("title")
+            .values("id", "parentId", "title", "slug", "channel__slug")
+        ):
+            nodes[theme["id"]] = {
+                "id": theme["id"],
+                "title": "%s" % theme["title"],
+                "slug": "%s" % theme["slug"],
+                "url": reverse(
+                    "channel-video:theme", args=[theme["channel__slug"], theme["slug"]]
+                ),
+                "child": children.setdefault(theme["id"], []),
+            }
+            children.setdefault(theme["parentId"], []).append(nodes[theme["id"]])
+        themes = children.get(None, [])
+        cache.set(key, themes, CACHE_CHANNEL_THEMES_TIMEOUT)
+    return themes
+
+
+def find_theme(themes, theme_id):
+    """Find a theme in a theme tree."""
+    for theme in themes:
+        if theme["id"] == theme_id:
+            return theme
+        child = find_theme(theme["child"], theme_id)
+        if child is not None:
+            return child
+    return None
+
+
+def clear_channel_themes(channel_id):
+    """Remove the theme trees of the channel from the cache, now and after the commit."""
+    keys = [
+        get_channel_themes_key(channel_id, language)
+        for language, name in settings.LANGUAGES
+    ]
+    cache.delete_many(keys)
+    # the trees read by other requests before the commit are not kept
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def update_theme_closure(theme, created):
+    """Link the theme and its descendants to the ancestors of its parent."""
+    ancestors = [
+        (ancestor_id, depth + 1)
+        for ancestor_id, depth in ThemeClosure.objects.filter(
+            descendant_id=theme.parentId_id
+        ).values_list("ancestor_id", "depth")
+    ]
+    if created:
+        subtree = [(theme.id, 0)]
+        links = [ThemeClosure(ancestor_id=theme.id, descendant_id=theme.id, depth=0)]
+    else:
+        current = ThemeClosure.objects.filter(descendant_id=theme.id, depth__gt=0)
+        if set(current.values_list("ancestor_id", "depth")) == set(ancestors):
+            return
+        subtree = list(
+            ThemeClosure.objects.filter(ancestor_id=theme.id).values_list(
+                "descendant_id", "depth"
+            )
+        )
+        if not subtree:
+            # theme created without its links
+            rebuild_theme_closure()
+            return
+        subtree_ids = [descendant_id for descendant_id, depth in subtree]
+        ThemeClosure.objects.filter(descendant_id__in=subtree_ids).exclude(
+            ancestor_id__in=subtree_ids
+        ).delete()
+        links = []
+    links += [
+        ThemeClosure(
+            ancestor_id=ancestor_id,
+            descendant_id=descendant_id,
+            depth=ancestor_depth + descendant_depth,
+        )
+        for ancestor_id, ancestor_depth in ancestors
+        for descendant_id, descendant_depth in subtree
+    ]
+    ThemeClosure.objects.bulk_create(links)
+
+
+def rebuild_theme_closure():
+    """Compute again the links of all the themes, return the number of themes."""
+    parents = dict(Theme.objects.values_list("id", "parentId"))
+    links = []
+    for theme_id in parents:
+        ancestor_id = theme_id
+        depth = 0
+        # the depth is bounded in case of a loop in the parents
+        while ancestor_id is not None and depth < len(parents):
+            links.append(
+                ThemeClosure(ancestor_id=ancestor_id, descendant_id=theme_id, depth=depth)
+            )
+            ancestor_id = parents.get(ancestor_id)
+            depth += 1
+    with transaction.atomic():
+        ThemeClosure.objects.all().delete()
+        ThemeClosure.objects.bulk_create(links, batch_size=1000)
+    return len(parents)
+
+
+@receiver(post_save, sender=Theme)
+def update_theme_links(sender, instance, created, **kwargs):
+    """Keep the links and the tree of the themes up to date."""
+    with transaction.atomic():
+        update_theme_closure(instance, created)
+    clear_channel_themes(instance.channel_id)
+
+
+@receiver(post_delete, sender=Theme)
+@receiver(post_save, sender=Channel)
+def clear_theme_tree(sender, instance, **kwargs):
+    """Remove the theme tree of the channel after a change."""
+    clear_channel_themes(instance.channel_id if sender is Theme else instance.id)
+
+
 class Type(models.Model):
     """Define all video types available."""
 
@@ -846,6 +1034,8 @@ class Video(models.Model):
         _("Encoding in progress"), default=False, editable=False
     )
     is_video = models.BooleanField(_("Is Video"), default=True, editable=False)
+    # Maintained from the encodings by pod.video_encode_transcript.models
+    is_encoded = models.BooleanField(_("Is encoded"), default=False, editable=False)
 
     date_delete = models.DateField(_("Date to delete"), default=default_date_delete)
 
@@ -862,6 +1052,12 @@ class Video(models.Model):
         get_latest_by = "date_added"
         verbose_name = _("video")
         verbose_name_plural = _("videos")
+        indexes = [
+            models.Index(
+                fields=["is_encoded", "is_draft", "encoding_in_progress"],
+                name="video_available_idx",
+            ),
+        ]
 
     def set_password(self) -> None:
         """
@@ -902,8 +1098,37 @@ class Video(models.Model):
         self.slug = "%s-%s" % (newid, slugify(self.title))
         self.tags = remove_accents(self.tags)
         # self.set_password()
+        kwargs["update_fields"] = self.get_update_fields(kwargs)
         super(Video, self).save(*args, **kwargs)
 
+    def get_update_fields(self, save_kwargs):
+        """Get the fields saved by an update of the video.
+
+        The encoded state is only written by the encodings,
+        it is not overwritten with the value loaded before an encoding.
+        """
+        if (
+            self._state.adding
+            or save_kwargs.get("force_insert")
+            or save_kwargs.get("update_fields") is not None
+        ):
+            return save_kwargs.get("update_fields")
+        deferred_fields = self.get_deferred_fields()
+        return [
+            field.attname
+            for field in self._meta.concrete_fields
+            if not field.primary_key
+            and field.attname != "is_encoded"
+            and field.attname not in deferred_fields
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Keep the loaded publication state, to know if a save changes it."""
+        instance = super(Video, cls).from_db(db, field_names, values)
+        instance._loaded_is_draft = instance.__dict__.get("is_draft")
+        return instance
+
     def __str__(self):
         """Display a video object as string."""
         if self.id:
@@ -990,39 +1215,36 @@ class Video(models.Model):
         """
         return 360 if self.is_video else 244
 
+    def get_thumbnail_file_url(self, geometry=None):
+        """Get the url of the thumbnail resized to geometry, empty without thumbnail.
+
+        The url is kept by the video and cached for each image,
+        the cache of an image is cleared when it is saved or deleted.
+        """
+        if not self.thumbnail_id:
+            return ""
+        urls = self.__dict__.setdefault("_thumbnail_urls", {})
+        key = get_thumbnail_cache_key(self.thumbnail_id, geometry)
+        if key not in urls:
+            urls[key] = cache.get(key)
+            if urls[key] is None:
+                urls[key] = get_image_url(self.thumbnail, geometry)
+                cache.set(key, urls[key], timeout=CACHE_VIDEO_THUMBNAIL_TIMEOUT)
+        return urls[key]
+
     def get_thumbnail_url(self):
         """Get a thumbnail url for the video."""
         request = None
-        if self.thumbnail and self.thumbnail.file_exist():
-            thumbnail_url = "".join(
-                [
-                    "//",
-                    get_current_site(request).domain,
-                    self.thumbnail.file.url,
-                ]
-            )
-        else:
-            thumbnail_url = "".join(
-                [
-                    "//",
-                    get_current_site(request).domain,
-                    static(DEFAULT_THUMBNAIL),
-                ]
-            )
-        return thumbnail_url
+        thumbnail_url = self.get_thumbnail_file_url() or static(DEFAULT_THUMBNAIL)
+        return "".join(["//", get_current_site(request).domain, thumbnail_url])
 
     @property
     def get_thumbnail_admin(self):
-        thumbnail_url = ""
         # fix title for xml description
         title = re.sub(r"[\x00-\x08\x0B-\x0C\x0E-\x1F]", "", self.title)
-        if self.thumbnail and self.thumbnail.file_exist():
-            im = get_thumbnail(self.thumbnail.file, "100x100", crop="center", quality=72)
-            thumbnail_url = im.url
-            # <img src="{{ im.url }}" width="{{ im.width }}"
-            # height="{{ im.height }}" loading="lazy">
-        else:
-            thumbnail_url = static(DEFAULT_THUMBNAIL)
+        thumbnail_url = self.get_thumbnail_file_url("100x100") or static(
+            DEFAULT_THUMBNAIL
+        )
         return format_html(
             '<img style="max-width:100px" '
             'src="%s" alt="%s" loading="lazy">'
@@ -1036,14 +1258,7 @@ class Video(models.Model):
 
     def get_thumbnail_card(self):
         """Return thumbnail image card of current video."""
-        thumbnail_url = ""
-        if self.thumbnail and self.thumbnail.file_exist():
-            im = get_thumbnail(self.thumbnail.file, "x170", crop="center", quality=72)
-            thumbnail_url = im.url
-            # <img src="{{ im.url }}" width="{{ im.width }}"
-            # height="{{ im.height }}" loading="lazy">
-        else:
-            thumbnail_url = static(DEFAULT_THUMBNAIL)
+        thumbnail_url = self.get_thumbnail_file_url("x170") or static(DEFAULT_THUMBNAIL)
         return (
             '<img class="pod-thumbnail" src="%s" alt="%s"\
             loading="lazy">'
@@ -1060,11 +1275,7 @@ class Video(models.Model):
     @property
     def encoded(self):
         """Get the encoded status of a video."""
-        return (
-            self.get_playlist_master() is not None
-            or self.get_video_mp4().exists()
-            or self.get_video_m4a() is not None
-        )
+        return self.is_encoded
 
     encoded.fget.short_description = _("Is the video encoded?")
 
@@ -1206,7 +1417,10 @@ class Video(models.Model):
     def get_audio_json(self, extensions):
         """Get the JSON representation of the audio."""
         extension_list = extensions.split(",") if extensions else []
-        list_audio = self.encodingaudio_set.filter(name="audio")
+        # filtered in python to use the prefetched audios
+        list_audio = [
+            audio for audio in self.encodingaudio_set.all() if audio.name == "audio"
+        ]
         dict_src = Video.get_media_json(extension_list, list_audio)
         return dict_src
 
@@ -1241,9 +1455,17 @@ class Video(models.Model):
                     dict_entry.append(video_object)
         return dict_src
 
-    def get_json_to_index(self):
+    def get_json_to_index(self, tags=None):
+        """
+        Get the JSON document of the video in the Elasticsearch index.
+
+        The related objects are read with all() to use them when prefetched.
+        tags is the list of the tag names of the video, read from the database if None.
+        """
         try:
             current_site = Site.objects.get_current()
+            if tags is None:
+                tags = Tag.objects.get_for_object(self).values_list("name", flat=True)
             data_to_dump = {
                 "id": self.id,
                 "title": "%s" % self.title,
@@ -1262,25 +1484,34 @@ class Video(models.Model):
                 "description": "%s" % self.description,
                 "thumbnail": "%s" % self.get_thumbnail_url(),
                 "duration": "%s" % self.duration,
-                "tags": list(
-                    [
-                        {"name": name[0], "slug": slugify(name)}
-                        for name in Tag.objects.get_for_object(self).values_list("name")
-                    ]
-                ),
+                "tags": [{"name": name, "slug": slugify(name)} for name in tags],
                 "type": {"title": self.type.title, "slug": self.type.slug},
-                "disciplines": list(
-                    self.discipline.all()
-                    .filter(site=current_site)
-                    .values("title", "slug")
-                ),
-                "channels": list(
-                    self.channel.all().filter(site=current_site).values("title", "slug")
-                ),
-                "themes": list(self.theme.all().values("title", "slug")),
-                "contributors": list(self.contributor_set.values("name", "role")),
-                "chapters": list(self.chapter_set.values("title", "slug")),
-                "overlays": list(self.overlay_set.values("title", "slug")),
+                "disciplines": [
+                    {"title": discipline.title, "slug": discipline.slug}
+                    for discipline in self.discipline.all()
+                    if discipline.site_id == current_site.id
+                ],
+                "channels": [
+                    {"title": channel.title, "slug": channel.slug}
+                    for channel in self.channel.all()
+                    if channel.site_id == current_site.id
+                ],
+                "themes": [
+                    {"title": theme.title, "slug": theme.slug}
+                    for theme in self.theme.all()
+                ],
+                "contributors": [
+                    {"name": contributor.name, "role": contributor.role}
+                    for contributor in self.contributor_set.all()
+                ],
+                "chapters": [
+                    {"title": chapter.title, "slug": chapter.slug}
+                    for chapter in self.chapter_set.all()
+                ],
+                "overlays": [
+                    {"title": overlay.title, "slug": overlay.slug}
+                    for overlay in self.overlay_set.all()
+                ],
                 "full_url": self.get_full_url(),
                 "is_restricted": self.is_restricted,
                 "password": True if self.password != "" else False,
@@ -1449,6 +1680,60 @@ def video_files_removal(sender, instance, using, **kwargs):
                 encoding.delete()
 
 
+@receiver(post_save, sender=CustomImageModel)
+@receiver(post_delete, sender=CustomImageModel)
+def clear_thumbnail_urls(sender, instance, **kwargs):
+    """Clear the cached urls of an image used as thumbnail."""
+    cache.delete_many(
+        [
+            get_thumbnail_cache_key(instance.id, geometry)
+            for geometry in THUMBNAIL_GEOMETRIES
+        ]
+    )
+
+
+def get_channel_directory_version():
+    """Get the version of the channels of the navbar channel tabs."""
+    version = cache.get(CHANNEL_DIRECTORY_VERSION_KEY)
+    if version is None:
+        cache.add(CHANNEL_DIRECTORY_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(CHANNEL_DIRECTORY_VERSION_KEY)
+    return version
+
+
+def update_channel_directory_version():
+    """Change the version so the channels of the navbar channel tabs are read again."""
+    cache.set(CHANNEL_DIRECTORY_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+@receiver(post_save, sender=Channel)
+@receiver(post_delete, sender=Channel)
+@receiver(m2m_changed, sender=Channel.add_channels_tab.through)
+@receiver(post_save, sender=Theme)
+@receiver(post_delete, sender=Theme)
+@receiver(post_delete, sender=Video)
+@receiver(m2m_changed, sender=Video.channel.through)
+def clear_channel_directory(sender, **kwargs):
+    """Read again the channels of the navbar channel tabs after a change."""
+    update_channel_directory_version()
+    # the channels read by other requests before the commit are read again too
+    transaction.on_commit(update_channel_directory_version)
+
+
+@receiver(post_save, sender=Video)
+def clear_video_channel_directory(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    """Read again the channels of the navbar channel tabs after a video publication."""
+    if update_fields is not None and "is_draft" not in update_fields:
+        return
+    # a new draft is in no channel tab
+    loaded_is_draft = True if created else getattr(instance, "_loaded_is_draft", None)
+    if loaded_is_draft != instance.is_draft:
+        clear_channel_directory(sender)
+    instance._loaded_is_draft = instance.is_draft
+
+
 def remove_video_file(video):
     """Remove video file linked to video."""
     if video.overview:
@@ -1484,6 +1769,13 @@ def video_podfiles_removal(sender, instance, **kwargs):
 
 
 class ViewCount(models.Model):
+    """Views of a video on a day.
+
+    The changes made by save, delete and add are reported in ViewCountRollup.
+    QuerySet.update, delete and bulk_update bypass them: the rollups must then be
+    rebuilt with the rebuild_view_rollups command.
+    """
+
     video = models.ForeignKey(
         Video, verbose_name=_("Video"), editable=False, on_delete=models.CASCADE
     )
@@ -1499,6 +1791,156 @@ class ViewCount(models.Model):
         verbose_name = _("View count")
         verbose_name_plural = _("View counts")
 
+    def get_stored_views(self):
+        """Get the video, the date and the count stored in db, locking the row."""
+        if self.pk is None:
+            return None
+        return (
+            ViewCount.objects.select_for_update()
+            .filter(pk=self.pk)
+            .values_list("video_id", "date", "count")
+            .first()
+        )
+
+    def save(self, *args, **kwargs):
+        """Store the views of the day in db, and report their change in the rollups."""
+        with transaction.atomic():
+            previous_views = self.get_stored_views()
+            super(ViewCount, self).save(*args, **kwargs)
+            if previous_views is not None:
+                video_id, day, count = previous_views
+                ViewCountRollup.add(video_id, day, views=-count)
+            ViewCountRollup.add(self.video_id, self.date, views=self.count)
+
+    def delete(self, *args, **kwargs):
+        """Delete the views of the day, and remove them from the rollups."""
+        with transaction.atomic():
+            stored_views = self.get_stored_views()
+            if stored_views is not None:
+                video_id, day, count = stored_views
+                ViewCountRollup.add(video_id, day, views=-count)
+            return super(ViewCount, self).delete(*args, **kwargs)
+
+    @classmethod
+    def add(cls, video_id, day, count=1):
+        """Add count views of the video on the day, and to its rollups.
+
+        The rollups of a created row are updated by its save.
+        """
+        updated = cls.objects.filter(video_id=video_id, date=day).update(
+            count=models.F("count") + count
+        )
+        if not updated:
+            try:
+                with transaction.atomic():
+                    cls.objects.create(video_id=video_id, date=day, count=count)
+                return
+            except IntegrityError:
+                cls.objects.filter(video_id=video_id, date=day).update(
+                    count=models.F("count") + count
+                )
+        ViewCountRollup.add(video_id, day, views=count)
+
+
+class ViewCountRollup(models.Model):
+    """Views, playlist and favorite additions of a video over a period.
+
+    One row per video for the day, the month, the year and the whole life
+    of the video, dated by the first day of the period.
+    """
+
+    PERIOD_CHOICES = (
+        ("day", _("Day")),
+        ("month", _("Month")),
+        ("year", _("Year")),
+        ("total", _("Total")),
+    )
+    TOTAL_DATE = date(1970, 1, 1)
+
+    video = models.ForeignKey(
+        Video, verbose_name=_("Video"), editable=False, on_delete=models.CASCADE
+    )
+    period = models.CharField(
+        _("Period"), max_length=5, choices=PERIOD_CHOICES, editable=False
+    )
+    date = models.DateField(_("Date"), editable=False)
+    views = models.IntegerField(_("Number of view"), default=0, editable=False)
+    playlist_additions = models.IntegerField(
+        _("Number of playlist additions"), default=0, editable=False
+    )
+    favorite_additions = models.IntegerField(
+        _("Number of favorite additions"), default=0, editable=False
+    )
+
+    class Meta:
+        unique_together = ("video", "period", "date")
+        verbose_name = _("View count rollup")
+        verbose_name_plural = _("View count rollups")
+
+    @classmethod
+    def get_periods(cls, day):
+        """Get the (period, date) keys of the rollups containing the day."""
+        return [
+            ("day", day),
+            ("month", day.replace(day=1)),
+            ("year", day.replace(month=1, day=1)),
+            ("total", cls.TOTAL_DATE),
+        ]
+
+    @classmethod
+    def add(cls, video_id, day, **counts):
+        """Add the counts to the rollups of the video containing the day.
+
+        Rows are only created for positive counts: a removal never
+        creates a rollup, the video may be being deleted.
+        """
+        update = {field: models.F(field) + value for field, value in counts.items()}
+        for period, period_date in cls.get_periods(day):
+            rollups = cls.objects.filter(
+                video_id=video_id, period=period, date=period_date
+            )
+            if rollups.update(**update) or min(counts.values()) < 0:
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        video_id=video_id, period=period, date=period_date, **counts
+                    )
+            except IntegrityError:
+                rollups.update(**update)
+
+
+def get_local_date(value):
+    """Get the date of a datetime in the current time zone."""
+    if timezone.is_naive(value):
+        return value.date()
+    return timezone.localdate(value)
+
+
+def update_playlist_rollups(instance, value):
+    """Report a playlist content addition or removal in the video rollups."""
+    try:
+        favorite = instance.playlist.name == FAVORITE_PLAYLIST_NAME
+    except ObjectDoesNotExist:
+        favorite = False
+    ViewCountRollup.add(
+        instance.video_id,
+        get_local_date(instance.date_added),
+        playlist_additions=value,
+        favorite_additions=value if favorite else 0,
+    )
+
+
+@receiver(post_save, sender="playlist.PlaylistContent")
+def playlist_content_rollups_add(sender, instance, created, **kwargs):
+    if created:
+        update_playlist_rollups(instance, 1)
+
+
+@receiver(post_delete, sender="playlist.PlaylistContent")
+def playlist_content_rollups_remove(sender, instance, **kwargs):
+    update_playlist_rollups(instance, -1)
+
 
 class UserMarkerTime(models.Model):
     """Record the time of video played by a user."""
@@ -1710,6 +2152,33 @@ class VideoToDelete(models.Model):
         return "%s - nb videos: %s" % (self.date_deletion, self.video.count())
 
 
+def get_comment_values(comments, user_id):
+    """Get the values of the comments with their number of votes and author name."""
+    return (
+        comments.annotate(nbr_vote=Count("vote", distinct=True))
+        .annotate(
+            author_name=Concat("author__first_name", Value(" "), "author__last_name")
+        )
+        .annotate(
+            is_owner=Case(
+                When(author__id=user_id, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+        )
+        .values(
+            "id",
+            "parent__id",
+            "direct_parent__id",
+            "is_owner",
+            "author_name",
+            "added",
+            "content",
+            "nbr_vote",
+        )
+    )
+
+
 class Comment(models.Model):
     """Video comment model."""
 
@@ -1745,29 +2214,7 @@ class Comment(models.Model):
         return Comment.objects.filter(parent_id=self.id).order_by("id")
 
     def get_json_children(self, user_id):
-        return list(
-            self.get_children.annotate(nbr_vote=Count("vote", distinct=True))
-            .annotate(
-                author_name=Concat("author__first_name", Value(" "), "author__last_name")
-            )
-            .annotate(
-                is_owner=Case(
-                    When(author__id=user_id, then=Value(True)),
-                    default=Value(False),
-                    output_field=BooleanField(),
-                )
-            )
-            .values(
-                "id",
-                "parent__id",
-                "direct_parent__id",
-                "is_owner",
-                "author_name",
-                "added",
-                "content",
-                "nbr_vote",
-            )
-        )
+        return list(get_comment_values(self.get_children, user_id))
 
     def __str__(self):
         """Render the comment as string."""
@@ -1787,6 +2234,44 @@ class Vote(models.Model):
         return str(self.user)
 
 
+def get_comments_version(video_id):
+    """Get the time of the last change of the comments and votes of the video."""
+    key = "video_comments_version_%s" % video_id
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time(), None)
+        version = cache.get(key)
+    return version
+
+
+def update_comments_version(video_id):
+    """Change the version of the comments of the video, now and after the commit."""
+    key = "video_comments_version_%s" % video_id
+    cache.set(key, time.time(), None)
+    # the trees read by other requests before the commit are not kept
+    transaction.on_commit(lambda: cache.set(key, time.time(), None))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def update_comment_tree(sender, instance, **kwargs):
+    """Change the version of the comment tree of the video."""
+    update_comments_version(instance.video_id)
+
+
+@receiver(post_save, sender=Vote)
+@receiver(post_delete, sender=Vote)
+def update_vote_comment_tree(sender, instance, **kwargs):
+    """Change the version of the comment tree of the video of the voted comment."""
+    video_id = (
+        Comment.objects.filter(id=instance.comment_id)
+        .values_list("video_id", flat=True)
+        .first()
+    )
+    if video_id is not None:
+        update_comments_version(video_id)
+
+
 class Category(models.Model):
     """Video category Model."""
 
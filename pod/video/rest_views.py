@@ -6,8 +6,12 @@ from rest_framework.response import Response
 from rest_framework import renderers
 from rest_framework.decorators import action
 
+from django.db.models import Prefetch
 from django.template.loader import render_to_string
 
+from pod.video_encode_transcript.models import EncodingVideo
+from pod.video_search.utils import get_tags_by_video
+
 from .models import Channel, Theme
 from .models import Type, Discipline, Video
 from .models import ViewCount
@@ -115,28 +119,48 @@ class VideoSerializer(serializers.HyperlinkedModelSerializer):
         )
 
 
+class VideoUserListSerializer(serializers.ListSerializer):
+    """Serialize the videos of a page with the tags of all of them read at once."""
+
+    def to_representation(self, data):
+        videos = list(data)
+        self.context["tags"] = get_tags_by_video([video.id for video in videos])
+        return super(VideoUserListSerializer, self).to_representation(videos)
+
+
 class VideoUserSerializer(serializers.ModelSerializer):
+    @staticmethod
+    def prefetch_video_data(queryset):
+        """Read the relations of the video data with a few queries for all the videos."""
+        return queryset.select_related(
+            "owner", "type", "thumbnail", "encodingstep", "videoversion"
+        ).prefetch_related(
+            "discipline",
+            "channel",
+            "theme",
+            "contributor_set",
+            "chapter_set",
+            "overlay_set",
+            Prefetch(
+                "encodingvideo_set",
+                queryset=EncodingVideo.objects.select_related("rendition"),
+            ),
+            "encodingaudio_set",
+        )
+
     def to_representation(self, instance):
         data = super(VideoUserSerializer, self).to_representation(instance)
         request = self.context["request"]
-        video_data = json.loads(instance.get_json_to_index())
+        tags = self.context.get("tags", {}).get(instance.id, [])
+        video_data = json.loads(instance.get_json_to_index(tags))
         video_data.update({"encoded": instance.encoded})
         video_data.update({"encoding_in_progress": instance.encoding_in_progress})
         video_data.update({"get_encoding_step": instance.get_encoding_step})
         video_data.update({"get_thumbnail_admin": instance.get_thumbnail_admin})
-        video_data.update(
-            {
-                "video_files": (
-                    instance.get_audio_and_video_json(
-                        request.GET.get("extensions", default=None)
-                    )
-                    if instance.get_audio_and_video_json(
-                        request.GET.get("extensions", default=None)
-                    )
-                    else ""
-                )
-            }
+        video_files = instance.get_audio_and_video_json(
+            request.GET.get("extensions", default=None)
         )
+        video_data.update({"video_files": video_files if video_files else ""})
         data["video_data"] = video_data
         return data
 
@@ -161,6 +185,7 @@ class VideoUserSerializer(serializers.ModelSerializer):
             "encoded",
             "duration_in_time",
         )
+        list_serializer_class = VideoUserListSerializer
 
 
 class ViewCountSerializer(serializers.HyperlinkedModelSerializer):
@@ -217,13 +242,12 @@ class VideoViewSet(viewsets.ModelViewSet):
             owner__username=request.GET.get("username")
         )
         if request.GET.get("encoded") and request.GET.get("encoded") == "true":
-            user_videos = user_videos.exclude(
-                pk__in=[vid.id for vid in user_videos if not vid.encoded]
-            )
+            user_videos = user_videos.filter(is_encoded=True)
         if request.GET.get("search_title") and request.GET.get("search_title") != "":
             user_videos = user_videos.filter(
                 title__icontains=request.GET.get("search_title")
             )
+        user_videos = VideoUserSerializer.prefetch_video_data(user_videos)
         page = self.paginate_queryset(user_videos)
         if page is not None:
             serializer = VideoUserSerializer(
@@ -219,7 +219,7 @@ function convertToModalListElement(channel) {
  * @param {any} channel The channel element.
  */
 function setImageForModal(dFlexSpanElement, channel) {
-  if (channel.headband) {
+  if (channel.headbandImage) {
     dFlexSpanElement.innerHTML += `<img src="${channel.headbandImage}" height="34" class="rounded" alt="" loading="lazy">`;
   }
 }
@@ -18,6 +18,7 @@ from ..context_processors import get_available_videos
 from pod.video_encode_transcript.utils import check_file
 from django.contrib.auth.models import User
 from pod.video.models import Video
+from pod.video.models import prefetch_thumbnail_urls
 
 import importlib
 import os
@@ -112,14 +113,9 @@ def get_last_videos(context):
     if not HOMEPAGE_SHOWS_RESTRICTED:
         videos = videos.filter(is_restricted=False)
     videos = videos.defer("video", "slug", "owner", "additional_owners", "description")
-    count = 0
-    recent_vids = []
-    for vid in videos:
-        if vid.encoded:
-            recent_vids.append(vid)
-            count = count + 1
-        if count >= HOMEPAGE_NB_VIDEOS:
-            break
+    # the available videos are encoded
+    recent_vids = list(videos[:HOMEPAGE_NB_VIDEOS])
+    prefetch_thumbnail_urls(recent_vids, "x170")
 
     return recent_vids
 
@@ -5,13 +5,15 @@ from django.http import JsonResponse, HttpResponse
 from django.test import TestCase, Client
 from django.urls import reverse
 from pod.authentication.models import User
-from pod.video.models import Comment, Video, Type
+from pod.video.models import Comment, Video, Type, Vote
 from django.contrib.sites.models import Site
-from pod.video.views import get_comments, get_children_comment
+from pod.video import views
+from pod.video.views import get_comments, get_children_comment, get_comment_tree
 from pod.video.views import add_comment, delete_comment
 import ast
 import json
 import logging
+from unittest import mock
 
 
 class TestComment(TestCase):
@@ -195,6 +197,49 @@ class TestComment(TestCase):
             expected_response.content.decode("UTF-8"),
         )
 
+    def test_get_comment_tree(self):
+        """Test the comment tree of the video, paginated and in constant queries."""
+        answer = Comment.objects.create(
+            author=self.admin_user,
+            content="Admin answers the video owner",
+            video=self.video,
+            parent=self.admin_comment,
+            direct_parent=self.owner_to_admin_comment,
+        )
+        Vote.objects.create(user=self.simple_user, comment=answer)
+        url = reverse("video:get_comment_tree", kwargs={"video_slug": self.video.slug})
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.resolver_match.func, get_comment_tree)
+        data = response.json()
+        self.assertIsNone(data["next"])
+        self.assertEqual(
+            [thread["id"] for thread in data["threads"]],
+            [self.admin_comment.id, self.simple_user_comment.id],
+        )
+        thread = data["threads"][0]
+        self.assertEqual(thread["nbr_child"], 2)
+        self.assertEqual(thread["children"][0]["id"], self.owner_to_admin_comment.id)
+        self.assertEqual(thread["children"][0]["children"][0]["id"], answer.id)
+        self.assertEqual(thread["children"][0]["children"][0]["nbr_vote"], 1)
+
+        # unchanged comments are not sent again
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        Vote.objects.create(user=self.owner_user, comment=answer)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+
+        with mock.patch.object(views, "COMMENT_TREE_PAGE_SIZE", 1):
+            data = self.client.get(url).json()
+            self.assertEqual(len(data["threads"]), 1)
+            with self.assertNumQueries(3):
+                data = self.client.get(url, {"cursor": data["next"]}).json()
+        self.assertEqual(data["threads"][0]["id"], self.simple_user_comment.id)
+        self.assertIsNone(data["next"])
+        response = self.client.get(url, {"cursor": "wrong"})
+        self.assertEqual(response.status_code, 400)
+
     def test_add_comment(self):
         """Test add parent comment."""
         pk = Comment.objects.all().count() + 1
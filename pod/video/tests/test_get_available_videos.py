@@ -2,10 +2,15 @@
 
 from django.test import TestCase
 from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from unittest import mock
 from ..models import Video, Type
 
+from .. import context_processors
 from ..context_processors import __AVAILABLE_VIDEO_FILTER__
 from ..context_processors import get_available_videos
+from ..context_processors import get_cached_video_data, refresh_video_data
 
 from pod.video_encode_transcript.models import EncodingVideo
 from pod.video_encode_transcript.models import PlaylistVideo
@@ -52,6 +57,11 @@ class VideoAvailableTestCase(TestCase):
         vids = Video.objects.filter(**__AVAILABLE_VIDEO_FILTER__)
         self.assertEqual(vids.count(), 0)
         vid1 = Video.objects.get(id=1)
+        EncodingVideo.objects.create(
+            video=vid1,
+            encoding_format="video/mp4",
+            rendition=VideoRendition.objects.get(id=1),
+        )
         vid1.is_draft = False
         vid1.save()
         vids = Video.objects.filter(**__AVAILABLE_VIDEO_FILTER__)
@@ -71,8 +81,9 @@ class VideoAvailableTestCase(TestCase):
 
         vid1.is_draft = False
         vid1.save()
+        # not encoded yet
         vids = Video.objects.filter(**__AVAILABLE_VIDEO_FILTER__)
-        self.assertEqual(vids.count(), 1)
+        self.assertEqual(vids.count(), 0)
         EncodingVideo.objects.create(
             video=vid1,
             encoding_format="video/mp4",
@@ -120,3 +131,37 @@ class VideoAvailableTestCase(TestCase):
         plvid1.delete()
         vids = get_available_videos()
         self.assertEqual(vids.count(), 1)
+
+    def test_video_data(self):
+        """Test that the video data is computed by one request and refreshed early."""
+        cache.clear()
+        site = Site.objects.get_current()
+        with mock.patch.object(
+            context_processors, "get_video_data", wraps=context_processors.get_video_data
+        ) as get_video_data:
+            data = get_cached_video_data(site)
+            self.assertIsInstance(data["TYPES"], list)
+            self.assertEqual(data["VIDEOS_COUNT"], 0)
+            with self.assertNumQueries(0):
+                self.assertEqual(get_cached_video_data(site), data)
+            self.assertEqual(get_video_data.call_count, 1)
+            # another request computes the expired data, the stale one is used
+            key = context_processors.get_video_data_cache_key(site)
+            cache.set(key, (data, 0, 0))
+            cache.add("%s_LOCK" % key, True)
+            self.assertEqual(get_cached_video_data(site), data)
+            self.assertEqual(get_video_data.call_count, 1)
+            cache.delete("%s_LOCK" % key)
+            # the data close to expiry is refreshed early
+            with mock.patch.object(context_processors, "VIDEO_DATA_REFRESH_BETA", 1e9):
+                get_cached_video_data(site)
+            self.assertEqual(get_video_data.call_count, 2)
+        video = Video.objects.get(title="Video1")
+        EncodingVideo.objects.create(
+            video=video,
+            encoding_format="video/mp4",
+            rendition=VideoRendition.objects.get(id=1),
+        )
+        Video.objects.filter(id=video.id).update(is_draft=False)
+        refresh_video_data(site)
+        self.assertEqual(get_cached_video_data(site)["VIDEOS_COUNT"], 1)
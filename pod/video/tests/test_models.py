@@ -6,11 +6,15 @@ from django.template.defaultfilters import slugify
 from django.db.models.fields.files import ImageFieldFile
 from django.contrib.auth.models import User
 from django.utils.translation import ugettext_lazy as _
+from django.utils import translation
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError
 from django.db import transaction
+from django.core.management import call_command
+from django.core.cache import cache
 
+from .. import models
 from ..models import Channel
 from ..models import Theme
 from ..models import Type
@@ -21,6 +25,7 @@ from ..models import get_storage_path_video
 from ..models import VIDEOS_DIR
 from ..models import Notes, AdvancedNotes
 from ..models import UserMarkerTime
+from ..models import prefetch_thumbnail_urls
 
 from pod.video_encode_transcript.models import VideoRendition
 from pod.video_encode_transcript.models import EncodingVideo
@@ -31,6 +36,8 @@ from pod.video_encode_transcript.models import EncodingStep
 
 from datetime import datetime
 from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
 import os
 
@@ -178,6 +185,60 @@ class ThemeTestCase(TestCase):
         self.assertEqual(Theme.objects.all().count(), 0)
         print("   --->  test_delete_object of ThemeTestCase: OK!")
 
+    def test_theme_tree(self):
+        """Test the parents, children and tree of the themes, in one query each."""
+        channel = Channel.objects.get(title="ChannelTest1")
+        theme1 = Theme.objects.get(title="Theme1")
+        theme2 = Theme.objects.get(title="Theme2")
+        theme3 = Theme.objects.create(parentId=theme2, title="Theme3", channel=channel)
+        theme4 = Theme.objects.create(title="Theme4", channel=channel)
+        with self.assertNumQueries(1):
+            self.assertEqual(theme3.get_all_parents(), [theme3, theme2, theme1])
+        with self.assertNumQueries(1):
+            self.assertEqual(theme1.get_all_children_flat(), [theme1, theme2, theme3])
+        with self.assertNumQueries(1):
+            tree = channel.get_all_theme()
+        self.assertEqual([theme["title"] for theme in tree], ["Theme1", "Theme4"])
+        self.assertEqual(tree[0]["child"][0]["child"][0]["id"], theme3.id)
+        self.assertEqual(tree[0]["child"][0]["url"], theme2.get_absolute_url())
+        with self.assertNumQueries(0):
+            self.assertEqual(theme2.get_all_children_tree(), tree[0]["child"][0]["child"])
+
+        # the titles are in the language of each request
+        theme1.title_fr = "Thème1"
+        theme1.save()
+        with translation.override("fr"):
+            self.assertIn("Thème1", [theme["title"] for theme in channel.get_all_theme()])
+        with translation.override("en"):
+            self.assertEqual(channel.get_all_theme()[0]["title"], "Theme1")
+
+        # move Theme2 and its child under Theme4
+        theme2.parentId = theme4
+        theme2.save()
+        self.assertEqual(theme3.get_all_parents(), [theme3, theme2, theme4])
+        self.assertEqual(theme1.get_all_children_flat(), [theme1])
+        self.assertEqual(theme4.get_all_children_flat(), [theme4, theme2, theme3])
+        self.assertEqual(theme4.get_all_children_tree()[0]["id"], theme2.id)
+        self.assertEqual(theme1.get_all_children_tree(), [])
+        theme4.delete()
+        self.assertEqual(models.ThemeClosure.objects.count(), 1)
+        self.assertEqual(
+            channel.get_all_theme(),
+            [
+                {
+                    "id": theme1.id,
+                    "title": "Theme1",
+                    "slug": theme1.slug,
+                    "url": theme1.get_absolute_url(),
+                    "child": [],
+                }
+            ],
+        )
+        models.ThemeClosure.objects.all().delete()
+        call_command("update_theme_closure", stdout=StringIO())
+        self.assertEqual(theme1.get_all_parents(), [theme1])
+        print("   --->  test_theme_tree of ThemeTestCase: OK!")
+
 
 class TypeTestCase(TestCase):
     """Test the video type."""
@@ -388,6 +449,34 @@ class VideoTestCase(TestCase):
 
         print("   --->  test_delete_object of Video: OK!")
 
+    def test_thumbnail_urls_cache(self):
+        """Test that the thumbnail urls are cached until the image changes."""
+        cache.clear()
+        with mock.patch.object(
+            CustomImageModel, "file_exist", return_value=True
+        ), mock.patch.object(models, "get_thumbnail") as get_thumbnail:
+            get_thumbnail.return_value.url = "/media/thumbnail.jpg"
+            video = Video.objects.get(id=2)
+            self.assertIn("/media/thumbnail.jpg", video.get_thumbnail_card())
+            # read from the cache, without the image
+            video = Video.objects.get(id=2)
+            with self.assertNumQueries(0):
+                self.assertIn("/media/thumbnail.jpg", video.get_thumbnail_card())
+                self.assertEqual(video.encoded, video.is_encoded)
+            self.assertEqual(get_thumbnail.call_count, 1)
+            # the images of all the videos are read by one query
+            videos = list(Video.objects.all())
+            with self.assertNumQueries(1):
+                prefetch_thumbnail_urls(videos)
+                for video in videos:
+                    video.get_thumbnail_file_url()
+            # the cache is cleared when the image is saved
+            get_thumbnail.return_value.url = "/media/thumbnail2.jpg"
+            video = Video.objects.get(id=2)
+            video.thumbnail.save()
+            self.assertIn("/media/thumbnail2.jpg", video.get_thumbnail_card())
+        print("   --->  test_thumbnail_urls_cache of Video: OK!")
+
 
 class VideoRenditionTestCase(TestCase):
     """Test the Video Rendition."""
@@ -567,6 +656,33 @@ class EncodingVideoTestCase(TestCase):
 
         print("   --->  test_delete_object of EncodingVideoTestCase: OK!")
 
+    def test_video_is_encoded(self):
+        """Test that the encoded state of the video follows its encodings."""
+        video = Video.objects.get(id=1)
+        self.assertFalse(video.is_encoded)
+        ev = EncodingVideo.objects.create(
+            video=video,
+            rendition=VideoRendition.objects.get(resolution="640x360"),
+            encoding_format="video/webm",
+        )
+        self.assertFalse(Video.objects.get(id=1).is_encoded)
+        ev.encoding_format = "video/mp4"
+        ev.save()
+        self.assertTrue(Video.objects.get(id=1).is_encoded)
+        ea = EncodingAudio.objects.create(video=video, encoding_format="video/mp4")
+        ev.delete()
+        self.assertTrue(Video.objects.get(id=1).is_encoded)
+        ea.delete()
+        self.assertFalse(Video.objects.get(id=1).is_encoded)
+        # the repair command recomputes the state of all videos
+        EncodingVideo.objects.create(
+            video=video, rendition=VideoRendition.objects.get(resolution="640x360")
+        )
+        Video.objects.update(is_encoded=False)
+        call_command("update_encoded_videos", stdout=StringIO())
+        self.assertTrue(Video.objects.get(id=1).is_encoded)
+        print("   --->  test_video_is_encoded of EncodingVideoTestCase: OK!")
+
 
 class EncodingAudioTestCase(TestCase):
     """Test the Audio Encoding model."""
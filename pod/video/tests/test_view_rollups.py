@@ -0,0 +1,169 @@
+"""View count rollups Test Case."""
+
+from datetime import date, timedelta
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from unittest import skipUnless
+
+from pod.playlist.apps import FAVORITE_PLAYLIST_NAME
+from pod.playlist.models import Playlist, PlaylistContent
+from pod.video.admin import ViewCountAdmin
+from pod.video.models import Type, Video, ViewCount, ViewCountRollup
+from pod.video.utils import get_views_count_by_video, rebuild_view_rollups
+from pod.video.views import get_all_views_count
+
+import os
+import random
+import time
+
+# Set POD_STATS_BENCHMARK=1 to compare the rollups to the per video queries.
+RUN_BENCHMARK = os.environ.get("POD_STATS_BENCHMARK", "") != ""
+
+TODAY = date.today()
+
+
+def create_videos(owner, number):
+    """Create number videos of owner."""
+    return [
+        Video.objects.create(
+            title="Rollup video %s" % index,
+            owner=owner,
+            video="rollupvideo%s.mp4" % index,
+            type=Type.objects.get(id=1),
+        )
+        for index in range(number)
+    ]
+
+
+class ViewCountRollupTestCase(TestCase):
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def setUp(self):
+        """Create videos, views and playlist additions."""
+        self.user = User.objects.create(username="pod", password="pod1234pod")
+        self.video, self.video2 = create_videos(self.user, 2)
+        self.playlist = Playlist.objects.create(
+            name="Rollup playlist", owner=self.user, site=Site.objects.get_current()
+        )
+        self.favorites = Playlist.objects.create(
+            name=FAVORITE_PLAYLIST_NAME, owner=self.user, site=Site.objects.get_current()
+        )
+        self.client.post(reverse("video:video_count", kwargs={"id": self.video.id}))
+        self.client.post(reverse("video:video_count", kwargs={"id": self.video.id}))
+        ViewCount.add(self.video.id, TODAY - timedelta(days=40), 5)
+        ViewCount.add(self.video2.id, TODAY - timedelta(days=400), 3)
+        PlaylistContent.objects.create(playlist=self.playlist, video=self.video)
+        PlaylistContent.objects.create(playlist=self.favorites, video=self.video)
+        PlaylistContent.objects.create(
+            playlist=self.favorites,
+            video=self.video2,
+            date_added=timezone.now() - timedelta(days=400),
+        )
+        PlaylistContent.objects.create(playlist=self.playlist, video=self.video2)
+        PlaylistContent.objects.filter(playlist=self.playlist, video=self.video2).delete()
+        self.video_ids = [self.video.id, self.video2.id]
+        self.dates = [TODAY, TODAY - timedelta(days=40), TODAY - timedelta(days=400)]
+
+    def assert_same_counts(self):
+        """Check the rollups against the per video queries."""
+        for date_filter in self.dates:
+            views_count = get_views_count_by_video(self.video_ids, date_filter)
+            for video_id in self.video_ids:
+                self.assertEqual(
+                    views_count[video_id], get_all_views_count(video_id, date_filter)
+                )
+
+    def test_incremental_rollups(self):
+        """Test that the rollups follow views and playlist changes."""
+        self.assert_same_counts()
+        views_count = get_views_count_by_video(self.video_ids, TODAY)
+        self.assertEqual(views_count[self.video.id]["day"], 2)
+        self.assertEqual(views_count[self.video.id]["since_created"], 7)
+        self.assertEqual(views_count[self.video.id]["fav_day"], 1)
+        self.assertEqual(views_count[self.video2.id]["playlist_day"], 0)
+        self.assertEqual(views_count[self.video2.id]["fav_since_created"], 1)
+        print(" --->  test_incremental_rollups of ViewCountRollupTestCase: OK!")
+
+    def test_rebuild_rollups(self):
+        """Test that the rebuilt rollups are the incremental ones."""
+        # a removal leaves an empty rollup, the rebuild does not create it
+        rollups = ViewCountRollup.objects.exclude(
+            views=0, playlist_additions=0, favorite_additions=0
+        )
+        incremental_rollups = {rollup[1:] for rollup in rollups.values_list()}
+        ViewCountRollup.objects.all().delete()
+        rebuild_view_rollups()
+        self.assertEqual(
+            {rollup[1:] for rollup in ViewCountRollup.objects.values_list()},
+            incremental_rollups,
+        )
+        self.assert_same_counts()
+        print(" --->  test_rebuild_rollups of ViewCountRollupTestCase: OK!")
+
+    def test_view_count_rows(self):
+        """Test that the rows written outside of ViewCount.add update the rollups."""
+        view_count = ViewCount.objects.create(video=self.video2, date=TODAY, count=4)
+        self.assert_same_counts()
+        view_count.count = 6
+        view_count.save()
+        self.assert_same_counts()
+        self.assertEqual(
+            get_views_count_by_video(self.video_ids, TODAY)[self.video2.id]["day"], 6
+        )
+        view_count.delete()
+        self.assert_same_counts()
+        ViewCountAdmin(ViewCount, admin.site).delete_queryset(
+            None, ViewCount.objects.filter(video=self.video)
+        )
+        self.assert_same_counts()
+        self.assertEqual(
+            get_views_count_by_video(self.video_ids, TODAY)[self.video.id]["day"], 0
+        )
+        print(" --->  test_view_count_rows of ViewCountRollupTestCase: OK!")
+
+    def test_rollups_query_count(self):
+        """Test that the counters of all the videos are read by one query."""
+        with self.assertNumQueries(1):
+            get_views_count_by_video(self.video_ids, TODAY)
+        self.video.delete()
+        self.assertFalse(ViewCountRollup.objects.filter(video_id=self.video.id).exists())
+        print(" --->  test_rollups_query_count of ViewCountRollupTestCase: OK!")
+
+
+@skipUnless(RUN_BENCHMARK, "Statistics benchmark is disabled")
+class ViewCountRollupBenchmarkTestCase(TestCase):
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def setUp(self):
+        """Seed 200 videos with a year of views."""
+        user = User.objects.create(username="pod", password="pod1234pod")
+        self.videos = create_videos(user, 200)
+        ViewCount.objects.bulk_create(
+            ViewCount(
+                video=video, date=TODAY - timedelta(days=day), count=random.randint(1, 50)
+            )
+            for video in self.videos
+            for day in range(0, 365, 3)
+        )
+        rebuild_view_rollups()
+
+    def test_benchmark_rollups(self):
+        """Compare the rollups to the per video queries."""
+        start = time.perf_counter()
+        counts = {video.id: get_all_views_count(video.id, TODAY) for video in self.videos}
+        per_video_time = time.perf_counter() - start
+        start = time.perf_counter()
+        rollups = get_views_count_by_video([video.id for video in self.videos], TODAY)
+        rollups_time = time.perf_counter() - start
+        self.assertEqual(counts, rollups)
+        print("\n ---> Per video queries: %.3fs" % per_video_time)
+        print(" ---> Rollups: %.3fs" % rollups_time)
+        self.assertLess(rollups_time, per_video_time)
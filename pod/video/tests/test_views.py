@@ -11,24 +11,33 @@ from pod.authentication.models import AccessGroup
 from django.contrib.sites.models import Site
 from django.contrib.messages import get_messages
 from django.core.files.temp import NamedTemporaryFile
+from django.core.cache import cache
+from django.db import connection, DatabaseError
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
 
 from pod.main.models import AdditionalChannelTab
 
 from ..models import Type
 from ..models import Theme
 from ..models import Video
+from ..models import ViewCount
 from ..models import Channel
 from ..models import Discipline
 from ..models import AdvancedNotes
+from ..models import get_channel_directory_version
 from pod.video_encode_transcript import encode
 from pod.video_encode_transcript.models import VideoRendition
 from pod.video_encode_transcript.models import EncodingVideo
 from .. import views
+from ..utils import flush_view_counts
 
 import re
 import json
 from http import HTTPStatus
 from importlib import reload
+from unittest import mock
 import shutil
 import os
 
@@ -534,6 +543,8 @@ class VideosTestView(TestCase):
                 encoding_format="video/mp4",
                 source_file="360p.mp4",
             )
+        # the count of the videos is cached for each set of filters
+        cache.clear()
         print(" --->  SetUp of VideosTestView: OK!")
 
     @override_settings(HIDE_USER_FILTER=False)
@@ -589,6 +600,48 @@ class VideosTestView(TestCase):
         self.assertEqual(response.context["videos"].paginator.count, 3)
         print(" --->  test_get_videos_view of VideosTestView: OK!")
 
+    def test_videos_view_pagination(self):
+        """Test the cached count and the keyset pagination of the videos."""
+        url = reverse("videos:videos")
+        with mock.patch.object(views, "VIDEOS_PER_PAGE", 2):
+            response = self.client.get(url)
+            self.assertEqual(response.context["count_videos"], 4)
+            self.assertEqual(
+                [video.title for video in response.context["videos"]],
+                ["Video5", "Video4"],
+            )
+            self.assertTrue(response.context["next_cursor"])
+            # the count and the site settings are cached,
+            # the page and its chapters are read in two queries
+            with self.assertNumQueries(2):
+                response = self.client.get(
+                    url,
+                    {"page": 2, "after": response.context["next_cursor"]},
+                    HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+                )
+            self.assertEqual(
+                [video.title for video in response.context["videos"]],
+                ["Video3", "Video1"],
+            )
+            self.assertFalse(response.context["videos"].has_next())
+            self.assertEqual(response.context["count_videos"], 4)
+            # the cursor of another sort is ignored
+            response = self.client.get(
+                url,
+                {
+                    "sort": "date_added",
+                    "sort_direction": "asc",
+                    "page": 2,
+                    "after": response.context["next_cursor"] or "bad",
+                },
+            )
+            self.assertEqual(response.context["videos"].paginator.count, 4)
+            self.assertEqual(
+                [video.title for video in response.context["videos"]],
+                ["Video4", "Video5"],
+            )
+        print(" --->  test_videos_view_pagination of VideosTestView: OK!")
+
 
 class VideoTestView(TestCase):
     fixtures = [
@@ -1119,6 +1172,58 @@ class video_countTestView(TestCase):
         self.assertEqual(video.get_viewcount(), 1)
         print(" --->  test_video_countTestView_post_request of video_countTestView: OK!")
 
+    @mock.patch.object(views, "VIEW_COUNT_BUFFER", True)
+    def test_video_countTestView_buffered_post_request(self):
+        """Test that buffered views are written by flush_view_counts."""
+        cache.clear()
+        video = Video.objects.get(title="Video1")
+        url = reverse("video:video_count", kwargs={"id": video.id})
+        for i in range(3):
+            response = self.client.post(url, {})
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(video.get_viewcount(), 0)
+        self.assertEqual(flush_view_counts(), 3)
+        self.assertEqual(video.get_viewcount(), 3)
+        self.client.post(url, {})
+        self.assertEqual(flush_view_counts(), 1)
+        self.assertEqual(flush_view_counts(), 0)
+        self.assertEqual(video.get_viewcount(), 4)
+        print(
+            " --->  test_video_countTestView_buffered_post_request"
+            + " of video_countTestView: OK!"
+        )
+
+    @mock.patch.object(views, "VIEW_COUNT_BUFFER", True)
+    def test_video_countTestView_expired_buffered_views(self):
+        """Test that the views of an expired counter are flushed once."""
+        cache.clear()
+        video = Video.objects.get(title="Video1")
+        url = reverse("video:video_count", kwargs={"id": video.id})
+
+        def expire(key, delta=1):
+            cache.delete(key)
+            raise ValueError("Key '%s' not found" % key)
+
+        self.client.post(url, {})
+        self.client.post(url, {})
+        # the counter expires between its read and its decrement
+        with mock.patch.object(cache, "decr", side_effect=expire):
+            self.assertEqual(flush_view_counts(), 2)
+        self.assertEqual(flush_view_counts(), 0)
+        self.assertEqual(video.get_viewcount(), 2)
+        self.client.post(url, {})
+        # the counter expires before the views are restored
+        with mock.patch.object(
+            cache, "decr", side_effect=expire
+        ), mock.patch.object(ViewCount, "add", side_effect=DatabaseError):
+            self.assertEqual(flush_view_counts(), 0)
+        self.assertEqual(flush_view_counts(), 1)
+        self.assertEqual(video.get_viewcount(), 3)
+        print(
+            " --->  test_video_countTestView_expired_buffered_views"
+            + " of video_countTestView: OK!"
+        )
+
 
 class VideoMarkerTestView(TestCase):
     """Test the video marker view."""
@@ -1452,7 +1557,7 @@ class ChannelJsonResponseViews(TestCase):
         )
         self.assertEqual(
             response.content,
-            b'{"channels": {"0": {"id": 1, "url": "/first-channel/", "title": "First channel", "description": "", "headband": null, "color": null, "style": null, "owners": ["http://testserver/rest/users/1/"], "users": [], "visible": true, "themes": 0, "site": "http://testserver/rest/sites/1/", "videoCount": 1, "headbandImage": ""}}, "currentPage": 1, "totalPages": 1, "count": 1}',
+            b'{"channels": {"0": {"id": 1, "url": "/first-channel/", "title": "First channel", "headbandImage": "", "videoCount": 1, "themes": 0}}, "currentPage": 1, "totalPages": 1, "count": 1}',
             "[test_get_channels_for_navbar] Test if the response content is correct.",
         )
         print(" ---> test_get_channels_for_navbar : OK!")
@@ -1496,11 +1601,49 @@ class ChannelJsonResponseViews(TestCase):
         )
         self.assertEqual(
             response.content,
-            b'{"channels": {"0": {"id": 2, "url": "/second-channel/", "title": "Second channel", "description": "", "headband": null, "color": null, "style": null, "owners": ["http://testserver/rest/users/1/"], "users": [], "visible": true, "themes": 0, "site": "http://testserver/rest/sites/1/", "videoCount": 1, "headbandImage": ""}}, "currentPage": 1, "totalPages": 1, "count": 1}',
+            b'{"channels": {"0": {"id": 2, "url": "/second-channel/", "title": "Second channel", "headbandImage": "", "videoCount": 1, "themes": 0}}, "currentPage": 1, "totalPages": 1, "count": 1}',
             "[test_get_channels_for_specific_channel_tab] Test if the response content is correct.",
         )
         print(" ---> test_get_channels_for_specific_channel_tab : OK!")
 
+    @override_settings(HIDE_CHANNEL_TAB=False)
+    def test_get_channel_directory(self):
+        """Test the cache and the ETag of the channels of the navbar."""
+        with self.assertNumQueries(2):
+            directory = views.get_channel_directory(self.site)
+        with self.assertNumQueries(0):
+            self.assertEqual(views.get_channel_directory(self.site), directory)
+        self.assertEqual(
+            [channel["title"] for channel in directory["tabs"][""]], ["First channel"]
+        )
+        url = reverse("video:get-channels-for-specific-channel-tab")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        # a new theme changes the directory and its ETag
+        Theme.objects.create(title="Theme", channel=self.first_channel)
+        etag = response["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["channels"]["0"]["themes"], 1)
+        # a draft video removes its channels
+        self.video.is_draft = True
+        self.video.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(json.loads(response.content)["count"], 0)
+        # a save keeping the publication state keeps the directory
+        version = get_channel_directory_version()
+        self.video.title = "Video renamed"
+        self.video.save()
+        self.assertEqual(get_channel_directory_version(), version)
+        # the titles are in the language of each request
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"], HTTP_ACCEPT_LANGUAGE="fr"
+        )
+        self.assertEqual(response.status_code, 200)
+        print(" ---> test_get_channel_directory : OK!")
+
 
 class VideoTranscriptTestView(TestCase):
     """Test the video transcript view."""
@@ -1631,3 +1774,65 @@ class VideoTranscriptTestView(TestCase):
         audio.refresh_from_db()
         self.assertEqual(audio.transcript, "fr")
         print(" ---> test_video_transcript_get_request_transcription : OK!")
+
+
+class VideoUserRestTestView(TestCase):
+    """Test the user_videos action of the videos REST API."""
+
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def setUp(self):
+        """Create videos with tags, disciplines and encodings."""
+        self.admin = User.objects.create_superuser("admin", "admin@pod.fr", "admin")
+        self.user = User.objects.create(username="pod", password="pod1234pod")
+        discipline = Discipline.objects.create(title="Discipline1")
+        for index in range(6):
+            video = Video.objects.create(
+                title="Video%s" % index,
+                owner=self.user,
+                video="test%s.mp4" % index,
+                type=Type.objects.get(id=1),
+                tags="tag1 tag2",
+            )
+            video.discipline.add(discipline)
+            if index % 2:
+                EncodingVideo.objects.create(
+                    video=video,
+                    encoding_format="video/mp4",
+                    rendition=VideoRendition.objects.get(id=1),
+                    source_file="videos/test%s.mp4" % index,
+                )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get_user_videos(self, page_size, **params):
+        """Get the user videos with page_size videos by page."""
+        with mock.patch.object(PageNumberPagination, "page_size", page_size):
+            response = self.client.get(
+                "/rest/videos/user_videos/", dict(params, username="pod")
+            )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_user_videos(self):
+        """Test the video data of the user videos."""
+        data = self.get_user_videos(12, encoded="true")
+        self.assertEqual(data["count"], 3)
+        video_data = data["results"][0]["video_data"]
+        self.assertTrue(video_data["encoded"])
+        self.assertEqual([tag["name"] for tag in video_data["tags"]], ["tag1", "tag2"])
+        self.assertEqual(video_data["disciplines"][0]["title"], "Discipline1")
+        self.assertEqual(len(video_data["video_files"]["mp4"]), 1)
+        print(" --->  test_user_videos of VideoUserRestTestView: OK!")
+
+    def test_user_videos_query_count(self):
+        """Test that the number of queries does not depend on the page size."""
+        self.get_user_videos(2)
+        with CaptureQueriesContext(connection) as small_page:
+            self.assertEqual(len(self.get_user_videos(2)["results"]), 2)
+        with CaptureQueriesContext(connection) as large_page:
+            self.assertEqual(len(self.get_user_videos(6)["results"]), 6)
+        self.assertEqual(len(small_page), len(large_page))
+        print(" --->  test_user_videos_query_count of VideoUserRestTestView: OK!")
@@ -28,6 +28,7 @@ from .views import (
     get_channels_for_specific_channel_tab,
     get_channel_tabs_for_navbar,
     get_comments,
+    get_comment_tree,
     get_children_comment,
     get_theme_list_for_specific_channel,
     add_comment,
@@ -154,6 +155,11 @@ if getattr(settings, "ACTIVE_VIDEO_COMMENT", False):
             get_comments,
             name="get_comments",
         ),
+        url(
+            r"^comment/tree/(?P<video_slug>[\-\d\w]+)/$",
+            get_comment_tree,
+            name="get_comment_tree",
+        ),
         url(
             r"^comment/(?P<comment_id>[\d]+)/(?P<video_slug>[\-\d\w]+)/$",
             get_children_comment,
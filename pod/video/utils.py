@@ -4,17 +4,26 @@ from django.db.models.functions import Lower
 import os
 import re
 import shutil
+import logging
+from datetime import date, timedelta
 from math import ceil
 
 from django.urls import reverse
 from django.conf import settings
 from django.http import JsonResponse
-from django.db.models import Q
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction, DatabaseError
+from django.db.models import Q, F, Sum, Count, Case, When, Value, BooleanField
+from django.db.models.functions import TruncDate
 from django.template.defaultfilters import slugify
+from django.utils.dateparse import parse_datetime
 from django.utils.translation import ugettext_lazy as _
 
-from .models import Video
+from .models import Video, ViewCount, ViewCountRollup
+from pod.playlist.apps import FAVORITE_PLAYLIST_NAME
 
+logger = logging.getLogger(__name__)
 
 DEBUG = getattr(settings, "DEBUG", True)
 
@@ -51,8 +60,30 @@ USE_ESTABLISHMENT_FIELD = getattr(settings, "USE_ESTABLISHMENT_FIELD", False)
 MANAGERS = getattr(settings, "MANAGERS", {})
 
 SECURE_SSL_REDIRECT = getattr(settings, "SECURE_SSL_REDIRECT", False)
+
+# Sorts of the videos list paginated by keyset (seek) instead of offset
+KEYSET_SORT_KEYS = {"title": Lower("title"), "date_added": F("date_added")}
+VIDEOS_CURSOR_SALT = "pod.video.videos"
+
 VIDEOS_DIR = getattr(settings, "VIDEOS_DIR", "videos")
 
+# Number of videos or rollups read or written per query
+ROLLUP_CHUNK_SIZE = 500
+# Views buffered in the cache are flushed for the last VIEW_COUNT_BUFFER_DAYS days
+VIEW_COUNT_BUFFER_DAYS = 7
+VIEW_COUNT_BUFFER_TIMEOUT = VIEW_COUNT_BUFFER_DAYS * 24 * 3600
+ROLLUP_FIELDS = {
+    "views": "",
+    "playlist_additions": "playlist_",
+    "favorite_additions": "fav_",
+}
+ROLLUP_PERIODS = {
+    "day": "day",
+    "month": "month",
+    "year": "year",
+    "total": "since_created",
+}
+
 ###############################################################
 # EMAIL
 ###############################################################
@@ -239,6 +270,82 @@ def sort_videos_list(videos_list, sort_field, sort_direction=""):
     return videos_list.distinct()
 
 
+class KeysetPage:
+    """Page of videos read after a cursor, with the interface of a paginator page."""
+
+    def __init__(self, object_list, number, has_next):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def next_page_number(self):
+        return self.number + 1
+
+
+def sort_videos_by_keyset(videos_list, sort_field, sort_direction=""):
+    """Return videos list sorted by the keyset of sort_field.
+
+    Same order as sort_videos_list, with the id to break ties.
+    Return None if sort_field is not paginated by keyset.
+    """
+    if sort_field not in KEYSET_SORT_KEYS:
+        return None
+    videos_list = videos_list.annotate(sort_key=KEYSET_SORT_KEYS[sort_field])
+    if sort_direction:
+        return videos_list.order_by("sort_key", "id")
+    return videos_list.order_by("-sort_key", "-id")
+
+
+def get_videos_cursor(video, sort_field, sort_direction=""):
+    """Get the cursor of the videos after video, sorted by sort_videos_by_keyset."""
+    sort_key = video.sort_key
+    if sort_field == "date_added":
+        sort_key = sort_key.isoformat()
+    return signing.dumps(
+        [sort_field, sort_direction or "", sort_key, video.id], salt=VIDEOS_CURSOR_SALT
+    )
+
+
+def get_videos_page_after(
+    videos_list, sort_field, sort_direction, cursor, number, per_page
+):
+    """Return the page of videos after the cursor, None if the cursor is invalid.
+
+    videos_list is sorted by sort_videos_by_keyset with sort_field and sort_direction,
+    the cursor of another sort is invalid.
+    """
+    try:
+        cursor_field, cursor_direction, sort_key, video_id = signing.loads(
+            cursor, salt=VIDEOS_CURSOR_SALT
+        )
+    except (signing.BadSignature, ValueError):
+        return None
+    if [cursor_field, cursor_direction] != [sort_field, sort_direction or ""]:
+        return None
+    if sort_field == "date_added":
+        sort_key = parse_datetime(sort_key)
+    lookup = "gt" if sort_direction else "lt"
+    videos = list(
+        videos_list.filter(
+            Q(**{"sort_key__%s" % lookup: sort_key})
+            | Q(sort_key=sort_key, **{"id__%s" % lookup: video_id})
+        )[: per_page + 1]
+    )
+    return KeysetPage(videos[:per_page], number, len(videos) > per_page)
+
+
 def get_id_from_request(request, key):
     """Get the value of a specified key from the request object."""
     if request.method == "POST" and request.POST.get(key):
@@ -287,3 +394,177 @@ def get_storage_path_video(instance, filename):
             instance.owner.owner.hashkey,
             "%s.%s" % (slugify(fname), extension),
         )
+
+
+def get_views_count_by_video(video_ids, date_filter):
+    """Get the views, playlist and favorite additions of the videos.
+
+    Counters are read from the rollups of the day, month and year of
+    date_filter, one query per ROLLUP_CHUNK_SIZE videos.
+    Return a dictionary of counters keyed by video id,
+    with the keys of pod.video.views.get_all_views_count.
+    """
+    views_count = {}
+    for video_id in video_ids:
+        views_count[video_id] = {
+            prefix + name: 0
+            for prefix in ROLLUP_FIELDS.values()
+            for name in ROLLUP_PERIODS.values()
+        }
+    periods = Q()
+    for period, period_date in ViewCountRollup.get_periods(date_filter):
+        periods |= Q(period=period, date=period_date)
+    video_ids = list(views_count)
+    for index in range(0, len(video_ids), ROLLUP_CHUNK_SIZE):
+        rollups = ViewCountRollup.objects.filter(
+            periods, video_id__in=video_ids[index : index + ROLLUP_CHUNK_SIZE]
+        ).values("video_id", "period", *ROLLUP_FIELDS)
+        for rollup in rollups:
+            counters = views_count[rollup["video_id"]]
+            name = ROLLUP_PERIODS[rollup["period"]]
+            for field, prefix in ROLLUP_FIELDS.items():
+                counters[prefix + name] = rollup[field]
+    return views_count
+
+
+def add_daily_counts(rollups, video_id, day, **counts):
+    """Add the counts of a day to all the rollups containing it."""
+    for period_key in ViewCountRollup.get_periods(day):
+        counters = rollups.setdefault(
+            (video_id,) + period_key, dict.fromkeys(ROLLUP_FIELDS, 0)
+        )
+        for field, value in counts.items():
+            counters[field] += value
+
+
+def rebuild_view_rollups():
+    """Compute again all the rollups from ViewCount and PlaylistContent.
+
+    Return the number of rollups created.
+    """
+    from pod.playlist.models import PlaylistContent
+
+    rollups = {}
+    views = (
+        ViewCount.objects.values("video_id", "date")
+        .annotate(views=Sum("count"))
+        .order_by()
+    )
+    for row in views.iterator():
+        add_daily_counts(rollups, row["video_id"], row["date"], views=row["views"])
+    additions = (
+        PlaylistContent.objects.annotate(
+            day=TruncDate("date_added"),
+            favorite=Case(
+                When(playlist__name=FAVORITE_PLAYLIST_NAME, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+        )
+        .values("video_id", "day", "favorite")
+        .annotate(additions=Count("id"))
+        .order_by()
+    )
+    for row in additions.iterator():
+        add_daily_counts(
+            rollups,
+            row["video_id"],
+            row["day"],
+            playlist_additions=row["additions"],
+            favorite_additions=row["additions"] if row["favorite"] else 0,
+        )
+    with transaction.atomic():
+        ViewCountRollup.objects.all().delete()
+        ViewCountRollup.objects.bulk_create(
+            (
+                ViewCountRollup(
+                    video_id=video_id, period=period, date=period_date, **counters
+                )
+                for (video_id, period, period_date), counters in rollups.items()
+            ),
+            batch_size=ROLLUP_CHUNK_SIZE,
+        )
+    return len(rollups)
+
+
+def get_view_count_key(day, video_id):
+    """Get the cache key of the buffered views of a video on a day."""
+    return "view_count_%s_%s" % (day.isoformat(), video_id)
+
+
+def get_view_count_list_key(day, index=None):
+    """Get the cache key of the list of the videos viewed on a day.
+
+    The length of the list is stored without index.
+    """
+    if index is None:
+        return "view_count_list_%s" % day.isoformat()
+    return "view_count_list_%s_%s" % (day.isoformat(), index)
+
+
+def buffer_view_count(video_id, day, count=1):
+    """Count views of the video in the cache, flushed by flush_view_counts."""
+    key = get_view_count_key(day, video_id)
+    if cache.add(key, count, VIEW_COUNT_BUFFER_TIMEOUT):
+        # first view of the video on the day, add it to the list of the day
+        list_key = get_view_count_list_key(day)
+        cache.add(list_key, 0, VIEW_COUNT_BUFFER_TIMEOUT)
+        index = cache.incr(list_key)
+        cache.set(
+            get_view_count_list_key(day, index), video_id, VIEW_COUNT_BUFFER_TIMEOUT
+        )
+        return
+    try:
+        cache.incr(key, count)
+    except ValueError:
+        # the counter has just expired
+        buffer_view_count(video_id, day, count)
+
+
+def flush_day_view_counts(day):
+    """Write the views of a day buffered in the cache into ViewCount.
+
+    The buffered counters are decremented before writing,
+    and buffered again if the database cannot be written.
+    Return the number of views written.
+    """
+    length = cache.get(get_view_count_list_key(day), 0)
+    list_keys = [get_view_count_list_key(day, index) for index in range(1, length + 1)]
+    keys = {
+        get_view_count_key(day, video_id): video_id
+        for video_id in set(cache.get_many(list_keys).values())
+    }
+    counts = {key: count for key, count in cache.get_many(keys).items() if count}
+    for key, count in counts.items():
+        try:
+            cache.decr(key, count)
+        except ValueError:
+            # the counter has expired since it was read, its views are still written
+            pass
+    try:
+        with transaction.atomic():
+            for key, count in counts.items():
+                ViewCount.add(keys[key], day, count)
+    except DatabaseError as err:
+        logger.error("Unable to flush the view counts of %s: %s" % (day, err))
+        for key, count in counts.items():
+            buffer_view_count(keys[key], day, count)
+        return 0
+    return sum(counts.values())
+
+
+def flush_view_counts():
+    """Write the views buffered in the cache by buffer_view_count into ViewCount.
+
+    Return the number of views written, or None if a flush is already running.
+    """
+    # the lock expires if the flush is killed
+    if not cache.add("view_count_flush_lock", True, 600):
+        return None
+    try:
+        return sum(
+            flush_day_view_counts(date.today() - timedelta(days=days))
+            for days in range(VIEW_COUNT_BUFFER_DAYS)
+        )
+    finally:
+        cache.delete("view_count_flush_lock")
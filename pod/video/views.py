@@ -6,7 +6,7 @@ from django.core.exceptions import PermissionDenied, SuspiciousOperation
 from django.core.handlers.wsgi import WSGIRequest
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db.models import Count, F, Q, Case, When, Value, BooleanField
+from django.db.models import Count, Q, Case, When, Value, BooleanField
 from django.db.models.functions import Concat
 from django.shortcuts import get_object_or_404
 from django.shortcuts import render
@@ -17,15 +17,21 @@ from django.http import QueryDict, Http404
 from django.views.decorators.csrf import csrf_protect
 from django.contrib import messages
 from django.utils.translation import ngettext
+from django.utils.translation import get_language
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.auth.models import User
 from django.contrib.sites.shortcuts import get_current_site
+from django.contrib.sites.models import Site
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.template.loader import render_to_string
 from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.db.models import Sum, Min
 
 # from django.contrib.auth.hashers import check_password
@@ -52,8 +58,11 @@ from pod.video.models import Theme
 from pod.video.models import AdvancedNotes, NoteComments, NOTES_STATUS
 from pod.video.models import ViewCount, VideoVersion
 from pod.video.models import Comment, Vote, Category
+from pod.video.models import get_comment_values, get_comments_version
+from pod.video.models import get_channel_directory_version
 from pod.video.models import get_transcription_choices
 from pod.video.models import UserMarkerTime
+from pod.video.models import prefetch_thumbnail_urls
 
 from tagging.models import TaggedItem
 
@@ -63,7 +72,6 @@ from pod.video.forms import FrontThemeForm
 from pod.video.forms import VideoPasswordForm
 from pod.video.forms import VideoDeleteForm
 from pod.video.forms import AdvancedNotesForm, NoteCommentsForm
-from pod.video.rest_views import ChannelSerializer
 
 from .utils import (
     pagination_data,
@@ -71,12 +79,18 @@ from .utils import (
     change_owner,
     get_video_data,
     get_id_from_request,
+    get_views_count_by_video,
+    buffer_view_count,
+    sort_videos_by_keyset,
+    get_videos_cursor,
+    get_videos_page_after,
 )
 from .context_processors import get_available_videos
 from .utils import sort_videos_list
 
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.core.exceptions import ObjectDoesNotExist
+import hashlib
 import json
 import re
 import pandas
@@ -129,6 +143,8 @@ TEMPLATE_VISIBLE_SETTINGS["DESC_SITE"] = (
 
 VIDEO_MAX_UPLOAD_SIZE = getattr(settings, "VIDEO_MAX_UPLOAD_SIZE", 1)
 
+COMMENT_TREE_PAGE_SIZE = getattr(settings, "COMMENT_TREE_PAGE_SIZE", 20)
+
 VIDEO_ALLOWED_EXTENSIONS = getattr(
     settings,
     "VIDEO_ALLOWED_EXTENSIONS",
@@ -168,6 +184,8 @@ CURSUS_CODES = getattr(
 )
 
 VIEW_STATS_AUTH = getattr(settings, "VIEW_STATS_AUTH", False)
+# Count the views in the cache, written in the database by flush_view_counts
+VIEW_COUNT_BUFFER = getattr(settings, "VIEW_COUNT_BUFFER", False)
 ACTIVE_VIDEO_COMMENT = getattr(settings, "ACTIVE_VIDEO_COMMENT", False)
 USER_VIDEO_CATEGORY = getattr(settings, "USER_VIDEO_CATEGORY", False)
 DEFAULT_TYPE_ID = getattr(settings, "DEFAULT_TYPE_ID", 1)
@@ -182,6 +200,24 @@ if USE_TRANSCRIPTION:
     TRANSCRIPT_VIDEO = getattr(settings, "TRANSCRIPT_VIDEO", "start_transcript")
 
 CHANNELS_PER_BATCH = getattr(settings, "CHANNELS_PER_BATCH", 10)
+CACHE_VIDEO_DEFAULT_TIMEOUT = getattr(settings, "CACHE_VIDEO_DEFAULT_TIMEOUT", 600)
+
+VIDEOS_PER_PAGE = 12
+# Fields of the videos rendered by videos/video_list.html
+VIDEOS_LIST_FIELDS = (
+    "id",
+    "slug",
+    "title",
+    "date_added",
+    "duration",
+    "password",
+    "is_restricted",
+    "is_draft",
+    "is_video",
+    "encoding_in_progress",
+    "owner__id",
+    "thumbnail",
+)
 
 
 # ############################################################################
@@ -870,6 +906,59 @@ def get_filtered_videos_list(request, videos_list):
     return videos_list.distinct()
 
 
+def get_videos_count(request, videos_list):
+    """Return the number of videos of the filtered list.
+
+    The count is cached for each site and set of filters of get_filtered_videos_list.
+    """
+    filters = {
+        name: sorted(set(request.GET.getlist(name)))
+        for name in ("type", "discipline", "owner", "tag", "cursus")
+    }
+    if not owner_is_searchable(request.user):
+        filters["owner"] = []
+    filters_hash = hashlib.md5(
+        json.dumps([get_current_site(request).id, filters]).encode("utf-8")
+    ).hexdigest()
+    key = "videos_count_%s" % filters_hash
+    count_videos = cache.get(key)
+    if count_videos is None:
+        count_videos = videos_list.order_by().count()
+        cache.set(key, count_videos, timeout=CACHE_VIDEO_DEFAULT_TIMEOUT)
+    return count_videos
+
+
+def get_videos_page(request, videos_list, sort_field, sort_direction, count_videos):
+    """Return the requested page of videos and the cursor of the next page.
+
+    The default sorts are paginated by keyset after the cursor of the request,
+    the other ones or a page without a valid cursor by offset.
+    """
+    page = request.GET.get("page") or 1
+    keyset_videos_list = sort_videos_by_keyset(videos_list, sort_field, sort_direction)
+    if keyset_videos_list is None:
+        paginator = Paginator(videos_list, VIDEOS_PER_PAGE)
+        paginator.count = count_videos
+        return get_paginated_videos(paginator, page), ""
+    videos = None
+    if request.GET.get("after") and str(page).isdigit():
+        videos = get_videos_page_after(
+            keyset_videos_list,
+            sort_field,
+            sort_direction,
+            request.GET.get("after"),
+            int(page),
+            VIDEOS_PER_PAGE,
+        )
+    if videos is None:
+        paginator = Paginator(keyset_videos_list, VIDEOS_PER_PAGE)
+        paginator.count = count_videos
+        videos = get_paginated_videos(paginator, page)
+    if not videos.has_next():
+        return videos, ""
+    return videos, get_videos_cursor(videos[-1], sort_field, sort_direction)
+
+
 def get_owners_has_instances(owners: list) -> list:
     """Return the list of owners who has instances in User.objects."""
     ownersInstances = []
@@ -904,25 +993,29 @@ def videos(request):
     sort_direction = request.GET.get("sort_direction")
 
     videos_list = sort_videos_list(videos_list, sort_field, sort_direction)
+    count_videos = get_videos_count(request, videos_list)
+    videos_list = (
+        videos_list.defer(None)
+        .only(*VIDEOS_LIST_FIELDS)
+        .select_related("owner")
+        .prefetch_related("chapter_set")
+    )
+    videos, next_cursor = get_videos_page(
+        request, videos_list, sort_field, sort_direction, count_videos
+    )
+    prefetch_thumbnail_urls(videos, "x170")
 
     if not sort_field:
         # Get the default Video ordering
         sort_field = Video._meta.ordering[0].lstrip("-")
-    count_videos = len(videos_list)
 
-    page = request.GET.get("page", 1)
-    if page == "" or page is None:
-        page = 1
-    full_path = ""
-    if page:
-        full_path = (
-            request.get_full_path()
-            .replace("?page=%s" % page, "")
-            .replace("&page=%s" % page, "")
-        )
+    query = request.GET.copy()
+    query.pop("page", None)
+    query.pop("after", None)
+    full_path = request.path
+    if query:
+        full_path += "?%s" % query.urlencode()
 
-    paginator = Paginator(videos_list, 12)
-    videos = get_paginated_videos(paginator, page)
     ownersInstances = get_owners_has_instances(request.GET.getlist("owner"))
     owner_filter = owner_is_searchable(request.user)
 
@@ -935,6 +1028,7 @@ def videos(request):
                 "full_path": full_path,
                 "count_videos": count_videos,
                 "owner_filter": owner_filter,
+                "next_cursor": next_cursor,
             },
         )
     return render(
@@ -943,6 +1037,7 @@ def videos(request):
         {
             "videos": videos,
             "count_videos": count_videos,
+            "next_cursor": next_cursor,
             "types": request.GET.getlist("type"),
             "owners": request.GET.getlist("owner"),
             "disciplines": request.GET.getlist("discipline"),
@@ -2109,17 +2204,10 @@ def video_count(request, id):
     """View to store the video count."""
     video = get_object_or_404(Video, id=id)
     if request.method == "POST":
-        try:
-            view_count = ViewCount.objects.get(video=video, date=date.today())
-        except ViewCount.DoesNotExist:
-            try:
-                with transaction.atomic():
-                    ViewCount.objects.create(video=video, count=1)
-                    return HttpResponse("ok")
-            except IntegrityError:
-                view_count = ViewCount.objects.get(video=video, date=date.today())
-        view_count.count = F("count") + 1
-        view_count.save(update_fields=["count"])
+        if VIEW_COUNT_BUFFER:
+            buffer_view_count(video.id, date.today())
+        else:
+            ViewCount.add(video.id, date.today())
         return HttpResponse("ok")
     messages.add_message(request, messages.ERROR, _("You cannot access to this view."))
     raise PermissionDenied
@@ -2472,16 +2560,9 @@ def stats_view(request, slug=None, slug_t=None):
         if isinstance(date_filter, str):
             date_filter = parse(date_filter).date()
 
-        data = list(
-            map(
-                lambda v: {
-                    "title": v.title,
-                    "slug": v.slug,
-                    **get_all_views_count(v.id, date_filter),
-                },
-                videos,
-            )
-        )
+        videos = list(videos)
+        views_count = get_views_count_by_video([v.id for v in videos], date_filter)
+        data = [{"title": v.title, "slug": v.slug, **views_count[v.id]} for v in videos]
 
         min_date = (
             get_available_videos().aggregate(Min("date_added"))["date_added__min"].date()
@@ -2748,10 +2829,15 @@ def get_comments(request, video_slug):
             )
         )
 
-        # organize comments => parent with children
+        # get all children at once, then organize comments => parent with children
+        children = {}
+        for child in get_comment_values(
+            Comment.objects.filter(video=v).exclude(parent=None).order_by("id"),
+            request.user.id,
+        ):
+            children.setdefault(child["parent__id"], []).append(child)
         comment_org = []
         for c in p_c:
-            children = c.get_json_children(request.user.id)
             parent_comment_data = {
                 "id": c.id,
                 "author_name": c.author_name,
@@ -2760,7 +2846,7 @@ def get_comments(request, video_slug):
                 "added": c.added,
                 "nbr_vote": c.nbr_vote,
                 "nbr_child": c.nbr_child,
-                "children": children,
+                "children": children.get(c.id, []),
             }
             comment_org.append(parent_comment_data)
         return HttpResponse(
@@ -2769,6 +2855,85 @@ def get_comments(request, video_slug):
         )
 
 
+def get_comment_cursor(comment):
+    """Get the cursor of the threads after the comment."""
+    return urlsafe_base64_encode(
+        json.dumps([comment["added"].isoformat(), comment["id"]]).encode()
+    )
+
+
+def get_threads_after(threads, cursor):
+    """Filter the threads after the cursor, raise ValueError for a wrong cursor."""
+    added, comment_id = json.loads(urlsafe_base64_decode(cursor))
+    added = parse(added)
+    return threads.filter(Q(added__gt=added) | Q(added=added, id__gt=int(comment_id)))
+
+
+def build_comment_tree(threads, children):
+    """Nest the children of the threads under the comment they answer."""
+    comments = {}
+    for comment in threads + children:
+        comment["children"] = []
+        comments[comment["id"]] = comment
+    for thread in threads:
+        thread["nbr_child"] = 0
+    for child in children:
+        comments[child["parent__id"]]["nbr_child"] += 1
+        parent = comments.get(child["direct_parent__id"], comments[child["parent__id"]])
+        parent["children"].append(child)
+    return threads
+
+
+def get_comment_tree(request, video_slug):
+    """Return a page of comment threads of the video, with all their answers.
+
+    The comments and their votes are read in a constant number of queries,
+    the next page is given by the cursor of the response.
+    The response is not sent again while the comments and votes are unchanged.
+    """
+    v = get_object_or_404(Video, slug=video_slug)
+    cursor = request.GET.get("cursor", "")
+    version = get_comments_version(v.id)
+    etag = quote_etag(
+        hashlib.md5(
+            ("%s-%s-%s-%s" % (v.id, version, request.user.id, cursor)).encode()
+        ).hexdigest()
+    )
+    response = get_conditional_response(request, etag=etag, last_modified=int(version))
+    if response is None:
+        threads = get_comment_values(
+            Comment.objects.filter(video=v, parent=None), request.user.id
+        ).order_by("added", "id")
+        if cursor:
+            try:
+                threads = get_threads_after(threads, cursor)
+            except (ValueError, TypeError):
+                return HttpResponseBadRequest()
+        threads = list(threads[: COMMENT_TREE_PAGE_SIZE + 1])
+        next_cursor = None
+        if len(threads) > COMMENT_TREE_PAGE_SIZE:
+            threads = threads[:COMMENT_TREE_PAGE_SIZE]
+            next_cursor = get_comment_cursor(threads[-1])
+        children = get_comment_values(
+            Comment.objects.filter(parent_id__in=[thread["id"] for thread in threads]),
+            request.user.id,
+        ).order_by("id")
+        response = HttpResponse(
+            json.dumps(
+                {
+                    "threads": build_comment_tree(threads, list(children)),
+                    "next": next_cursor,
+                },
+                cls=DjangoJSONEncoder,
+            ),
+            content_type="application/json",
+        )
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(version)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
 @ajax_login_required
 @csrf_protect
 def delete_comment(request, video_slug, comment_id):
@@ -3167,30 +3332,54 @@ def filter_videos(request, user_id):
         return JsonResponse({"success": False, "detail": "Syntax error: {0}".format(err)})
 
 
-def get_serialized_channels(request: WSGIRequest, channels: QueryDict) -> dict:
+def get_channel_directory(site: Site) -> dict:
     """
-    Get serialized channels.
+    Get the channels of the navbar channel tabs of the site.
+
+    The channels, with their video and theme counts, are read in two queries
+    and kept in the cache until a channel, a theme or a video publication changes.
+    The titles are translated, so a directory is kept for each language.
 
     Args:
-        request (::class::`django.core.handlers.wsgi.WSGIRequest`): The WSGI request.
-        channels (::class::`django.http.QueryDict`): The channel list.
+        site (::class::`django.contrib.sites.models.Site`): The site.
     Returns:
-        dict: The channel list in JSON format.
+        dict: The version and the language of the directory and the channel list
+        of each tab, the channels without tab being in the "" tab.
     """
-    channels_json_format = {}
-    for num, channel in enumerate(channels):
-        channels_json_format[num] = ChannelSerializer(
-            channel, context={"request": request}
-        ).data
-        channels_json_format[num]["url"] = reverse(
-            "channel-video:channel", kwargs={"slug_c": channel.slug}
-        )
-        channels_json_format[num]["videoCount"] = channel.video_count
-        channels_json_format[num]["headbandImage"] = (
-            channel.headband.file.url if channel.headband else ""
+    version = get_channel_directory_version()
+    language = get_language()
+    key = "channel_directory_%s_%s_%s" % (site.id, version, language)
+    directory = cache.get(key)
+    if directory is not None:
+        return directory
+    channels = (
+        Channel.objects.filter(visible=True, video__is_draft=False, site=site)
+        .select_related("headband")
+        .annotate(
+            video_count=Count("video", distinct=True),
+            theme_count=Count("themes", distinct=True),
         )
-        channels_json_format[num]["themes"] = channel.themes.count()
-    return channels_json_format
+        .order_by("title")
+    )
+    channel_tabs = {}
+    for channel_id, channel_tab_id in Channel.add_channels_tab.through.objects.filter(
+        channel__site=site
+    ).values_list("channel_id", "additionalchanneltab_id"):
+        channel_tabs.setdefault(channel_id, []).append(str(channel_tab_id))
+    directory = {"version": version, "language": language, "tabs": {}}
+    for channel in channels:
+        channel_json_format = {
+            "id": channel.id,
+            "url": reverse("channel-video:channel", kwargs={"slug_c": channel.slug}),
+            "title": channel.title,
+            "headbandImage": channel.headband.file.url if channel.headband else "",
+            "videoCount": channel.video_count,
+            "themes": channel.theme_count,
+        }
+        for channel_tab_id in channel_tabs.get(channel.id, [""]):
+            directory["tabs"].setdefault(channel_tab_id, []).append(channel_json_format)
+    cache.set(key, directory, timeout=CACHE_VIDEO_DEFAULT_TIMEOUT)
+    return directory
 
 
 def get_channel_tabs_for_navbar(request: WSGIRequest) -> JsonResponse:
@@ -3224,39 +3413,36 @@ def get_channels_for_specific_channel_tab(request: WSGIRequest) -> JsonResponse:
         ::class::`django.http.JsonResponse`: The JSON response.
     """
     page_number = request.GET.get("page", 1)
-    channel_tab_id = request.GET.get("id")
-    if channel_tab_id:
-        channels = (
-            Channel.objects.filter(
-                visible=True,
-                video__is_draft=False,
-                add_channels_tab=channel_tab_id,
-                site=get_current_site(request),
-            )
-            .distinct()
-            .annotate(video_count=Count("video", distinct=True))
-            .order_by("title")
-        )
-    else:
-        channels = (
-            Channel.objects.filter(
-                visible=True,
-                video__is_draft=False,
-                add_channels_tab=None,
-                site=get_current_site(request),
-            )
-            .distinct()
-            .annotate(video_count=Count("video", distinct=True))
-            .order_by("title")
+    channel_tab_id = request.GET.get("id") or ""
+    directory = get_channel_directory(get_current_site(request))
+    etag = quote_etag(
+        hashlib.md5(
+            (
+                "%s-%s-%s-%s"
+                % (
+                    directory["version"],
+                    directory["language"],
+                    channel_tab_id,
+                    page_number,
+                )
+            ).encode()
+        ).hexdigest()
+    )
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        channels = directory["tabs"].get(channel_tab_id, [])
+        paginator = Paginator(channels, CHANNELS_PER_BATCH)
+        page_obj = paginator.get_page(page_number)
+        response = JsonResponse(
+            {
+                "channels": dict(enumerate(page_obj.object_list)),
+                "currentPage": page_obj.number,
+                "totalPages": paginator.num_pages,
+                "count": paginator.count,
+            }
         )
-    paginator = Paginator(channels, CHANNELS_PER_BATCH)
-    page_obj = paginator.get_page(page_number)
-    response = {}
-    response["channels"] = get_serialized_channels(request, page_obj.object_list)
-    response["currentPage"] = page_obj.number
-    response["totalPages"] = paginator.num_pages
-    response["count"] = len(channels)
-    return JsonResponse(response, safe=False)
+    response["ETag"] = etag
+    return response
 
 
 def get_theme_list_for_specific_channel(request: WSGIRequest, slug: str) -> JsonResponse:
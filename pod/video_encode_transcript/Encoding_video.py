@@ -3,6 +3,7 @@
 import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from webvtt import WebVTT, Caption
 import argparse
 import unicodedata
@@ -29,6 +30,23 @@ if __name__ == "__main__":
         FFMPEG_MP4_ENCODE,
         FFMPEG_HLS_COMMON_PARAMS,
         FFMPEG_HLS_ENCODE_PARAMS,
+        FFMPEG_SINGLE_PASS_ENCODE,
+        FFMPEG_SINGLE_PASS_FILTER,
+        FFMPEG_SINGLE_PASS_SCALE,
+        FFMPEG_SINGLE_PASS_PARAMS,
+        FFMPEG_SINGLE_PASS_MP4_OUTPUT,
+        FFMPEG_SINGLE_PASS_HLS_OUTPUT,
+        FFMPEG_STUDIO_INPUT,
+        FFMPEG_STUDIO_FILTER,
+        FFMPEG_STUDIO_SOURCE_OUTPUT,
+        FFMPEG_CHUNK_DURATION,
+        FFMPEG_CHUNK_WORKERS,
+        FFPROBE_GET_KEYFRAMES,
+        FFMPEG_CHUNK_INPUT,
+        FFMPEG_CHUNK_ENCODE,
+        FFMPEG_CHUNK_CONCAT_INPUT,
+        FFMPEG_CHUNK_CONCAT_MP4,
+        FFMPEG_CHUNK_CONCAT_HLS,
         FFMPEG_MP3_ENCODE,
         FFMPEG_M4A_ENCODE,
         FFMPEG_NB_THREADS,
@@ -37,12 +55,20 @@ if __name__ == "__main__":
         FFMPEG_NB_THUMBNAIL,
         FFMPEG_CREATE_THUMBNAIL,
         FFMPEG_EXTRACT_SUBTITLE,
+        FFMPEG_OVERVIEW_COLUMNS,
+        FFMPEG_OVERVIEW_ROWS,
+        FFMPEG_OVERVIEW_IMAGE_HEIGHT,
+        FFMPEG_OVERVIEW_INPUT,
+        FFMPEG_CREATE_OVERVIEW,
         FFMPEG_DRESSING_INPUT,
         FFMPEG_DRESSING_OUTPUT,
         FFMPEG_DRESSING_WATERMARK,
         FFMPEG_DRESSING_FILTER_COMPLEX,
         FFMPEG_DRESSING_SCALE,
         FFMPEG_DRESSING_CONCAT,
+        FFMPEG_DRESSING_SINGLE_PASS,
+        FFMPEG_DRESSING_SINGLE_PASS_FILTER,
+        FFMPEG_DRESSING_AUDIO_SPLIT,
     )
 else:
     from .encoding_utils import (
@@ -65,6 +91,23 @@ else:
         FFMPEG_MP4_ENCODE,
         FFMPEG_HLS_COMMON_PARAMS,
         FFMPEG_HLS_ENCODE_PARAMS,
+        FFMPEG_SINGLE_PASS_ENCODE,
+        FFMPEG_SINGLE_PASS_FILTER,
+        FFMPEG_SINGLE_PASS_SCALE,
+        FFMPEG_SINGLE_PASS_PARAMS,
+        FFMPEG_SINGLE_PASS_MP4_OUTPUT,
+        FFMPEG_SINGLE_PASS_HLS_OUTPUT,
+        FFMPEG_STUDIO_INPUT,
+        FFMPEG_STUDIO_FILTER,
+        FFMPEG_STUDIO_SOURCE_OUTPUT,
+        FFMPEG_CHUNK_DURATION,
+        FFMPEG_CHUNK_WORKERS,
+        FFPROBE_GET_KEYFRAMES,
+        FFMPEG_CHUNK_INPUT,
+        FFMPEG_CHUNK_ENCODE,
+        FFMPEG_CHUNK_CONCAT_INPUT,
+        FFMPEG_CHUNK_CONCAT_MP4,
+        FFMPEG_CHUNK_CONCAT_HLS,
         FFMPEG_MP3_ENCODE,
         FFMPEG_M4A_ENCODE,
         FFMPEG_NB_THREADS,
@@ -73,12 +116,20 @@ else:
         FFMPEG_NB_THUMBNAIL,
         FFMPEG_CREATE_THUMBNAIL,
         FFMPEG_EXTRACT_SUBTITLE,
+        FFMPEG_OVERVIEW_COLUMNS,
+        FFMPEG_OVERVIEW_ROWS,
+        FFMPEG_OVERVIEW_IMAGE_HEIGHT,
+        FFMPEG_OVERVIEW_INPUT,
+        FFMPEG_CREATE_OVERVIEW,
         FFMPEG_DRESSING_INPUT,
         FFMPEG_DRESSING_OUTPUT,
         FFMPEG_DRESSING_WATERMARK,
         FFMPEG_DRESSING_FILTER_COMPLEX,
         FFMPEG_DRESSING_SCALE,
         FFMPEG_DRESSING_CONCAT,
+        FFMPEG_DRESSING_SINGLE_PASS,
+        FFMPEG_DRESSING_SINGLE_PASS_FILTER,
+        FFMPEG_DRESSING_AUDIO_SPLIT,
     )
 
 
@@ -114,6 +165,47 @@ try:
     FFMPEG_HLS_ENCODE_PARAMS = getattr(
         settings, "FFMPEG_HLS_ENCODE_PARAMS", FFMPEG_HLS_ENCODE_PARAMS
     )
+    FFMPEG_SINGLE_PASS_ENCODE = getattr(
+        settings, "FFMPEG_SINGLE_PASS_ENCODE", FFMPEG_SINGLE_PASS_ENCODE
+    )
+    FFMPEG_SINGLE_PASS_FILTER = getattr(
+        settings, "FFMPEG_SINGLE_PASS_FILTER", FFMPEG_SINGLE_PASS_FILTER
+    )
+    FFMPEG_SINGLE_PASS_SCALE = getattr(
+        settings, "FFMPEG_SINGLE_PASS_SCALE", FFMPEG_SINGLE_PASS_SCALE
+    )
+    FFMPEG_SINGLE_PASS_PARAMS = getattr(
+        settings, "FFMPEG_SINGLE_PASS_PARAMS", FFMPEG_SINGLE_PASS_PARAMS
+    )
+    FFMPEG_SINGLE_PASS_MP4_OUTPUT = getattr(
+        settings, "FFMPEG_SINGLE_PASS_MP4_OUTPUT", FFMPEG_SINGLE_PASS_MP4_OUTPUT
+    )
+    FFMPEG_SINGLE_PASS_HLS_OUTPUT = getattr(
+        settings, "FFMPEG_SINGLE_PASS_HLS_OUTPUT", FFMPEG_SINGLE_PASS_HLS_OUTPUT
+    )
+    FFMPEG_STUDIO_INPUT = getattr(settings, "FFMPEG_STUDIO_INPUT", FFMPEG_STUDIO_INPUT)
+    FFMPEG_STUDIO_FILTER = getattr(settings, "FFMPEG_STUDIO_FILTER", FFMPEG_STUDIO_FILTER)
+    FFMPEG_STUDIO_SOURCE_OUTPUT = getattr(
+        settings, "FFMPEG_STUDIO_SOURCE_OUTPUT", FFMPEG_STUDIO_SOURCE_OUTPUT
+    )
+    FFMPEG_CHUNK_DURATION = getattr(
+        settings, "FFMPEG_CHUNK_DURATION", FFMPEG_CHUNK_DURATION
+    )
+    FFMPEG_CHUNK_WORKERS = getattr(settings, "FFMPEG_CHUNK_WORKERS", FFMPEG_CHUNK_WORKERS)
+    FFPROBE_GET_KEYFRAMES = getattr(
+        settings, "FFPROBE_GET_KEYFRAMES", FFPROBE_GET_KEYFRAMES
+    )
+    FFMPEG_CHUNK_INPUT = getattr(settings, "FFMPEG_CHUNK_INPUT", FFMPEG_CHUNK_INPUT)
+    FFMPEG_CHUNK_ENCODE = getattr(settings, "FFMPEG_CHUNK_ENCODE", FFMPEG_CHUNK_ENCODE)
+    FFMPEG_CHUNK_CONCAT_INPUT = getattr(
+        settings, "FFMPEG_CHUNK_CONCAT_INPUT", FFMPEG_CHUNK_CONCAT_INPUT
+    )
+    FFMPEG_CHUNK_CONCAT_MP4 = getattr(
+        settings, "FFMPEG_CHUNK_CONCAT_MP4", FFMPEG_CHUNK_CONCAT_MP4
+    )
+    FFMPEG_CHUNK_CONCAT_HLS = getattr(
+        settings, "FFMPEG_CHUNK_CONCAT_HLS", FFMPEG_CHUNK_CONCAT_HLS
+    )
     FFMPEG_MP3_ENCODE = getattr(settings, "FFMPEG_MP3_ENCODE", FFMPEG_MP3_ENCODE)
     FFMPEG_M4A_ENCODE = getattr(settings, "FFMPEG_M4A_ENCODE", FFMPEG_M4A_ENCODE)
     FFMPEG_NB_THREADS = getattr(settings, "FFMPEG_NB_THREADS", FFMPEG_NB_THREADS)
@@ -128,6 +220,19 @@ try:
     FFMPEG_EXTRACT_SUBTITLE = getattr(
         settings, "FFMPEG_EXTRACT_SUBTITLE", FFMPEG_EXTRACT_SUBTITLE
     )
+    FFMPEG_OVERVIEW_COLUMNS = getattr(
+        settings, "FFMPEG_OVERVIEW_COLUMNS", FFMPEG_OVERVIEW_COLUMNS
+    )
+    FFMPEG_OVERVIEW_ROWS = getattr(settings, "FFMPEG_OVERVIEW_ROWS", FFMPEG_OVERVIEW_ROWS)
+    FFMPEG_OVERVIEW_IMAGE_HEIGHT = getattr(
+        settings, "FFMPEG_OVERVIEW_IMAGE_HEIGHT", FFMPEG_OVERVIEW_IMAGE_HEIGHT
+    )
+    FFMPEG_OVERVIEW_INPUT = getattr(
+        settings, "FFMPEG_OVERVIEW_INPUT", FFMPEG_OVERVIEW_INPUT
+    )
+    FFMPEG_CREATE_OVERVIEW = getattr(
+        settings, "FFMPEG_CREATE_OVERVIEW", FFMPEG_CREATE_OVERVIEW
+    )
     FFMPEG_DRESSING_INPUT = getattr(
         settings, "FFMPEG_DRESSING_INPUT", FFMPEG_DRESSING_INPUT
     )
@@ -146,6 +251,15 @@ try:
     FFMPEG_DRESSING_CONCAT = getattr(
         settings, "FFMPEG_DRESSING_CONCAT", FFMPEG_DRESSING_CONCAT
     )
+    FFMPEG_DRESSING_SINGLE_PASS = getattr(
+        settings, "FFMPEG_DRESSING_SINGLE_PASS", FFMPEG_DRESSING_SINGLE_PASS
+    )
+    FFMPEG_DRESSING_SINGLE_PASS_FILTER = getattr(
+        settings, "FFMPEG_DRESSING_SINGLE_PASS_FILTER", FFMPEG_DRESSING_SINGLE_PASS_FILTER
+    )
+    FFMPEG_DRESSING_AUDIO_SPLIT = getattr(
+        settings, "FFMPEG_DRESSING_AUDIO_SPLIT", FFMPEG_DRESSING_AUDIO_SPLIT
+    )
 except ImportError:  # pragma: no cover
     pass
 
@@ -175,6 +289,7 @@ class Encoding_video:
     cutting_start = 0
     cutting_stop = 0
     dressing = None
+    renditions_dir = ""
 
     def __init__(self, id=0, video_file="", start=0, stop=0, dressing=None):
         """Initialize a new Encoding_video object."""
@@ -200,6 +315,7 @@ class Encoding_video:
         self.cutting_start = start or 0
         self.cutting_stop = stop or 0
         self.dressing = dressing or None
+        self.renditions_dir = ""
 
     def is_video(self):
         """Check if current encoding correspond to a video."""
@@ -393,6 +509,165 @@ class Encoding_video:
                 self.list_hls_files[rend] = output_file
         return hls_command
 
+    def get_single_pass_renditions(self):
+        """
+        Get the renditions to encode in a single pass.
+
+        Keep the same choices as get_mp4_command and get_hls_command:
+        the first rendition always gets an HLS output,
+        the first rendition with encode_mp4 always gets an mp4 output.
+
+        Returns:
+            list: tuples (rendition, height, with_mp4, with_hls).
+        """
+        list_rendition = get_list_rendition()
+        first_mp4 = self.get_first_item()
+        in_height = list(self.list_video_track.items())[0][1]["height"]
+        renditions = []
+        for index, rend in enumerate(list_rendition):
+            resolution_threshold = rend - rend * (
+                list_rendition[rend]["encoding_resolution_threshold"] / 100
+            )
+            with_hls = in_height >= resolution_threshold or index == 0
+            with_mp4 = list_rendition[rend]["encode_mp4"] and (
+                in_height >= resolution_threshold
+                or (first_mp4 is not None and first_mp4[0] == rend)
+            )
+            if with_hls or with_mp4:
+                renditions.append((rend, min(rend, in_height), with_mp4, with_hls))
+        return renditions
+
+    def get_single_pass_scales(self, renditions):
+        """Get the filters scaling the split video to each rendition."""
+        return [
+            FFMPEG_SINGLE_PASS_SCALE
+            % {"input": "split%s" % rend, "height": height, "output": "v%s" % rend}
+            for rend, height, with_mp4, with_hls in renditions
+        ]
+
+    def get_single_pass_outputs(self, renditions, cut, map_audio):
+        """
+        Get the encoding and the mp4 and HLS outputs of each rendition.
+
+        map_audio may contain %(rendition)s to map an audio output per rendition.
+        """
+        list_rendition = get_list_rendition()
+        single_pass_outputs = ""
+        for rend, height, with_mp4, with_hls in renditions:
+            outputs = []
+            if with_mp4:
+                output_file = os.path.join(self.output_dir, "%sp.mp4" % rend)
+                outputs.append(FFMPEG_SINGLE_PASS_MP4_OUTPUT % {"output": output_file})
+                self.list_mp4_files[rend] = output_file
+            if with_hls:
+                output_file = os.path.join(self.output_dir, "%sp.m3u8" % rend)
+                outputs.append(
+                    FFMPEG_SINGLE_PASS_HLS_OUTPUT
+                    % {
+                        "hls_time": FFMPEG_HLS_TIME,
+                        "height": height,
+                        "output": output_file,
+                    }
+                )
+                self.list_hls_files[rend] = output_file
+            single_pass_outputs += FFMPEG_SINGLE_PASS_PARAMS % {
+                "cut": cut,
+                "video": "v%s" % rend,
+                "map_audio": map_audio % {"rendition": rend},
+                "libx": FFMPEG_LIBX,
+                "preset": FFMPEG_PRESET,
+                "profile": FFMPEG_PROFILE,
+                "level": FFMPEG_LEVEL,
+                "crf": FFMPEG_CRF,
+                "maxrate": list_rendition[rend]["maxrate"],
+                "bufsize": list_rendition[rend]["maxrate"],
+                "ba": list_rendition[rend]["audio_bitrate"],
+                "output": "|".join(outputs),
+            }
+        return single_pass_outputs
+
+    def get_single_pass_command(self):
+        """Get the command encoding all the mp4 and HLS renditions at once."""
+        renditions = self.get_single_pass_renditions()
+        if len(renditions) == 0:
+            return ""
+        single_pass_command = "%s " % FFMPEG_CMD
+        single_pass_command += FFMPEG_INPUT % {
+            "input": self.video_file,
+            "nb_threads": FFMPEG_NB_THREADS,
+        }
+        single_pass_command += FFMPEG_SINGLE_PASS_FILTER % {
+            "number": len(renditions),
+            "outputs": "".join("[split%s]" % rend[0] for rend in renditions),
+            "scales": ";".join(self.get_single_pass_scales(renditions)),
+        }
+        single_pass_command += self.get_single_pass_outputs(
+            renditions,
+            self.get_subtime(self.cutting_start, self.cutting_stop),
+            "-map 0:a:0" if len(self.list_audio_track) > 0 else "",
+        )
+        return single_pass_command
+
+    def get_studio_command(self, studio_input, studio_filter, subtime, map_audio):
+        """
+        Get the command compositing the studio sources only once.
+
+        The composited video is split to the source file of the video
+        and to the mp4 and HLS renditions, written in output_dir.
+        """
+        renditions = self.get_single_pass_renditions()
+        studio_command = "%s " % FFMPEG_CMD
+        studio_command += FFMPEG_STUDIO_INPUT % {
+            "input": studio_input,
+            "nb_threads": FFMPEG_NB_THREADS,
+        }
+        studio_command += FFMPEG_STUDIO_FILTER % {
+            "studio": studio_filter,
+            "number": len(renditions) + 1,
+            "outputs": "".join("[split%s]" % rend[0] for rend in renditions),
+            "scales": "".join(
+                ";" + scale for scale in self.get_single_pass_scales(renditions)
+            ),
+        }
+        studio_command += FFMPEG_STUDIO_SOURCE_OUTPUT % {
+            "subtime": subtime,
+            "map_audio": map_audio,
+            "crf": FFMPEG_CRF,
+            "output": self.video_file,
+        }
+        studio_command += self.get_single_pass_outputs(renditions, subtime, map_audio)
+        return studio_command
+
+    def use_studio_renditions(self):
+        """Use the renditions encoded with the studio source instead of encoding them."""
+        for filename in os.listdir(self.renditions_dir):
+            os.replace(
+                os.path.join(self.renditions_dir, filename),
+                os.path.join(self.output_dir, filename),
+            )
+        os.rmdir(self.renditions_dir)
+        for rend, height, with_mp4, with_hls in self.get_single_pass_renditions():
+            if with_mp4:
+                output_file = os.path.join(self.output_dir, "%sp.mp4" % rend)
+                self.list_mp4_files[rend] = output_file
+            if with_hls:
+                output_file = os.path.join(self.output_dir, "%sp.m3u8" % rend)
+                self.list_hls_files[rend] = output_file
+        missing_files = [
+            output_file
+            for output_file in list(self.list_mp4_files.values())
+            + list(self.list_hls_files.values())
+            if not check_file(output_file)
+        ]
+        self.add_encoding_log(
+            "studio_renditions",
+            "",
+            len(missing_files) == 0,
+            "Missing files: %s" % missing_files if missing_files else "",
+        )
+        if len(missing_files) == 0:
+            self.create_main_livestream()
+
     def get_dressing_file(self):
         """Create or replace the dressed video file."""
         dirname = os.path.dirname(self.video_file)
@@ -400,19 +675,22 @@ class Encoding_video:
         output_file = os.path.join(dirname, filename + "_dressing" + ext)
         return output_file
 
-    def get_dressing_command(self):
-        """Get the command based on the dressing object parameters"""
+    def get_dressing_filter(self, name_out=""):
+        """
+        Get the filter graph based on the dressing object parameters.
+
+        Args:
+            name_out (str): label of the watermarked video without credits,
+                unlabelled by default.
+
+        Returns:
+            tuple: the filter graph, its video and its audio outputs.
+        """
         height = str(list(self.list_video_track.items())[0][1]["height"])
         order_opening_credits = 0
         dressing_command_params = "[vid][0:a]"
         number_concat = 1
-        dressing_command = "%s " % FFMPEG_CMD
-        dressing_command += FFMPEG_INPUT % {
-            "input": self.video_file,
-            "nb_threads": FFMPEG_NB_THREADS,
-        }
-
-        dressing_command += get_dressing_input(self.dressing, FFMPEG_DRESSING_INPUT)
+        video_out = "[vid]"
         dressing_command_filter = []
         dressing_command_filter.append(
             FFMPEG_DRESSING_SCALE
@@ -425,9 +703,9 @@ class Encoding_video:
         if self.dressing.watermark:
             dressing_command_params = "[video][0:a]"
             order_opening_credits = order_opening_credits + 1
-            name_out = ""
             if self.dressing.opening_credits or self.dressing.ending_credits:
                 name_out = "[video]"
+            video_out = name_out
             dressing_command_filter.append(
                 FFMPEG_DRESSING_WATERMARK
                 % {
@@ -462,7 +740,7 @@ class Encoding_video:
                 FFMPEG_DRESSING_SCALE
                 % {
                     "number": str(order_opening_credits + 1),
-                    "height": str(list(self.list_video_track.items())[0][1]["height"]),
+                    "height": height,
                     "name": "fin",
                 }
             )
@@ -474,9 +752,21 @@ class Encoding_video:
                     "number": number_concat,
                 }
             )
+            return ";".join(dressing_command_filter), "[v]", "[a]"
+        return ";".join(dressing_command_filter), video_out, "0:a:0"
 
+    def get_dressing_command(self):
+        """Get the command based on the dressing object parameters"""
+        dressing_command = "%s " % FFMPEG_CMD
+        dressing_command += FFMPEG_INPUT % {
+            "input": self.video_file,
+            "nb_threads": FFMPEG_NB_THREADS,
+        }
+
+        dressing_command += get_dressing_input(self.dressing, FFMPEG_DRESSING_INPUT)
+        dressing_filter, video_out, audio_out = self.get_dressing_filter()
         dressing_command += FFMPEG_DRESSING_FILTER_COMPLEX % {
-            "filter": ";".join(dressing_command_filter),
+            "filter": dressing_filter,
         }
 
         if self.dressing.opening_credits or self.dressing.ending_credits:
@@ -488,18 +778,266 @@ class Encoding_video:
         }
         return dressing_command
 
+    def use_dressing_single_pass(self):
+        """Check if the dressing is encoded with the renditions, without dressed file."""
+        return (
+            FFMPEG_DRESSING_SINGLE_PASS
+            and self.dressing is not None
+            and self.is_video()
+            and not self.renditions_dir
+        )
+
+    def get_dressing_single_pass_command(self):
+        """
+        Get the command dressing the video and encoding all its renditions at once.
+
+        The mp3 is encoded from the same dressed audio,
+        so that it keeps the timing of the credits.
+        """
+        renditions = self.get_single_pass_renditions()
+        dressing_filter, video_out, audio_out = self.get_dressing_filter("[dressed]")
+        with_mp3 = len(self.list_audio_track) > 0
+        if audio_out == "[a]":
+            # a filter output is mapped only once, split it for each output
+            audio_outputs = [rend[0] for rend in renditions]
+            if with_mp3:
+                audio_outputs.append("mp3")
+            audio_split = FFMPEG_DRESSING_AUDIO_SPLIT % {
+                "number": len(audio_outputs),
+                "outputs": "".join("[a%s]" % output for output in audio_outputs),
+            }
+            map_audio = '-map "[a%(rendition)s]"'
+        else:
+            audio_split = ""
+            map_audio = "-map 0:a:0" if with_mp3 else ""
+        dressing_command = "%s " % FFMPEG_CMD
+        dressing_command += FFMPEG_INPUT % {
+            "input": self.video_file,
+            "nb_threads": FFMPEG_NB_THREADS,
+        }
+        dressing_command += get_dressing_input(self.dressing, FFMPEG_DRESSING_INPUT)
+        dressing_command += FFMPEG_DRESSING_SINGLE_PASS_FILTER % {
+            "dressing": dressing_filter,
+            "video": video_out,
+            "number": len(renditions),
+            "outputs": "".join("[split%s]" % rend[0] for rend in renditions),
+            "scales": ";".join(self.get_single_pass_scales(renditions)),
+            "audio": audio_split,
+        }
+        dressing_command += self.get_single_pass_outputs(
+            renditions, self.get_subtime(self.cutting_start, self.cutting_stop), map_audio
+        )
+        if with_mp3:
+            dressing_command += map_audio % {"rendition": "mp3"} + " "
+            dressing_command += self.get_mp3_output()
+        return dressing_command
+
     def encode_video_dressing(self):
         """Encode the dressed video."""
         dressing_command = self.get_dressing_command()
-        return_value, return_msg = launch_cmd(dressing_command)
+        return_value, return_msg = self.launch_encode_cmd(
+            "dressing_command", dressing_command
+        )
         self.add_encoding_log(
             "dressing_command", dressing_command, return_value, return_msg
         )
         self.video_file = self.get_dressing_file()
 
+    def encode_video_single_pass(self):
+        """Encode mp4 and HLS renditions with only one decoding of the source."""
+        if self.use_dressing_single_pass():
+            single_pass_command = self.get_dressing_single_pass_command()
+        else:
+            single_pass_command = self.get_single_pass_command()
+        return_value, return_msg = self.launch_encode_cmd(
+            "single_pass_command", single_pass_command
+        )
+        self.add_encoding_log(
+            "single_pass_command", single_pass_command, return_value, return_msg
+        )
+        if not return_value:
+            self.error_encoding = True
+        if self.duration == 0 and len(self.list_mp4_files) > 0:
+            self.fix_duration(list(self.list_mp4_files.values())[0])
+        if return_value:
+            self.create_main_livestream()
+
+    def get_keyframes(self):
+        """Get the keyframes times of the first video track."""
+        probe_cmd = FFPROBE_GET_KEYFRAMES % {
+            "ffprobe": FFPROBE_CMD,
+            "source": '"' + self.video_file + '" ',
+        }
+        info, return_msg = get_info_from_video(probe_cmd)
+        keyframes = []
+        for frame in (info or {}).get("frames", []):
+            try:
+                keyframes.append(float(frame["pts_time"]))
+            except (KeyError, ValueError, TypeError):
+                continue
+        return keyframes
+
+    def get_chunks(self):
+        """
+        Split the part of the video to encode into time ranges.
+
+        Each range starts at the first keyframe after a multiple
+        of FFMPEG_CHUNK_DURATION, so that no chunk needs to decode
+        frames belonging to the previous one.
+
+        Returns:
+            list: tuples (clip_begin, clip_end) in seconds.
+        """
+        start = float(self.cutting_start)
+        end = start + self.duration
+        keyframes = self.get_keyframes()
+        cut_times = [start]
+        target = start + FFMPEG_CHUNK_DURATION
+        while target < end:
+            cut_time = next((kf for kf in keyframes if kf >= target), target)
+            if cut_time >= end:
+                break
+            if cut_time > cut_times[-1]:
+                cut_times.append(cut_time)
+            target += FFMPEG_CHUNK_DURATION
+        cut_times.append(end)
+        return [
+            (round(cut_times[index], 3), round(cut_times[index + 1], 3))
+            for index in range(len(cut_times) - 1)
+        ]
+
+    def get_chunk_file(self, rend, index):
+        """Get the path of the chunk of a rendition."""
+        return os.path.join(self.output_dir, "%sp_chunk_%04d.mp4" % (rend, index))
+
+    def get_chunk_command(self, renditions, index, clip_begin, clip_end):
+        """Get the command encoding all the renditions of a chunk."""
+        list_rendition = get_list_rendition()
+        chunk_command = "%s " % FFMPEG_CMD
+        chunk_command += FFMPEG_CHUNK_INPUT % {
+            "input": self.video_file,
+            "nb_threads": FFMPEG_NB_THREADS,
+            "cut": self.get_subtime(clip_begin, clip_end),
+        }
+        chunk_command += FFMPEG_SINGLE_PASS_FILTER % {
+            "number": len(renditions),
+            "outputs": "".join("[split%s]" % rend[0] for rend in renditions),
+            "scales": ";".join(self.get_single_pass_scales(renditions)),
+        }
+        for rend, height, with_mp4, with_hls in renditions:
+            chunk_command += FFMPEG_CHUNK_ENCODE % {
+                "video": "v%s" % rend,
+                "map_audio": "-map 0:a:0" if len(self.list_audio_track) > 0 else "",
+                "libx": FFMPEG_LIBX,
+                "preset": FFMPEG_PRESET,
+                "profile": FFMPEG_PROFILE,
+                "level": FFMPEG_LEVEL,
+                "crf": FFMPEG_CRF,
+                "maxrate": list_rendition[rend]["maxrate"],
+                "bufsize": list_rendition[rend]["maxrate"],
+                "ba": list_rendition[rend]["audio_bitrate"],
+                "output": self.get_chunk_file(rend, index),
+            }
+        return chunk_command
+
+    def get_concat_command(self, rend, height, with_mp4, with_hls, nb_chunks):
+        """Get the command joining the chunks of a rendition without re-encoding."""
+        list_rendition = get_list_rendition()
+        concat_file = os.path.join(self.output_dir, "%sp_chunks.txt" % rend)
+        with open(concat_file, "w") as file:
+            for index in range(nb_chunks):
+                file.write("file '%s'\n" % self.get_chunk_file(rend, index))
+        concat_command = "%s " % FFMPEG_CMD
+        concat_command += FFMPEG_CHUNK_CONCAT_INPUT % {"input": concat_file}
+        if with_mp4:
+            output_file = os.path.join(self.output_dir, "%sp.mp4" % rend)
+            concat_command += FFMPEG_CHUNK_CONCAT_MP4 % {"output": output_file}
+            self.list_mp4_files[rend] = output_file
+        if with_hls:
+            output_file = os.path.join(self.output_dir, "%sp.m3u8" % rend)
+            concat_command += FFMPEG_CHUNK_CONCAT_HLS % {
+                "maxrate": list_rendition[rend]["maxrate"],
+                "ba": list_rendition[rend]["audio_bitrate"],
+                "hls_time": FFMPEG_HLS_TIME,
+                "height": height,
+                "output": output_file,
+            }
+            self.list_hls_files[rend] = output_file
+        return concat_command
+
+    def launch_chunk_commands(self, chunk_commands):
+        """
+        Launch the chunk commands in parallel.
+
+        Threads are enough here as each one only waits for its ffmpeg process,
+        and unlike a process pool they can run inside a daemonic Celery worker.
+        """
+        with ThreadPoolExecutor(max_workers=FFMPEG_CHUNK_WORKERS) as executor:
+            return list(executor.map(launch_cmd, chunk_commands))
+
+    def remove_chunk_files(self, renditions, nb_chunks):
+        """Remove the chunks and the concat lists once joined."""
+        for rend, height, with_mp4, with_hls in renditions:
+            concat_file = os.path.join(self.output_dir, "%sp_chunks.txt" % rend)
+            chunk_files = [self.get_chunk_file(rend, i) for i in range(nb_chunks)]
+            for chunk_file in chunk_files + [concat_file]:
+                if os.path.exists(chunk_file):
+                    os.remove(chunk_file)
+
+    def encode_video_chunks(self):
+        """Encode the video by chunks in parallel and join each rendition."""
+        renditions = self.get_single_pass_renditions()
+        chunks = self.get_chunks()
+        chunk_commands = [
+            self.get_chunk_command(renditions, index, clip_begin, clip_end)
+            for index, (clip_begin, clip_end) in enumerate(chunks)
+        ]
+        results = self.launch_chunk_commands(chunk_commands)
+        chunks_ok = True
+        for index, chunk_command in enumerate(chunk_commands):
+            return_value, return_msg = results[index]
+            self.add_encoding_log(
+                "chunk_command_%s" % index, chunk_command, return_value, return_msg
+            )
+            chunks_ok = chunks_ok and return_value
+        if not chunks_ok:
+            self.error_encoding = True
+        else:
+            hls_ok = True
+            for rend, height, with_mp4, with_hls in renditions:
+                concat_command = self.get_concat_command(
+                    rend, height, with_mp4, with_hls, len(chunks)
+                )
+                return_value, return_msg = launch_cmd(concat_command)
+                self.add_encoding_log(
+                    "concat_command_%s" % rend, concat_command, return_value, return_msg
+                )
+                hls_ok = hls_ok and return_value
+            if hls_ok:
+                self.create_main_livestream()
+            else:
+                self.error_encoding = True
+        self.remove_chunk_files(renditions, len(chunks))
+
     def encode_video_part(self):
+        if self.renditions_dir:
+            self.use_studio_renditions()
+            return
+        if self.use_dressing_single_pass():
+            self.encode_video_single_pass()
+            return
+        if FFMPEG_CHUNK_DURATION > 0 and self.duration > FFMPEG_CHUNK_DURATION:
+            self.encode_video_chunks()
+            return
+        if FFMPEG_SINGLE_PASS_ENCODE:
+            self.encode_video_single_pass()
+            return
+        self.encode_video_two_pass()
+
+    def encode_video_two_pass(self):
+        """Encode the mp4 renditions, then the HLS renditions."""
         mp4_command = self.get_mp4_command()
-        return_value, return_msg = launch_cmd(mp4_command)
+        return_value, return_msg = self.launch_encode_cmd("mp4_command", mp4_command)
         self.add_encoding_log("mp4_command", mp4_command, return_value, return_msg)
         if not return_value:
             self.error_encoding = True
@@ -508,7 +1046,7 @@ class Encoding_video:
             first_item = list_rendition.popitem(last=False)
             self.fix_duration(self.list_mp4_files[first_item[0]])
         hls_command = self.get_hls_command()
-        return_value, return_msg = launch_cmd(hls_command)
+        return_value, return_msg = self.launch_encode_cmd("hls_command", hls_command)
         if return_value:
             self.create_main_livestream()
         self.add_encoding_log("hls_command", hls_command, return_value, return_msg)
@@ -534,19 +1072,23 @@ class Encoding_video:
         livestream_file.write(livestream_content.replace("\n\n", "\n"))
         livestream_file.close()
 
+    def get_mp3_output(self):
+        """Get the encoding and the output of the mp3 file."""
+        output_file = os.path.join(self.output_dir, "audio_%s.mp3" % FFMPEG_AUDIO_BITRATE)
+        self.list_mp3_files[FFMPEG_AUDIO_BITRATE] = output_file
+        return FFMPEG_MP3_ENCODE % {
+            # "audio_bitrate": AUDIO_BITRATE,
+            "cut": self.get_subtime(self.cutting_start, self.cutting_stop),
+            "output": output_file,
+        }
+
     def get_mp3_command(self):
         mp3_command = "%s " % FFMPEG_CMD
         mp3_command += FFMPEG_INPUT % {
             "input": self.video_file,
             "nb_threads": FFMPEG_NB_THREADS,
         }
-        output_file = os.path.join(self.output_dir, "audio_%s.mp3" % FFMPEG_AUDIO_BITRATE)
-        mp3_command += FFMPEG_MP3_ENCODE % {
-            # "audio_bitrate": AUDIO_BITRATE,
-            "cut": self.get_subtime(self.cutting_start, self.cutting_stop),
-            "output": output_file,
-        }
-        self.list_mp3_files[FFMPEG_AUDIO_BITRATE] = output_file
+        mp3_command += self.get_mp3_output()
         return mp3_command
 
     def get_m4a_command(self):
@@ -565,15 +1107,18 @@ class Encoding_video:
         return m4a_command
 
     def encode_audio_part(self):
-        mp3_command = self.get_mp3_command()
-        return_value, return_msg = launch_cmd(mp3_command)
-        self.add_encoding_log("mp3_command", mp3_command, return_value, return_msg)
-        if self.duration == 0:
+        if not self.use_dressing_single_pass():
+            # the dressed mp3 is encoded with the renditions
+            mp3_command = self.get_mp3_command()
+            return_value, return_msg = self.launch_encode_cmd("mp3_command", mp3_command)
+            self.add_encoding_log("mp3_command", mp3_command, return_value, return_msg)
+        if self.duration == 0 and len(self.list_mp3_files) > 0:
+            # the dressed mp3 is missing if the single pass encoding had no output
             new_k = list(self.list_mp3_files)[0]
             self.fix_duration(self.list_mp3_files[new_k])
         if not self.is_video():
             m4a_command = self.get_m4a_command()
-            return_value, return_msg = launch_cmd(m4a_command)
+            return_value, return_msg = self.launch_encode_cmd("m4a_command", m4a_command)
             self.add_encoding_log("m4a_command", m4a_command, return_value, return_msg)
 
     def get_extract_thumbnail_command(self):
@@ -591,12 +1136,28 @@ class Encoding_video:
             self.list_thumbnail_files[img] = output_file
         return thumbnail_command
 
+    def get_image_source(self):
+        """
+        Get the file to extract the thumbnails and the overview from.
+
+        The first mp4 rendition is used when it was encoded, then the first
+        HLS rendition (which is dressed too when there is no dressed file),
+        the source file otherwise (e.g. when the encoding failed).
+        """
+        first_item = self.get_first_item()
+        if first_item is not None and check_file(
+            self.list_mp4_files.get(first_item[0], "")
+        ):
+            return self.list_mp4_files[first_item[0]]
+        for output_file in self.list_hls_files.values():
+            if check_file(output_file):
+                return output_file
+        return self.video_file
+
     def get_create_thumbnail_command(self):
         thumbnail_command = "%s " % FFMPEG_CMD
-        first_item = self.get_first_item()
-        input_file = self.list_mp4_files[first_item[0]]
         thumbnail_command += FFMPEG_INPUT % {
-            "input": input_file,
+            "input": self.get_image_source(),
             "nb_threads": FFMPEG_NB_THREADS,
         }
         output_file = os.path.join(self.output_dir, "thumbnail")
@@ -624,81 +1185,76 @@ class Encoding_video:
         else:
             return list_rendition.popitem(last=False)
 
+    def get_overview_time(self, seconds):
+        """Format seconds as a WebVTT timestamp."""
+        seconds = format(float(seconds), ".3f")
+        overview_time = time.strftime(
+            "%H:%M:%S", time.gmtime(int(str(seconds).split(".")[0]))
+        )
+        return overview_time + ".%s" % (str(seconds).split(".")[1])
+
+    def get_overview_grid(self):
+        """Get the number of images, columns and rows of the overview sprite."""
+        columns = FFMPEG_OVERVIEW_COLUMNS
+        rows = FFMPEG_OVERVIEW_ROWS
+        if self.duration < 100:
+            # on ne fait qu'une ligne d'images si la video dure moins de 100 sec.
+            rows = 1
+        return columns * rows, columns, rows
+
+    def get_create_overview_command(self, image_width, image_height):
+        """Get the command extracting all the overview images in one pass."""
+        nb_img, columns, rows = self.get_overview_grid()
+        overview_command = "%s " % FFMPEG_CMD
+        overview_command += FFMPEG_OVERVIEW_INPUT % {
+            "input": self.get_image_source(),
+            "nb_threads": FFMPEG_NB_THREADS,
+        }
+        overview_command += FFMPEG_CREATE_OVERVIEW % {
+            "nb_img": nb_img,
+            "duration": self.duration,
+            "image_width": image_width,
+            "image_height": image_height,
+            "columns": columns,
+            "rows": rows,
+            "output": os.path.join(self.output_dir, "overview.png"),
+        }
+        return overview_command
+
     def create_overview(self):
-        first_item = self.get_first_item()
-        # overview combine for 160x90
         in_height = list(self.list_video_track.items())[0][1]["height"]
         in_width = list(self.list_video_track.items())[0][1]["width"]
-        image_height = 75  # decrease to 75 px instead of 90 due to montage overflow
+        image_height = FFMPEG_OVERVIEW_IMAGE_HEIGHT
         coef = in_height / image_height
         image_width = int(in_width / coef)
-        input_file = self.list_mp4_files[first_item[0]]
-        nb_img = 100
-        step = 1
-        if self.duration < 100:
-            # nb_img = int(self.duration * 10 / 100)
-            step = 10  # on ne fait que 10 images si la video dure moins de 100 sec.
         overviewimagefilename = os.path.join(self.output_dir, "overview.png")
         image_url = os.path.basename(overviewimagefilename)
         overviewfilename = os.path.join(self.output_dir, "overview.vtt")
+        overview_command = self.get_create_overview_command(image_width, image_height)
+        return_value, return_msg = launch_cmd(overview_command)
+        self.add_encoding_log(
+            "create_overview_command", overview_command, return_value, return_msg
+        )
+        nb_img, columns, rows = self.get_overview_grid()
         webvtt = WebVTT()
-        for i in range(0, nb_img, step):
-            # create overviewimagefilename for first pass
-            output_file = (
-                os.path.join(self.output_dir, "thumbnail_%s.png" % i)
-                if i > 0
-                else overviewimagefilename
-            )
-            cmd_ffmpegthumbnailer = (
-                'ffmpegthumbnailer -t "%(stamp)s" '
-                + '-s "%(image_width)s" -i %(source)s -c png '
-                + "-o %(output_file)s "
-            ) % {
-                "stamp": str(i) + "%",
-                "source": input_file,
-                "output_file": output_file,
-                "image_width": image_width,
-            }
-            return_value, return_msg = launch_cmd(cmd_ffmpegthumbnailer)
-            # self.add_encoding_log(
-            # "ffmpegthumbnailer_%s" % i, cmd_ffmpegthumbnailer, return_value, return_msg)
-            if return_value and check_file(output_file) and i > 0:
-                # print("MONTAGE")
-                cmd_montage = (
-                    "montage -geometry +0+0 %(overviewimagefilename)s \
-                    %(output_file)s  %(overviewimagefilename)s"
-                    % {
-                        "overviewimagefilename": overviewimagefilename,
-                        "output_file": output_file,
-                    }
-                )
-                return_value, return_msg = launch_cmd(cmd_montage)
-                if not return_value:
-                    print("cmd_montage_%s" % i, cmd_montage, return_value, return_msg)
-                # self.add_encoding_log
-                # ("cmd_montage_%s" % i, cmd_montage, return_value, return_msg)
-                os.remove(output_file)
-            start = format(float(self.duration * i / 100), ".3f")
-            end = format(float(self.duration * (i + step) / 100), ".3f")
-            start_time = time.strftime(
-                "%H:%M:%S", time.gmtime(int(str(start).split(".")[0]))
-            )
-            start_time += ".%s" % (str(start).split(".")[1])
-            end_time = time.strftime(
-                "%H:%M:%S", time.gmtime(int(str(end).split(".")[0]))
-            ) + ".%s" % (str(end).split(".")[1])
+        for i in range(0, nb_img):
             caption = Caption(
-                "%s" % start_time,
-                "%s" % end_time,
+                self.get_overview_time(self.duration * i / nb_img),
+                self.get_overview_time(self.duration * (i + 1) / nb_img),
                 "%s#xywh=%d,%d,%d,%d"
-                % (image_url, image_width * (i / step), 0, image_width, image_height),
+                % (
+                    image_url,
+                    image_width * (i % columns),
+                    image_height * (i // columns),
+                    image_width,
+                    image_height,
+                ),
             )
             webvtt.captions.append(caption)
         webvtt.save(overviewfilename)
         if check_file(overviewfilename) and check_file(overviewimagefilename):
             self.list_overview_files["0"] = overviewimagefilename
             self.list_overview_files["1"] = overviewfilename
-            # self.encoding_log += "\n- overviewfilename:\n%s" % overviewfilename
         else:
             self.add_encoding_log("create_overview", "", False, "")
 
@@ -754,6 +1310,18 @@ class Encoding_video:
         with open(self.output_dir + "/info_video.json", "w") as outfile:
             json.dump(data_to_dump, outfile, indent=2)
 
+    def encoding_progress(self, title, percent, fps):
+        """Publish the progress of an encoding command."""
+        print("%s: %s%% (%s fps)" % (title, percent, fps))
+
+    def launch_encode_cmd(self, title, cmd):
+        """Launch an ffmpeg command publishing its progress."""
+        return launch_cmd(
+            cmd,
+            progress=lambda percent, fps: self.encoding_progress(title, percent, fps),
+            duration=self.duration,
+        )
+
     def add_encoding_log(self, title, command, result, msg):
         self.encoding_log[title] = {"command": command, "result": result, "msg": msg}
         if result is False and self.error_encoding is False:
@@ -763,7 +1331,7 @@ class Encoding_video:
         self.start = time.ctime()
         self.create_output_dir()
         self.get_video_data()
-        if self.dressing is not None:
+        if self.dressing is not None and not self.use_dressing_single_pass():
             self.encode_video_dressing()
         print(self.id, self.video_file, self.duration)
         if self.is_video():
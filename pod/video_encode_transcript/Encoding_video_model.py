@@ -26,6 +26,7 @@ from .encoding_utils import (
     launch_cmd,
     check_file,
 )
+from .utils import change_encoding_step
 
 ENCODING_CHOICES = getattr(
     settings,
@@ -44,6 +45,7 @@ __LANG_CHOICES_DICT__ = {
     key: value for key, value in LANG_CHOICES[0][1] + LANG_CHOICES[1][1]
 }
 DEFAULT_LANG_TRACK = getattr(settings, "DEFAULT_LANG_TRACK", "fr")
+CELERY_TO_ENCODE = getattr(settings, "CELERY_TO_ENCODE", False)
 
 if getattr(settings, "USE_PODFILE", False):
     __FILEPICKER__ = True
@@ -386,6 +388,27 @@ class Encoding_video_model(Encoding_video):
             info_video["list_thumbnail_files"] = self.list_thumbnail_files
             self.store_json_list_thumbnail_files(info_video)
 
+    def encoding_progress(self, title, percent, fps):
+        """Publish the progress of an encoding command in the encoding step."""
+        change_encoding_step(
+            self.id, 2, "encoding %s: %s%% (%s fps)" % (title, percent, fps)
+        )
+
+    def launch_chunk_commands(self, chunk_commands):
+        """Launch the chunk commands as Celery subtasks if Celery is used to encode."""
+        if not CELERY_TO_ENCODE:
+            return super().launch_chunk_commands(chunk_commands)
+        # load module here to prevent circular import
+        from celery import group
+        from pod.main.tasks import task_start_encode_chunk
+
+        result = group(
+            task_start_encode_chunk.s(chunk_command) for chunk_command in chunk_commands
+        ).apply_async()
+        # the encoding task waits for its chunks:
+        # the Celery worker needs a concurrency greater than 1.
+        return result.get(disable_sync_subtasks=False)
+
     def encode_video(self):
         """Start video encoding."""
         self.start_encode()
@@ -104,8 +104,12 @@ def start_studio_remote_encode(recording_id, video_output, videos, subtime, pres
 """
 
 
-def encode_video(video_id):
-    """ENCODE VIDEO: MAIN FUNCTION."""
+def encode_video(video_id, renditions_dir=""):
+    """ENCODE VIDEO: MAIN FUNCTION.
+
+    renditions_dir holds the mp4 and HLS renditions already encoded
+    with the source file of a studio recording, they are not encoded again.
+    """
     start = "Start at: %s" % time.ctime()
 
     video_to_encode = Video.objects.get(id=video_id)
@@ -122,6 +126,7 @@ def encode_video(video_id):
     change_encoding_step(video_id, 0, "start")
     # start and stop cut ?
     encoding_video = get_encoding_video(video_to_encode)
+    encoding_video.renditions_dir = renditions_dir
     encoding_video.add_encoding_log("start_time", "", True, start)
     change_encoding_step(video_id, 1, "remove old data")
     encoding_video.remove_old_data()
@@ -21,6 +21,22 @@ FFMPEG_STUDIO_COMMAND = (
     + ' "expr:gte(t,n_forced*1)" -max_muxing_queue_size 4000 -deinterlace '
 )
 
+# Composite the studio sources once and split the result to the source file
+# of the video and to the mp4 and HLS renditions, encoded in the same command.
+FFMPEG_STUDIO_SINGLE_PASS = False
+FFMPEG_STUDIO_INPUT = "-hide_banner -threads %(nb_threads)s %(input)s "
+FFMPEG_STUDIO_FILTER = (
+    '-filter_complex "%(studio)s[studio];'
+    + '[studio]split=%(number)s[source]%(outputs)s%(scales)s" '
+)
+FFMPEG_STUDIO_SOURCE_OUTPUT = (
+    '%(subtime)s -map "[source]" %(map_audio)s'
+    + " -c:a aac -ar 48000 -c:v h264 -profile:v high -pix_fmt yuv420p"
+    + " -crf %(crf)s -sc_threshold 0 -force_key_frames"
+    + ' "expr:gte(t,n_forced*1)" -max_muxing_queue_size 4000'
+    + ' -vsync 0 -movflags +faststart -f mp4 -y "%(output)s" '
+)
+
 FFMPEG_LIBX = "libx264"
 FFMPEG_MP4_ENCODE = (
     '%(cut)s -map 0:v:0 %(map_audio)s -c:v %(libx)s  -vf "scale=-2:%(height)s" '
@@ -45,6 +61,54 @@ FFMPEG_HLS_ENCODE_PARAMS = (
     + '-master_pl_name "livestream%(height)s.m3u8" '
     + '-y "%(output)s" '
 )
+# Decode the source once and encode each rendition once,
+# the tee muxer writes both the mp4 file and the HLS playlist of the rendition.
+FFMPEG_SINGLE_PASS_ENCODE = False
+FFMPEG_SINGLE_PASS_FILTER = (
+    '-filter_complex "[0:v:0]split=%(number)s%(outputs)s;%(scales)s" '
+)
+FFMPEG_SINGLE_PASS_SCALE = "[%(input)s]scale=-2:%(height)s[%(output)s]"
+FFMPEG_SINGLE_PASS_PARAMS = (
+    '%(cut)s -map "[%(video)s]" %(map_audio)s -c:v %(libx)s '
+    + "-preset %(preset)s -profile:v %(profile)s "
+    + "-pix_fmt yuv420p -level %(level)s -crf %(crf)s "
+    + "-maxrate %(maxrate)s -bufsize %(bufsize)s "
+    + '-sc_threshold 0 -force_key_frames "expr:gte(t,n_forced*1)" '
+    + "-max_muxing_queue_size 4000 "
+    + "-c:a aac -ar 48000 -b:a %(ba)s -flags +global_header "
+    + '-f tee -y "%(output)s" '
+)
+FFMPEG_SINGLE_PASS_MP4_OUTPUT = "[f=mp4:movflags=+faststart]%(output)s"
+FFMPEG_SINGLE_PASS_HLS_OUTPUT = (
+    "[f=hls:hls_playlist_type=vod:hls_time=%(hls_time)s:hls_flags=single_file:"
+    + "master_pl_name=livestream%(height)s.m3u8]%(output)s"
+)
+# Split videos longer than FFMPEG_CHUNK_DURATION seconds at keyframes
+# and encode the chunks in parallel (0 to disable).
+FFMPEG_CHUNK_DURATION = 0
+FFMPEG_CHUNK_WORKERS = 4
+FFPROBE_GET_KEYFRAMES = (
+    "%(ffprobe)s -v quiet -select_streams v:0 -skip_frame nokey "
+    + "-show_entries frame=pts_time -print_format json -i %(source)s"
+)
+FFMPEG_CHUNK_INPUT = '-hide_banner -threads %(nb_threads)s %(cut)s-i "%(input)s" '
+FFMPEG_CHUNK_ENCODE = (
+    '-map "[%(video)s]" %(map_audio)s -c:v %(libx)s '
+    + "-preset %(preset)s -profile:v %(profile)s "
+    + "-pix_fmt yuv420p -level %(level)s -crf %(crf)s "
+    + "-maxrate %(maxrate)s -bufsize %(bufsize)s "
+    + '-sc_threshold 0 -force_key_frames "expr:gte(t,n_forced*1)" '
+    + "-max_muxing_queue_size 4000 "
+    + '-c:a aac -ar 48000 -b:a %(ba)s -y "%(output)s" '
+)
+FFMPEG_CHUNK_CONCAT_INPUT = '-hide_banner -f concat -safe 0 -i "%(input)s" '
+FFMPEG_CHUNK_CONCAT_MP4 = '-map 0 -c copy -movflags faststart -y "%(output)s" '
+FFMPEG_CHUNK_CONCAT_HLS = (
+    "-map 0 -c copy -b:v %(maxrate)s -b:a %(ba)s "
+    + "-hls_playlist_type vod -hls_time %(hls_time)s -hls_flags single_file "
+    + '-master_pl_name "livestream%(height)s.m3u8" '
+    + '-y "%(output)s" '
+)
 
 # FFMPEG_MP3_ENCODE = '-vn -b:a %(audio_bitrate)s -f mp3 -y "%(output)s" '
 FFMPEG_MP3_ENCODE = '%(cut)s -vn -codec:a libmp3lame -qscale:a 2 -y "%(output)s" '
@@ -52,6 +116,10 @@ FFMPEG_MP3_ENCODE = '%(cut)s -vn -codec:a libmp3lame -qscale:a 2 -y "%(output)s"
 # which gives us a VBR MP3 audio stream with an average stereo bitrate of 170-210 kBit/s.
 FFMPEG_M4A_ENCODE = '%(cut)s -vn -c:a aac -b:a %(audio_bitrate)s "%(output)s" '
 FFMPEG_NB_THREADS = 0
+# Only the last lines of each ffmpeg output are kept in the encoding log
+FFMPEG_LOG_MAX_LINES = 200
+# Minimum time in seconds between two encoding progress updates
+FFMPEG_PROGRESS_INTERVAL = 5
 FFMPEG_AUDIO_BITRATE = "192k"
 
 FFMPEG_EXTRACT_THUMBNAIL = '-map 0:%(index)s -an -c:v copy -y  "%(output)s" '
@@ -64,6 +132,20 @@ FFMPEG_CREATE_THUMBNAIL = (
 )
 FFMPEG_EXTRACT_SUBTITLE = '-map 0:%(index)s -f webvtt -y  "%(output)s" '
 
+# Overview sprite: FFMPEG_OVERVIEW_COLUMNS x FFMPEG_OVERVIEW_ROWS images
+# (only one row for videos shorter than 100 seconds), built in one decoding pass.
+FFMPEG_OVERVIEW_COLUMNS = 10
+FFMPEG_OVERVIEW_ROWS = 10
+FFMPEG_OVERVIEW_IMAGE_HEIGHT = 75
+FFMPEG_OVERVIEW_INPUT = (
+    '-hide_banner -threads %(nb_threads)s -skip_frame nokey -i "%(input)s" '
+)
+FFMPEG_CREATE_OVERVIEW = (
+    '-an -vf "fps=%(nb_img)s/%(duration)s,'
+    + "scale=%(image_width)s:%(image_height)s,"
+    + 'tile=%(columns)sx%(rows)s" -frames:v 1 -y "%(output)s" '
+)
+
 FFMPEG_DRESSING_OUTPUT = ' -c:v libx264 -y -vsync 0 "%(output)s" '
 FFMPEG_DRESSING_INPUT = ' -i "%(input)s"'
 FFMPEG_DRESSING_FILTER_COMPLEX = ' -filter_complex "%(filter)s" '
@@ -77,6 +159,14 @@ FFMPEG_DRESSING_SCALE = (
     + "decrease,pad=ceil(ih*16/9):ih:(ow-iw)/2:(oh-ih)/2[%(name)s]"
 )
 FFMPEG_DRESSING_CONCAT = "%(params)sconcat=n=%(number)s:v=1:a=1:unsafe=1[v][a]"
+# Dress the video in the filter graph of the single pass encoding
+# instead of writing a dressed file encoded again.
+FFMPEG_DRESSING_SINGLE_PASS = False
+FFMPEG_DRESSING_SINGLE_PASS_FILTER = (
+    ' -filter_complex "%(dressing)s;%(video)ssplit=%(number)s%(outputs)s;'
+    + '%(scales)s%(audio)s" '
+)
+FFMPEG_DRESSING_AUDIO_SPLIT = ";[a]asplit=%(number)s%(outputs)s"
 
 VIDEO_RENDITIONS = [
     {
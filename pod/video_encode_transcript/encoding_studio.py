@@ -2,8 +2,12 @@
 
 from django.conf import settings
 from .utils import check_file, send_email_recording
+from .encoding_utils import launch_cmd
+from .Encoding_video import Encoding_video
 from . import encode
 
+import os
+import shutil
 import time
 import subprocess
 import json
@@ -15,6 +19,7 @@ from .encoding_settings import (
     FFMPEG_NB_THREADS,
     FFPROBE_GET_INFO,
     FFMPEG_STUDIO_COMMAND,
+    FFMPEG_STUDIO_SINGLE_PASS,
 )
 
 FFMPEG_CMD = getattr(settings, "FFMPEG_CMD", FFMPEG_CMD)
@@ -23,10 +28,19 @@ FFMPEG_CRF = getattr(settings, "FFMPEG_CRF", FFMPEG_CRF)
 FFMPEG_NB_THREADS = getattr(settings, "FFMPEG_NB_THREADS", FFMPEG_NB_THREADS)
 FFPROBE_GET_INFO = getattr(settings, "FFPROBE_GET_INFO", FFPROBE_GET_INFO)
 FFMPEG_STUDIO_COMMAND = getattr(settings, "FFMPEG_STUDIO_COMMAND", FFMPEG_STUDIO_COMMAND)
+FFMPEG_STUDIO_SINGLE_PASS = getattr(
+    settings, "FFMPEG_STUDIO_SINGLE_PASS", FFMPEG_STUDIO_SINGLE_PASS
+)
 
 DEBUG = getattr(settings, "DEBUG", True)
 
+# Presenter layouts with a filter graph compositing the two sources
+STUDIO_PRESENTERS = ["pipb", "piph", "mid"]
+
 ENCODE_VIDEO = getattr(settings, "ENCODE_VIDEO", "start_encode")
+USE_DISTANT_ENCODING_TRANSCODING = getattr(
+    settings, "USE_DISTANT_ENCODING_TRANSCODING", False
+)
 
 # ##########################################################################
 # ENCODE VIDEO STUDIO: MAIN ENCODE
@@ -41,46 +55,64 @@ def get_video_info(command):
     return json.loads(ffproberesult.stdout.decode("utf-8"))
 
 
-def encode_video_studio(recording_id, video_output, videos, subtime, presenter):
-    """Encode video from studio."""
-    presenter_source = None
-    presentation_source = None
-    input_video = ""
+def get_source_info(source, select_streams="-select_streams v:0 "):
+    """Get ffprobe info of the first stream of a studio source."""
+    command = FFPROBE_GET_INFO % {
+        "ffprobe": FFPROBE_CMD,
+        "select_streams": select_streams,
+        "source": '"' + source + '" ',
+    }
+    return get_video_info(command)
+
+
+def get_studio_sources(videos):
+    """Get the presentation and the presenter sources, in the order of the inputs."""
+    sources = {}
     for video in videos:
-        if video.get("type") == "presenter/source":
-            presenter_source = video.get("src")
-            input_video = '-i "' + presenter_source + '" '
-        if video.get("type") == "presentation/source":
-            presentation_source = video.get("src")
-            input_video = '-i "' + presentation_source + '" '
-    info_presenter_video = {}
-    info_presentation_video = {}
-    if presenter_source and presentation_source:
-        # to put it in the right order
-        input_video = '-i "' + presentation_source + '" -i "' + presenter_source + '" '
-        command = FFPROBE_GET_INFO % {
-            "ffprobe": FFPROBE_CMD,
-            "select_streams": "-select_streams v:0 ",
-            "source": '"' + presentation_source + '" ',
-        }
-        info_presentation_video = get_video_info(command)
-        command = FFPROBE_GET_INFO % {
-            "ffprobe": FFPROBE_CMD,
-            "select_streams": "-select_streams v:0 ",
-            "source": '"' + presenter_source + '" ',
-        }
-        info_presenter_video = get_video_info(command)
+        if video.get("type") in ["presentation/source", "presenter/source"]:
+            sources[video.get("type")] = video.get("src")
+    return [
+        sources[source_type]
+        for source_type in ["presentation/source", "presenter/source"]
+        if source_type in sources
+    ]
+
+
+def get_studio_sub_cmd(sources, presenter):
+    """Get the options compositing the studio sources into the source file."""
+    if len(sources) == 2:
         subcmd = get_sub_cmd(
-            get_height(info_presentation_video),
-            get_height(info_presenter_video),
+            get_height(get_source_info(sources[0])),
+            get_height(get_source_info(sources[1])),
             presenter,
         )
-
     else:
         subcmd = " -vsync 0 "
-    subcmd += " -movflags +faststart -f mp4 "
+    return subcmd + " -movflags +faststart -f mp4 "
+
+
+def use_studio_single_pass(sources, presenter):
+    """Check if the renditions can be encoded with the source file of the video."""
+    return (
+        FFMPEG_STUDIO_SINGLE_PASS
+        and ENCODE_VIDEO == "start_encode"
+        and not USE_DISTANT_ENCODING_TRANSCODING
+        and (len(sources) == 1 or (len(sources) == 2 and presenter in STUDIO_PRESENTERS))
+    )
+
 
-    msg = launch_encode_video_studio(input_video, subtime, subcmd, video_output)
+def encode_video_studio(recording_id, video_output, videos, subtime, presenter):
+    """Encode video from studio."""
+    sources = get_studio_sources(videos)
+    input_video = "".join('-i "%s" ' % source for source in sources)
+    renditions_dir = ""
+    if use_studio_single_pass(sources, presenter):
+        msg, renditions_dir = launch_encode_studio_single_pass(
+            input_video, sources, subtime, presenter, video_output
+        )
+    else:
+        subcmd = get_studio_sub_cmd(sources, presenter)
+        msg = launch_encode_video_studio(input_video, subtime, subcmd, video_output)
     from pod.recorder.models import Recording
 
     recording = Recording.objects.get(id=recording_id)
@@ -90,16 +122,25 @@ def encode_video_studio(recording_id, video_output, videos, subtime, presenter):
         from pod.recorder.plugins.type_studio import save_basic_video
 
         video = save_basic_video(recording, video_output)
-        encode_video = getattr(encode, ENCODE_VIDEO)
-        encode_video(video.id, False)
+        if renditions_dir:
+            encode.encode_video(video.id, renditions_dir)
+        else:
+            encode_video = getattr(encode, ENCODE_VIDEO)
+            encode_video(video.id, False)
     else:
         msg = "Wrong file or path:\n%s" % video_output
         send_email_recording(msg, recording_id)
 
 
-def get_sub_cmd(height_presentation_video, height_presenter_video, presenter):
+def get_composite_filter(height_presentation_video, height_presenter_video, presenter):
+    """Get the filter graph compositing the presentation and the presenter videos.
+
+    Returns:
+        tuple: the filter graph, empty for an unknown presenter, and its height.
+    """
     min_height = min([height_presentation_video, height_presenter_video])
-    subcmd = ""
+    studio_filter = ""
+    height = 0
     if presenter == "pipb":
         # trouver la bonne hauteur en fonction de la video de presentation
         height = (
@@ -111,11 +152,10 @@ def get_sub_cmd(height_presentation_video, height_presenter_video, presenter):
         # -c:v libx264 -filter_complex "[0:v]scale=-2:720[pres];[1:v]scale=-2:180[pip];\
         # [pres][pip]overlay=W-w-10:H-h-10:shortest=1" \
         # -vsync 0 outputVideo.mp4
-        subcmd = (
-            " -filter_complex "
-            + '"[0:v]scale=-2:%(height)s[pres];[1:v]scale=-2:%(sh)s[pip];'
+        studio_filter = (
+            "[0:v]scale=-2:%(height)s[pres];[1:v]scale=-2:%(sh)s[pip];"
             % {"height": height, "sh": height / 4}
-            + '[pres][pip]overlay=W-w-10:H-h-10:shortest=1" -vsync 0 '
+            + "[pres][pip]overlay=W-w-10:H-h-10:shortest=1"
         )
     if presenter == "piph":
         # trouver la bonne hauteur en fonction de la video de presentation
@@ -128,25 +168,54 @@ def get_sub_cmd(height_presentation_video, height_presenter_video, presenter):
         # -c:v libx264 -filter_complex "[0:v]scale=-2:720[pres];[1:v]scale=-2:180[pip];\
         # [pres][pip]overlay=W-w-10:H-h-10:shortest=1" \
         # -vsync 0 outputVideo.mp4
-        subcmd = (
-            " -filter_complex "
-            + '"[0:v]scale=-2:%(height)s[pres];[1:v]scale=-2:%(sh)s[pip];'
+        studio_filter = (
+            "[0:v]scale=-2:%(height)s[pres];[1:v]scale=-2:%(sh)s[pip];"
             % {"height": height, "sh": height / 4}
-            + '[pres][pip]overlay=W-w-10:10:shortest=1" -vsync 0 '
+            + "[pres][pip]overlay=W-w-10:10:shortest=1"
         )
     if presenter == "mid":
         height = min_height if (min_height % 2) == 0 else min_height + 1
         # ffmpeg -i presentation.webm -i presenter.webm \
         # -c:v libx264 -filter_complex "[0:v]scale=-2:720[left];[left][1:v]hstack" \
         # outputVideo.mp4
-        subcmd = (
-            " -filter_complex "
-            + '"[0:v]scale=-2:%(height)s[left];[1:v]scale=-2:%(height)s[right];'
+        studio_filter = (
+            "[0:v]scale=-2:%(height)s[left];[1:v]scale=-2:%(height)s[right];"
             % {"height": height}
-            + '[left][right]hstack" -vsync 0 '
+            + "[left][right]hstack"
         )
 
-    return subcmd
+    return studio_filter, height
+
+
+def get_sub_cmd(height_presentation_video, height_presenter_video, presenter):
+    studio_filter, height = get_composite_filter(
+        height_presentation_video, height_presenter_video, presenter
+    )
+    if studio_filter == "":
+        return ""
+    return ' -filter_complex "%s" -vsync 0 ' % studio_filter
+
+
+def get_studio_filter(sources, presenter):
+    """Get the filter graph compositing the studio sources and its height."""
+    if len(sources) == 1:
+        return "[0:v:0]null", get_height(get_source_info(sources[0]))
+    return get_composite_filter(
+        get_height(get_source_info(sources[0])),
+        get_height(get_source_info(sources[1])),
+        presenter,
+    )
+
+
+def get_studio_audio_map(sources):
+    """Map the audio stream with the most channels, as ffmpeg does without map."""
+    channels = []
+    for source in sources:
+        streams = get_source_info(source, "-select_streams a:0 ").get("streams", [])
+        channels.append(streams[0].get("channels", 0) if streams else 0)
+    if max(channels) == 0:
+        return ""
+    return "-map %s:a:0" % channels.index(max(channels))
 
 
 def get_height(info):
@@ -186,3 +255,36 @@ def launch_encode_video_studio(input_video, subtime, subcmd, video_output):
         print(ffmpegstudio.stdout)
         print(ffmpegstudio.stderr)
     return msg
+
+
+def launch_encode_studio_single_pass(
+    input_video, sources, subtime, presenter, video_output
+):
+    """Composite the studio sources once into the source file and the renditions.
+
+    Returns:
+        tuple: the message and the directory of the renditions,
+        empty if the encoding failed.
+    """
+    studio_filter, height = get_studio_filter(sources, presenter)
+    encoding_video = Encoding_video(0, video_output)
+    encoding_video.list_video_track = {"0": {"width": 0, "height": height}}
+    encoding_video.output_dir = os.path.splitext(video_output)[0] + "_renditions"
+    os.makedirs(encoding_video.output_dir, exist_ok=True)
+    ffmpegStudioCommand = encoding_video.get_studio_command(
+        input_video, studio_filter, subtime, get_studio_audio_map(sources)
+    )
+    msg = "- %s\n" % ffmpegStudioCommand
+    return_value, return_msg = launch_cmd(ffmpegStudioCommand)
+    logfile = video_output.replace(".mp4", ".log")
+    with open(logfile, "a") as f:
+        f.write("\nffmpegstudio:\n\n")
+        f.write(return_msg)
+    msg += "\n- Encoding Mp4 and renditions: %s" % time.ctime()
+    if DEBUG:
+        print(msg)
+        print(return_msg)
+    if not return_value:
+        shutil.rmtree(encoding_video.output_dir, ignore_errors=True)
+        return msg, ""
+    return msg, encoding_video.output_dir
@@ -1,14 +1,51 @@
 import subprocess
 import shlex
 import json
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from timeit import default_timer as timer
 import os
 
 try:
-    from .encoding_settings import VIDEO_RENDITIONS
+    from .encoding_settings import (
+        VIDEO_RENDITIONS,
+        FFMPEG_LOG_MAX_LINES,
+        FFMPEG_PROGRESS_INTERVAL,
+    )
 except (ImportError, ValueError):
-    from encoding_settings import VIDEO_RENDITIONS
+    from encoding_settings import (
+        VIDEO_RENDITIONS,
+        FFMPEG_LOG_MAX_LINES,
+        FFMPEG_PROGRESS_INTERVAL,
+    )
+
+try:
+    from django.conf import settings
+    from django.core.exceptions import ImproperlyConfigured
+except ImportError:  # pragma: no cover
+    settings = None
+
+try:
+    FFMPEG_LOG_MAX_LINES = getattr(settings, "FFMPEG_LOG_MAX_LINES", FFMPEG_LOG_MAX_LINES)
+    FFMPEG_PROGRESS_INTERVAL = getattr(
+        settings, "FFMPEG_PROGRESS_INTERVAL", FFMPEG_PROGRESS_INTERVAL
+    )
+except ImproperlyConfigured:  # pragma: no cover
+    # launched outside of Pod by the remote encoding script
+    pass
+
+# keys written by ffmpeg -progress, not kept in the log
+PROGRESS_KEYS = (
+    "frame",
+    "fps",
+    "stream_",
+    "bitrate",
+    "total_size",
+    "out_time",
+    "dup_frames",
+    "drop_frames",
+    "speed",
+    "progress",
+)
 
 
 def get_renditions():
@@ -60,29 +97,108 @@ def get_info_from_video(probe_cmd):
     return info, msg
 
 
-def launch_cmd(cmd):
+class EncodingProgress:
+    """Parse ffmpeg -progress output and publish it at a bounded rate."""
+
+    def __init__(self, callback, duration):
+        """Initialize a new EncodingProgress object."""
+        self.callback = callback
+        self.duration = duration
+        self.percent = 0
+        self.fps = 0
+        self.last_publish = timer()
+
+    def parse_line(self, line):
+        """
+        Read one line of ffmpeg output.
+
+        Returns:
+            bool: True if the line was a progress line.
+        """
+        key, sep, value = line.strip().partition("=")
+        if not sep or " " in key + value or not key.startswith(PROGRESS_KEYS):
+            return False
+        handler = {
+            "fps": self.set_fps,
+            "out_time_us": self.set_out_time,
+            "progress": self.publish,
+        }.get(key)
+        if handler:
+            handler(value)
+        return True
+
+    def set_fps(self, value):
+        """Store the current encoding speed in frames per second."""
+        try:
+            self.fps = float(value)
+        except ValueError:
+            pass
+
+    def set_out_time(self, value):
+        """Compute the percentage from the current output time in microseconds."""
+        try:
+            if self.duration > 0:
+                percent = int(value) / (self.duration * 10000)
+                self.percent = max(0, min(100, int(percent)))
+        except ValueError:
+            pass
+
+    def publish(self, value):
+        """Call the callback at the end of a progress block if enough time passed."""
+        now = timer()
+        if value == "end" or now - self.last_publish >= FFMPEG_PROGRESS_INTERVAL:
+            self.last_publish = now
+            self.callback(100 if value == "end" else self.percent, self.fps)
+
+
+def read_output(process, output_lines, encoding_progress):
+    """Read process output, keep log lines and parse progress lines."""
+    nb_lines = 0
+    for line in process.stdout:
+        if encoding_progress and encoding_progress.parse_line(line):
+            continue
+        nb_lines += 1
+        output_lines.append(line.rstrip("\n"))
+    return nb_lines
+
+
+def launch_cmd(cmd, progress=None, duration=0):
+    """
+    Launch a command and return its result and a bounded log.
+
+    Only the last FFMPEG_LOG_MAX_LINES lines of output are kept.
+    If progress is given, ffmpeg is launched with -progress and
+    progress(percent, fps) is called every FFMPEG_PROGRESS_INTERVAL seconds.
+    """
     if cmd == "":
         return False, "No cmd to launch"
     msg = ""
     encode_start = timer()
     return_value = False
     try:
-        output = subprocess.run(
-            shlex.split(cmd),
+        args = shlex.split(cmd)
+        encoding_progress = None
+        if progress is not None:
+            args[1:1] = ["-progress", "pipe:1", "-nostats"]
+            encoding_progress = EncodingProgress(progress, duration)
+        output_lines = deque(maxlen=FFMPEG_LOG_MAX_LINES)
+        with subprocess.Popen(
+            args,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-        )
+            encoding="utf-8",
+            errors="replace",
+        ) as process:
+            nb_lines = read_output(process, output_lines, encoding_progress)
         encode_end = timer() - encode_start
         msg += cmd + "\n"
         msg += "Encode file in {:.3}s.\n".format(encode_end)
-        # msg += "\n".join(output.stdout.decode().split('\n'))
-        try:
-            msg += output.stdout.decode("utf-8")
-        except UnicodeDecodeError:
-            pass
+        if nb_lines > len(output_lines):
+            msg += "[%s first lines skipped]\n" % (nb_lines - len(output_lines))
+        msg += "\n".join(output_lines)
         msg += "\n"
-        if output.returncode != 0:
-            msg += "ERROR RETURN CODE %s for command %s" % (output.returncode, cmd)
+        if process.returncode != 0:
+            msg += "ERROR RETURN CODE %s for command %s" % (process.returncode, cmd)
         else:
             return_value = True
     except (subprocess.CalledProcessError, OSError) as e:
@@ -9,7 +9,8 @@ from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator
 from django.contrib.sites.models import Site
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.signals import post_save, post_delete
 from pod.video.models import Video
 from pod.video.utils import get_storage_path_video
 
@@ -441,3 +442,58 @@ class PlaylistVideo(models.Model):
             if os.path.isfile(self.source_file.path):
                 os.remove(self.source_file.path)
         super(PlaylistVideo, self).delete()
+
+
+def get_encoded_videos_filter():
+    """Return the filter of the videos with an mp4, HLS playlist or audio encoding."""
+    return (
+        Q(
+            Exists(
+                EncodingVideo.objects.filter(
+                    video=OuterRef("pk"), encoding_format="video/mp4"
+                )
+            )
+        )
+        | Q(
+            Exists(
+                PlaylistVideo.objects.filter(
+                    video=OuterRef("pk"),
+                    name="playlist",
+                    encoding_format="application/x-mpegURL",
+                )
+            )
+        )
+        | Q(
+            Exists(
+                EncodingAudio.objects.filter(
+                    video=OuterRef("pk"), name="audio", encoding_format="video/mp4"
+                )
+            )
+        )
+    )
+
+
+def update_videos_encoded(videos):
+    """Store the encoded state of the videos, computed from their encodings.
+
+    Return the number of videos whose state changed.
+    """
+    encoded_filter = get_encoded_videos_filter()
+    updated = (
+        videos.filter(is_encoded=False).filter(encoded_filter).update(is_encoded=True)
+    )
+    updated += (
+        videos.filter(is_encoded=True).exclude(encoded_filter).update(is_encoded=False)
+    )
+    return updated
+
+
+@receiver(post_save, sender=EncodingVideo)
+@receiver(post_save, sender=EncodingAudio)
+@receiver(post_save, sender=PlaylistVideo)
+@receiver(post_delete, sender=EncodingVideo)
+@receiver(post_delete, sender=EncodingAudio)
+@receiver(post_delete, sender=PlaylistVideo)
+def update_video_encoded(sender, instance, **kwargs):
+    """Keep the encoded state of the video up to date with its encodings."""
+    update_videos_encoded(Video.objects.filter(id=instance.video_id))
@@ -0,0 +1,94 @@
+"""Chunked encoding Test Case."""
+
+from django.test import TestCase
+from unittest import mock
+
+from pod.video_encode_transcript import Encoding_video as encoding_module
+from pod.video_encode_transcript.Encoding_video import Encoding_video
+
+import os
+import tempfile
+
+
+class ChunkCommandTestCase(TestCase):
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def setUp(self):
+        """Create an encoding video of one hour with a cut."""
+        self.encoding_video = Encoding_video(1, "/tmp/test.mp4", 5, 3605)
+        self.encoding_video.list_video_track = {"0": {"width": 1280, "height": 720}}
+        self.encoding_video.list_audio_track = {"1": {"sample_rate": 48000}}
+        self.encoding_video.duration = 3600
+        self.encoding_video.output_dir = tempfile.mkdtemp()
+
+    @mock.patch.object(encoding_module, "FFMPEG_CHUNK_DURATION", 1000)
+    def test_get_chunks(self):
+        """Test that the chunks are cut on the keyframes."""
+        keyframes = [0.0, 4.0, 1006.2, 1500.0, 2006.2, 3006.0, 3604.0]
+        with mock.patch.object(Encoding_video, "get_keyframes", return_value=keyframes):
+            chunks = self.encoding_video.get_chunks()
+        self.assertEqual(
+            chunks,
+            [(5.0, 1006.2), (1006.2, 2006.2), (2006.2, 3006.0), (3006.0, 3605.0)],
+        )
+        with mock.patch.object(Encoding_video, "get_keyframes", return_value=[]):
+            chunks = self.encoding_video.get_chunks()
+        self.assertEqual(chunks[0], (5.0, 1005.0))
+        self.assertEqual(chunks[-1], (3005.0, 3605.0))
+        print(" --->  test_get_chunks of ChunkCommandTestCase: OK!")
+
+    def test_chunk_and_concat_commands(self):
+        """Test that the chunks are joined in the files expected by store_json_info."""
+        renditions = self.encoding_video.get_single_pass_renditions()
+        command = self.encoding_video.get_chunk_command(renditions, 1, 1006.2, 2006.2)
+        self.assertIn("-ss 1006.2 -to 2006.2 -i", command)
+        self.assertIn("720p_chunk_0001.mp4", command)
+        for rend, height, with_mp4, with_hls in renditions:
+            self.encoding_video.get_concat_command(rend, height, with_mp4, with_hls, 3)
+        output_dir = self.encoding_video.output_dir
+        self.assertEqual(
+            self.encoding_video.list_mp4_files,
+            {
+                360: os.path.join(output_dir, "360p.mp4"),
+                720: os.path.join(output_dir, "720p.mp4"),
+            },
+        )
+        self.assertEqual(
+            self.encoding_video.list_hls_files,
+            {
+                360: os.path.join(output_dir, "360p.m3u8"),
+                720: os.path.join(output_dir, "720p.m3u8"),
+            },
+        )
+        with open(os.path.join(output_dir, "720p_chunks.txt")) as concat_file:
+            self.assertEqual(len(concat_file.readlines()), 3)
+        self.encoding_video.remove_chunk_files(renditions, 3)
+        self.assertEqual(os.listdir(output_dir), [])
+        os.rmdir(output_dir)
+        print(" --->  test_chunk_and_concat_commands of ChunkCommandTestCase: OK!")
+
+    @mock.patch.object(encoding_module, "FFMPEG_CHUNK_DURATION", 1000)
+    def test_failed_chunk(self):
+        """Test that a failed chunk is an encoding error and images use the source."""
+        chunks = [(5.0, 1006.2), (1006.2, 2006.2), (2006.2, 3605.0)]
+        results = [(True, ""), (False, "chunk error"), (True, "")]
+        with mock.patch.object(
+            Encoding_video, "get_chunks", return_value=chunks
+        ), mock.patch.object(
+            Encoding_video, "launch_chunk_commands", return_value=results
+        ), mock.patch.object(
+            encoding_module, "launch_cmd"
+        ) as launch_cmd:
+            self.encoding_video.encode_video_chunks()
+        launch_cmd.assert_not_called()
+        self.assertTrue(self.encoding_video.error_encoding)
+        self.assertEqual(self.encoding_video.list_mp4_files, {})
+        self.assertFalse(self.encoding_video.encoding_log["chunk_command_1"]["result"])
+        command = self.encoding_video.get_create_thumbnail_command()
+        self.assertIn('-i "/tmp/test.mp4"', command)
+        command = self.encoding_video.get_create_overview_command(133, 75)
+        self.assertIn('-i "/tmp/test.mp4"', command)
+        os.rmdir(self.encoding_video.output_dir)
+        print(" --->  test_failed_chunk of ChunkCommandTestCase: OK!")
@@ -0,0 +1,43 @@
+"""Encoding utils Test Case."""
+
+from django.test import TestCase
+from unittest import mock
+
+from pod.video_encode_transcript import encoding_utils
+from pod.video_encode_transcript.encoding_utils import EncodingProgress, launch_cmd
+
+import sys
+
+
+class LaunchCmdTestCase(TestCase):
+    def test_bounded_log(self):
+        """Test that only the last lines of the output are kept."""
+        cmd = "%s -c \"for i in range(1000): print('line %%s' %% i)\"" % sys.executable
+        with mock.patch.object(encoding_utils, "FFMPEG_LOG_MAX_LINES", 10):
+            return_value, return_msg = launch_cmd(cmd)
+        self.assertTrue(return_value)
+        self.assertIn("[990 first lines skipped]", return_msg)
+        self.assertIn("line 999", return_msg)
+        self.assertNotIn("line 989\n", return_msg)
+        print(" --->  test_bounded_log of LaunchCmdTestCase: OK!")
+
+    def test_return_code(self):
+        """Test that an error return code is reported."""
+        return_value, return_msg = launch_cmd('%s -c "exit(3)"' % sys.executable)
+        self.assertFalse(return_value)
+        self.assertIn("ERROR RETURN CODE 3", return_msg)
+        print(" --->  test_return_code of LaunchCmdTestCase: OK!")
+
+    def test_encoding_progress(self):
+        """Test that ffmpeg progress lines are parsed and not logged."""
+        published = []
+        encoding_progress = EncodingProgress(
+            lambda percent, fps: published.append((percent, fps)), 200
+        )
+        with mock.patch.object(encoding_utils, "FFMPEG_PROGRESS_INTERVAL", 0):
+            for line in ["fps=25.5", "out_time_us=50000000", "progress=continue"]:
+                self.assertTrue(encoding_progress.parse_line(line))
+            self.assertFalse(encoding_progress.parse_line("frame= 10 fps=25 q=28.0"))
+            encoding_progress.parse_line("progress=end")
+        self.assertEqual(published, [(25, 25.5), (100, 25.5)])
+        print(" --->  test_encoding_progress of LaunchCmdTestCase: OK!")
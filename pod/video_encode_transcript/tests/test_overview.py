@@ -0,0 +1,41 @@
+"""Overview sprite Test Case."""
+
+from django.test import TestCase
+from unittest import mock
+
+from pod.video_encode_transcript import Encoding_video as encoding_module
+from pod.video_encode_transcript.Encoding_video import Encoding_video
+
+
+class OverviewCommandTestCase(TestCase):
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def setUp(self):
+        """Create an encoding video with a 360p mp4 file."""
+        self.encoding_video = Encoding_video(1, "/tmp/test.mp4")
+        self.encoding_video.list_video_track = {"0": {"width": 1280, "height": 720}}
+        self.encoding_video.output_dir = "/tmp/0001"
+        self.encoding_video.list_mp4_files = {360: "/tmp/0001/360p.mp4"}
+
+    def test_overview_grid(self):
+        """Test the size of the overview grid."""
+        self.encoding_video.duration = 60
+        self.assertEqual(self.encoding_video.get_overview_grid(), (10, 10, 1))
+        self.encoding_video.duration = 3600
+        self.assertEqual(self.encoding_video.get_overview_grid(), (100, 10, 10))
+        with mock.patch.object(encoding_module, "FFMPEG_OVERVIEW_ROWS", 20):
+            self.assertEqual(self.encoding_video.get_overview_grid(), (200, 10, 20))
+        print(" --->  test_overview_grid of OverviewCommandTestCase: OK!")
+
+    def test_create_overview_command(self):
+        """Test that all the overview images are extracted by one command."""
+        self.encoding_video.duration = 3600
+        with mock.patch.object(encoding_module, "check_file", return_value=True):
+            command = self.encoding_video.get_create_overview_command(133, 75)
+        self.assertIn('-i "/tmp/0001/360p.mp4"', command)
+        self.assertIn("fps=100/3600,scale=133:75,tile=10x10", command)
+        self.assertIn('"/tmp/0001/overview.png"', command)
+        self.assertEqual(self.encoding_video.get_overview_time(3599.5), "00:59:59.500")
+        print(" --->  test_create_overview_command of OverviewCommandTestCase: OK!")
@@ -0,0 +1,400 @@
+"""Single pass encoding Test Case."""
+
+from django.test import TestCase
+from unittest import mock, skipUnless
+
+from pod.video_encode_transcript import Encoding_video as encoding_module
+from pod.video_encode_transcript import encoding_studio
+from pod.video_encode_transcript.Encoding_video import Encoding_video
+
+import json
+import os
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+from types import SimpleNamespace
+
+HAS_FFMPEG = bool(shutil.which("ffmpeg")) and bool(shutil.which("ffprobe"))
+# Set POD_ENCODE_BENCHMARK=1 to compare single pass and two pass encoding.
+RUN_BENCHMARK = os.environ.get("POD_ENCODE_BENCHMARK", "") != "" and bool(
+    shutil.which("ffmpeg")
+)
+
+
+def get_encoding_video(video_file, height=720):
+    """Get an Encoding_video with a video and an audio track."""
+    encoding_video = Encoding_video(1, video_file)
+    encoding_video.list_video_track = {"0": {"width": height * 16 // 9, "height": height}}
+    encoding_video.list_audio_track = {"1": {"sample_rate": 48000, "channels": 2}}
+    encoding_video.output_dir = encoding_video.get_output_dir()
+    return encoding_video
+
+
+class SinglePassCommandTestCase(TestCase):
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def test_single_pass_renditions(self):
+        """Test that single pass renditions match the two pass outputs."""
+        encoding_video = get_encoding_video("/tmp/test.mp4")
+        encoding_video.get_mp4_command()
+        encoding_video.get_hls_command()
+        two_pass_mp4 = dict(encoding_video.list_mp4_files)
+        two_pass_hls = dict(encoding_video.list_hls_files)
+
+        encoding_video = get_encoding_video("/tmp/test.mp4")
+        command = encoding_video.get_single_pass_command()
+        self.assertEqual(encoding_video.list_mp4_files, two_pass_mp4)
+        self.assertEqual(encoding_video.list_hls_files, two_pass_hls)
+        # one input, one decoding, one encoding per rendition
+        self.assertEqual(command.count(" -i "), 1)
+        self.assertIn("split=2[split360][split720]", command)
+        self.assertEqual(command.count("-f tee"), 2)
+        self.assertIn("master_pl_name=livestream720.m3u8", command)
+        print(" --->  test_single_pass_renditions of SinglePassCommandTestCase: OK!")
+
+    def test_single_pass_small_video(self):
+        """Test that a small video keeps its first mp4 and HLS rendition."""
+        encoding_video = get_encoding_video("/tmp/test.mp4", height=240)
+        command = encoding_video.get_single_pass_command()
+        self.assertEqual(list(encoding_video.list_mp4_files), [360])
+        self.assertEqual(list(encoding_video.list_hls_files), [360])
+        self.assertIn("scale=-2:240", command)
+        print(" --->  test_single_pass_small_video of SinglePassCommandTestCase: OK!")
+
+
+class StudioSinglePassTestCase(TestCase):
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def test_studio_command(self):
+        """Test that the studio sources are composited once for all the outputs."""
+        studio_filter, height = encoding_studio.get_composite_filter(720, 480, "pipb")
+        self.assertEqual(
+            encoding_studio.get_sub_cmd(720, 480, "pipb"),
+            ' -filter_complex "%s" -vsync 0 ' % studio_filter,
+        )
+        self.assertEqual(encoding_studio.get_sub_cmd(720, 480, "unknown"), "")
+        encoding_video = Encoding_video(0, "/tmp/studio.mp4")
+        encoding_video.list_video_track = {"0": {"width": 0, "height": height}}
+        encoding_video.output_dir = "/tmp/studio_renditions"
+        command = encoding_video.get_studio_command(
+            '-i "presentation.webm" -i "presenter.webm" ',
+            studio_filter,
+            "",
+            "-map 1:a:0",
+        )
+        self.assertEqual(command.count("-filter_complex"), 1)
+        self.assertEqual(command.count("overlay="), 1)
+        self.assertIn("[studio]split=3[source][split360][split720]", command)
+        self.assertIn('-map "[source]" -map 1:a:0', command)
+        self.assertIn('"/tmp/studio.mp4"', command)
+        self.assertEqual(command.count("-f tee"), 2)
+        self.assertEqual(
+            encoding_video.list_mp4_files[720], "/tmp/studio_renditions/720p.mp4"
+        )
+        print(" --->  test_studio_command of StudioSinglePassTestCase: OK!")
+
+    def test_studio_renditions(self):
+        """Test that the renditions of the studio are moved instead of encoded."""
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir)
+        encoding_video = get_encoding_video(os.path.join(work_dir, "studio.mp4"))
+        encoding_video.output_dir = os.path.join(work_dir, "output")
+        encoding_video.renditions_dir = os.path.join(work_dir, "renditions")
+        os.makedirs(encoding_video.output_dir)
+        os.makedirs(encoding_video.renditions_dir)
+        for filename in ["360p.mp4", "360p.m3u8", "720p.m3u8", "720p.mp4"]:
+            with open(os.path.join(encoding_video.renditions_dir, filename), "w") as f:
+                f.write("rendition")
+        with mock.patch.object(Encoding_video, "create_main_livestream") as livestream:
+            encoding_video.encode_video_part()
+        self.assertFalse(os.path.exists(encoding_video.renditions_dir))
+        self.assertEqual(
+            encoding_video.list_mp4_files[720],
+            os.path.join(encoding_video.output_dir, "720p.mp4"),
+        )
+        self.assertEqual(list(encoding_video.list_hls_files), [360, 720])
+        self.assertTrue(encoding_video.encoding_log["studio_renditions"]["result"])
+        livestream.assert_called_once()
+        print(" --->  test_studio_renditions of StudioSinglePassTestCase: OK!")
+
+
+def get_dressing(watermark=True, credits=True):
+    """Get a dressing with a watermark and opening and ending credits."""
+    return SimpleNamespace(
+        watermark=watermark,
+        opening_credits=credits,
+        ending_credits=credits,
+        opacity=50,
+        position="top_right",
+    )
+
+
+class DressingSinglePassTestCase(TestCase):
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def setUp(self):
+        patcher = mock.patch.object(
+            encoding_module,
+            "get_dressing_input",
+            return_value=' -i "logo.png" -i "debut.mp4" -i "fin.mp4"',
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_dressing_single_pass_command(self):
+        """Test that the dressing is in the filter graph of the renditions."""
+        encoding_video = get_encoding_video("/tmp/test.mp4")
+        encoding_video.dressing = get_dressing()
+        dressing_command = encoding_video.get_dressing_command()
+        dressing_filter = encoding_video.get_dressing_filter()[0]
+        self.assertIn(dressing_filter, dressing_command)
+        self.assertIn("/tmp/test_dressing.mp4", dressing_command)
+        command = encoding_video.get_dressing_single_pass_command()
+        self.assertIn('"%s;[v]split=2[split360][split720];' % dressing_filter, command)
+        self.assertIn(";[a]asplit=3[a360][a720][amp3]", command)
+        self.assertIn('-map "[a360]"', command)
+        self.assertIn('-map "[a720]"', command)
+        self.assertIn('-map "[amp3]"', command)
+        self.assertIn("libmp3lame", command)
+        self.assertEqual(command.count("-filter_complex"), 1)
+        self.assertEqual(command.count("-f tee"), 2)
+        self.assertNotIn("_dressing", command)
+        single_pass = get_encoding_video("/tmp/test.mp4")
+        single_pass.get_single_pass_command()
+        self.assertEqual(encoding_video.list_mp4_files, single_pass.list_mp4_files)
+        self.assertEqual(encoding_video.list_hls_files, single_pass.list_hls_files)
+        print(
+            " --->  test_dressing_single_pass_command"
+            + " of DressingSinglePassTestCase: OK!"
+        )
+
+    def test_watermark_single_pass_command(self):
+        """Test that the watermarked video keeps the audio of the source."""
+        encoding_video = get_encoding_video("/tmp/test.mp4")
+        encoding_video.dressing = get_dressing(credits=False)
+        self.assertNotIn("[dressed]", encoding_video.get_dressing_command())
+        command = encoding_video.get_dressing_single_pass_command()
+        self.assertIn(":36.0[dressed]", command)
+        self.assertIn(";[dressed]split=2[split360][split720]", command)
+        self.assertEqual(command.count("-map 0:a:0"), 3)
+        self.assertNotIn("asplit", command)
+        with mock.patch.object(encoding_module, "FFMPEG_DRESSING_SINGLE_PASS", True):
+            self.assertTrue(encoding_video.use_dressing_single_pass())
+            with mock.patch.object(
+                Encoding_video, "launch_encode_cmd", return_value=(False, "")
+            ) as launch_encode_cmd:
+                encoding_video.encode_video_part()
+        self.assertEqual(launch_encode_cmd.call_args[0][1], command)
+        print(
+            " --->  test_watermark_single_pass_command"
+            + " of DressingSinglePassTestCase: OK!"
+        )
+
+
+@skipUnless(HAS_FFMPEG, "ffmpeg is not installed")
+class DressingSinglePassEncodeTestCase(TestCase):
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def setUp(self):
+        """Create a clip, credits and a watermark."""
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir)
+        self.video_file = os.path.join(self.work_dir, "video.mp4")
+        credits_file = os.path.join(self.work_dir, "credits.mp4")
+        logo_file = os.path.join(self.work_dir, "logo.png")
+        for output, size, duration in [
+            (self.video_file, "640x360", 3),
+            (credits_file, "320x240", 1),
+        ]:
+            subprocess.run(
+                [
+                    "ffmpeg",
+                    "-hide_banner",
+                    "-f",
+                    "lavfi",
+                    "-i",
+                    "testsrc2=size=%s:rate=25:duration=%s" % (size, duration),
+                    "-f",
+                    "lavfi",
+                    "-i",
+                    "sine=frequency=440:duration=%s" % duration,
+                    "-c:v",
+                    "libx264",
+                    "-preset",
+                    "ultrafast",
+                    "-c:a",
+                    "aac",
+                    "-shortest",
+                    "-y",
+                    output,
+                ],
+                check=True,
+                capture_output=True,
+            )
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-f",
+                "lavfi",
+                "-i",
+                "color=white:size=64x64",
+                "-frames:v",
+                "1",
+                "-y",
+                logo_file,
+            ],
+            check=True,
+            capture_output=True,
+        )
+        patcher = mock.patch.object(
+            encoding_module,
+            "get_dressing_input",
+            return_value=' -i "%s" -i "%s" -i "%s"'
+            % (logo_file, credits_file, credits_file),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_layout(self, output_file):
+        """Get the duration and the streams of an encoded file."""
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "quiet",
+                "-show_format",
+                "-show_streams",
+                "-print_format",
+                "json",
+                output_file,
+            ],
+            check=True,
+            capture_output=True,
+        )
+        info = json.loads(result.stdout)
+        streams = [
+            (stream["codec_type"], stream.get("width"), stream.get("height"))
+            for stream in info["streams"]
+        ]
+        return float(info["format"]["duration"]), streams
+
+    def encode(self, single_pass):
+        """Encode the dressed clip and return the layout of its renditions and mp3."""
+        encoding_video = Encoding_video(1, self.video_file, dressing=get_dressing())
+        encoding_video.create_output_dir()
+        encoding_video.get_video_data()
+        with mock.patch.object(
+            encoding_module, "FFMPEG_DRESSING_SINGLE_PASS", single_pass
+        ):
+            if encoding_video.dressing and not encoding_video.use_dressing_single_pass():
+                encoding_video.encode_video_dressing()
+            encoding_video.encode_video_part()
+            encoding_video.encode_audio_part()
+        self.assertFalse(encoding_video.error_encoding)
+        self.assertEqual("mp3_command" in encoding_video.encoding_log, not single_pass)
+        layout = {
+            rend: self.get_layout(output_file)
+            for rend, output_file in encoding_video.list_mp4_files.items()
+        }
+        layout["mp3"] = self.get_layout(list(encoding_video.list_mp3_files.values())[0])
+        shutil.rmtree(encoding_video.output_dir)
+        return layout
+
+    def test_dressing_single_pass_encode(self):
+        """Test that the renditions and the mp3 match the ones of the dressed file."""
+        two_step = self.encode(False)
+        dressing_file = os.path.join(self.work_dir, "video_dressing.mp4")
+        self.assertTrue(os.path.exists(dressing_file))
+        os.remove(dressing_file)
+        single_pass = self.encode(True)
+        self.assertFalse(os.path.exists(dressing_file))
+        self.assertEqual(list(single_pass), list(two_step))
+        for rend in two_step:
+            self.assertAlmostEqual(single_pass[rend][0], two_step[rend][0], delta=0.1)
+            self.assertEqual(single_pass[rend][1], two_step[rend][1])
+        # the credits are in the mp3 too: 1s + 3s + 1s
+        self.assertAlmostEqual(single_pass["mp3"][0], 5, delta=0.2)
+        print(
+            " --->  test_dressing_single_pass_encode"
+            + " of DressingSinglePassEncodeTestCase: OK!"
+        )
+
+
+@skipUnless(RUN_BENCHMARK, "Encoding benchmark is disabled")
+class SinglePassBenchmarkTestCase(TestCase):
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def setUp(self):
+        """Create a synthetic clip."""
+        self.work_dir = tempfile.mkdtemp()
+        self.video_file = os.path.join(self.work_dir, "synthetic.mp4")
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-f",
+                "lavfi",
+                "-i",
+                "testsrc2=size=1280x720:rate=25:duration=30",
+                "-f",
+                "lavfi",
+                "-i",
+                "sine=frequency=440:duration=30",
+                "-c:v",
+                "libx264",
+                "-preset",
+                "ultrafast",
+                "-c:a",
+                "aac",
+                "-shortest",
+                "-y",
+                self.video_file,
+            ],
+            check=True,
+            capture_output=True,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def encode(self, single_pass):
+        """Encode the synthetic clip and return wall time and CPU seconds."""
+        encoding_video = Encoding_video(1, self.video_file)
+        encoding_video.create_output_dir()
+        encoding_video.get_video_data()
+        usage_start = resource.getrusage(resource.RUSAGE_CHILDREN)
+        start = time.perf_counter()
+        with mock.patch.object(encoding_module, "FFMPEG_SINGLE_PASS_ENCODE", single_pass):
+            encoding_video.encode_video_part()
+        wall_time = time.perf_counter() - start
+        usage_end = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu_time = (usage_end.ru_utime - usage_start.ru_utime) + (
+            usage_end.ru_stime - usage_start.ru_stime
+        )
+        self.assertFalse(encoding_video.error_encoding)
+        shutil.rmtree(encoding_video.output_dir)
+        return wall_time, cpu_time
+
+    def test_benchmark_single_pass(self):
+        """Compare the single pass encoding to the two pass encoding."""
+        two_pass_wall, two_pass_cpu = self.encode(False)
+        single_pass_wall, single_pass_cpu = self.encode(True)
+        print("\n ---> Two pass: %.2fs wall, %.2fs CPU" % (two_pass_wall, two_pass_cpu))
+        print(
+            " ---> Single pass: %.2fs wall, %.2fs CPU"
+            % (single_pass_wall, single_pass_cpu)
+        )
+        print(" ---> CPU ratio: %.2f" % (single_pass_cpu / two_pass_cpu))
+        self.assertLess(single_pass_cpu, two_pass_cpu)
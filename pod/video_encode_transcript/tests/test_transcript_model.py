@@ -0,0 +1,202 @@
+"""Transcription model cache Test Case."""
+
+from django.test import TestCase
+from unittest import mock, skipUnless
+
+from pod.video_encode_transcript import transcript_model
+
+import numpy as np
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Set POD_TRANSCRIPT_BENCHMARK to an audio file, with the transcription settings
+# of its lang (POD_TRANSCRIPT_BENCHMARK_LANG), to compare the numbers of workers.
+BENCHMARK_AUDIO = os.environ.get("POD_TRANSCRIPT_BENCHMARK", "")
+BENCHMARK_LANG = os.environ.get("POD_TRANSCRIPT_BENCHMARK_LANG", "fr")
+
+MODEL_PARAM = {
+    "VOSK": {
+        "fr": {"model": "/path/of/vosk/model_fr"},
+        "en": {"model": "/path/of/vosk/model_en"},
+    }
+}
+
+
+@mock.patch.object(transcript_model, "TRANSCRIPTION_TYPE", "VOSK", create=True)
+@mock.patch.object(transcript_model, "TRANSCRIPTION_MODEL_PARAM", MODEL_PARAM)
+@mock.patch.object(transcript_model, "get_available_memory", return_value=None)
+@mock.patch.object(
+    transcript_model, "load_model", side_effect=lambda lang: "model_%s" % lang
+)
+class ModelCacheTestCase(TestCase):
+    def setUp(self):
+        """Empty the models cache of the process."""
+        transcript_model.transcription_models.clear()
+        transcript_model.transcription_models_stats.update({"hits": 0, "misses": 0})
+
+    def test_model_cache_hit(self, load_model, get_available_memory):
+        """Test that a model is loaded once for several transcriptions."""
+        model, msg = transcript_model.get_model("fr")
+        self.assertEqual(model, "model_fr")
+        self.assertIn("cache miss", msg)
+        model, msg = transcript_model.get_model("fr")
+        self.assertEqual(model, "model_fr")
+        self.assertIn("cache hit", msg)
+        self.assertIn("hits: 1, misses: 1", msg)
+        load_model.assert_called_once_with("fr")
+        print(" --->  test_model_cache_hit of ModelCacheTestCase: OK!")
+
+    @mock.patch.object(transcript_model, "TRANSCRIPTION_MODEL_CACHE_SIZE", 1)
+    def test_model_cache_lru(self, load_model, get_available_memory):
+        """Test that the least recently used model is evicted."""
+        transcript_model.get_model("fr")
+        model, msg = transcript_model.get_model("en")
+        self.assertIn("Evict transcription model /path/of/vosk/model_fr", msg)
+        self.assertEqual(
+            list(transcript_model.transcription_models),
+            [("VOSK", "en", "/path/of/vosk/model_en")],
+        )
+        print(" --->  test_model_cache_lru of ModelCacheTestCase: OK!")
+
+    @mock.patch.object(transcript_model, "TRANSCRIPTION_MODEL_CACHE_SIZE", 2)
+    def test_model_cache_memory(self, load_model, get_available_memory):
+        """Test that models are evicted when the available memory is low."""
+        transcript_model.get_model("fr")
+        transcript_model.get_model("en")
+        transcript_model.get_model("fr")
+        self.assertEqual(len(transcript_model.transcription_models), 2)
+        get_available_memory.return_value = 100
+        with mock.patch.object(transcript_model, "get_model_key") as get_model_key:
+            get_model_key.return_value = ("VOSK", "de", "/path/of/vosk/model_de")
+            model, msg = transcript_model.get_model("de")
+        # the two cached models are evicted, the least recently used first
+        self.assertLess(msg.index("model_en"), msg.index("model_fr"))
+        self.assertEqual(len(transcript_model.transcription_models), 1)
+        print(" --->  test_model_cache_memory of ModelCacheTestCase: OK!")
+
+
+class AudioWindowsTestCase(TestCase):
+    def get_windows(self, window_duration, overlap=0):
+        """Get the windows of 10.5 seconds of audio at 100 Hz, sample i is i."""
+        popen = subprocess.Popen
+        script = "import sys; sys.stdout.buffer.write(b''.join("
+        script += "i.to_bytes(2, 'little') for i in range(1050)))"
+        with mock.patch.object(
+            transcript_model.subprocess,
+            "Popen",
+            side_effect=lambda args, **kwargs: popen(
+                [sys.executable, "-c", script], **kwargs
+            ),
+        ) as mock_popen:
+            windows = list(
+                transcript_model.get_audio_windows(
+                    "/tmp/audio.mp3", 100, window_duration, overlap
+                )
+            )
+        mock_popen.assert_called_once()
+        return [(start, list(audio[[0, -1]]), len(audio)) for start, audio in windows]
+
+    def test_audio_windows(self):
+        """Test that the audio is cut in windows from a single decoding."""
+        self.assertEqual(
+            self.get_windows(4),
+            [(0, [0, 399], 400), (4, [400, 799], 400), (8, [800, 1049], 250)],
+        )
+        print(" --->  test_audio_windows of AudioWindowsTestCase: OK!")
+
+    def test_audio_windows_overlap(self):
+        """Test that each window contains the overlap following it."""
+        self.assertEqual(
+            self.get_windows(4, 2),
+            [(0, [0, 599], 600), (4, [400, 999], 600), (8, [800, 1049], 250)],
+        )
+        self.assertEqual(
+            self.get_windows(5.25, 2), [(0, [0, 724], 725), (5.25, [525, 1049], 525)]
+        )
+        print(" --->  test_audio_windows_overlap of AudioWindowsTestCase: OK!")
+
+
+def get_window_captions(transript_model, start_trim, audio):
+    """Get two captions for a window, the first windows being the slowest."""
+    time.sleep((40 - start_trim) / 100)
+    return [
+        (start_trim + 1, start_trim + 6, "window %s" % start_trim),
+        (start_trim + 5, start_trim + 9, "end of window %s" % start_trim),
+    ]
+
+
+def init_test_worker(lang):
+    """Start a transcription worker without loading a model."""
+
+
+def transcript_test_window(lang, start_trim, audio):
+    """Transcript a window in a worker process, which does not see the mocks."""
+    return get_window_captions("model", start_trim, audio)
+
+
+@mock.patch.object(transcript_model, "TRANSCRIPTION_TYPE", "VOSK", create=True)
+@mock.patch.object(transcript_model, "init_transcription_worker", init_test_worker)
+@mock.patch.object(transcript_model, "transcript_window", transcript_test_window)
+@mock.patch.object(
+    transcript_model,
+    "get_audio_windows",
+    return_value=[(start, np.zeros(10, np.int16)) for start in (0, 10, 20, 30)],
+)
+class ParallelTranscriptTestCase(TestCase):
+    @mock.patch.object(transcript_model, "TRANSCRIPTION_WORKERS", 3)
+    def test_parallel_transcript(self, *mocks):
+        """Test that the captions of the windows are merged in order."""
+        results = []
+        # a deadlock of the pool fails the test instead of stopping the tests
+        transcription = threading.Thread(
+            target=lambda: results.append(
+                transcript_model.start_transcripting("/tmp/audio.mp3", 40, "fr")
+            ),
+            daemon=True,
+        )
+        transcription.start()
+        transcription.join(timeout=60)
+        self.assertFalse(transcription.is_alive(), "The transcription did not end")
+        msg, webvtt = results[0]
+        self.assertIn("Running inference on 3 workers.", msg)
+        self.assertEqual(
+            [caption.text for caption in webvtt.captions][:3],
+            ["window 0", "end of window 0", "window 10"],
+        )
+        self.assertEqual(len(webvtt.captions), 8)
+        # the end of a caption is moved to the start of the next one
+        self.assertEqual(webvtt.captions[0].end, "00:00:05.000")
+        self.assertEqual(webvtt.captions[1].end, "00:00:09.000")
+        print(" --->  test_parallel_transcript of ParallelTranscriptTestCase: OK!")
+
+
+@skipUnless(
+    BENCHMARK_AUDIO and transcript_model.USE_TRANSCRIPTION,
+    "Transcription benchmark is disabled",
+)
+class ParallelTranscriptBenchmarkTestCase(TestCase):
+    def test_benchmark_workers(self):
+        """Compare the transcription time according to the number of workers."""
+        transcript_model.get_model(BENCHMARK_LANG)
+        durations = {}
+        print()
+        for workers in (1, 2, 4, 8):
+            with mock.patch.object(transcript_model, "TRANSCRIPTION_WORKERS", workers):
+                start = time.perf_counter()
+                msg, webvtt = transcript_model.start_transcripting(
+                    BENCHMARK_AUDIO, 0, BENCHMARK_LANG
+                )
+                durations[workers] = time.perf_counter() - start
+            print(
+                " ---> %s workers: %.2fs, speed-up: %.2f, %s captions"
+                % (
+                    workers,
+                    durations[workers],
+                    durations[1] / durations[workers],
+                    len(webvtt.captions),
+                )
+            )
+        self.assertLess(durations[2], durations[1])
@@ -62,7 +62,7 @@ log = logging.getLogger(__name__)
 """
 TO TEST IN THE SHELL -->
 from pod.video.transcript import *
-stt_model = get_model("fr")
+stt_model, msg = get_model("fr")
 msg, webvtt, all_text = main_stt_transcript(
     "/test/audio_192k_pod.mp3", # file
     177, # file duration
@@ -2,12 +2,16 @@ import numpy as np
 import shlex
 import subprocess
 import json
+import gc
+import threading
 
 import sys
 import os
 from timeit import default_timer as timer
 import datetime as dt
 from datetime import timedelta
+from collections import OrderedDict, deque
+from billiard import get_context
 
 from webvtt import WebVTT, Caption
 
@@ -51,11 +55,135 @@ TRANSCRIPTION_STT_SENTENCE_MAX_LENGTH = getattr(
 TRANSCRIPTION_STT_SENTENCE_BLANK_SPLIT_TIME = getattr(
     settings_local, "TRANSCRIPTION_STT_SENTENCE_BLANK_SPLIT_TIME", 0.5
 )
+# number of transcription models kept in memory by each worker process
+TRANSCRIPTION_MODEL_CACHE_SIZE = getattr(
+    settings_local, "TRANSCRIPTION_MODEL_CACHE_SIZE", 1
+)
+# cached models are evicted when the available memory (in MB) is below this value
+TRANSCRIPTION_MODEL_CACHE_MIN_MEMORY = getattr(
+    settings_local, "TRANSCRIPTION_MODEL_CACHE_MIN_MEMORY", 2048
+)
+# number of processes transcribing the audio windows in parallel (Vosk and Whisper)
+TRANSCRIPTION_WORKERS = getattr(settings_local, "TRANSCRIPTION_WORKERS", 1)
+TRANSCRIPTION_MODEL_WARM_UP = getattr(
+    settings_local, "TRANSCRIPTION_MODEL_WARM_UP", False
+)
 log = logging.getLogger(__name__)
 
+# models loaded in this process, the least recently used first
+transcription_models = OrderedDict()
+transcription_models_stats = {"hits": 0, "misses": 0}
+transcription_models_lock = threading.Lock()
+
+
+def get_model_key(lang):
+    """Get the cache key of the model used to transcript the lang."""
+    return (
+        TRANSCRIPTION_TYPE,
+        lang,
+        TRANSCRIPTION_MODEL_PARAM[TRANSCRIPTION_TYPE][lang]["model"],
+    )
+
+
+def get_available_memory():
+    """Get the available memory in MB, None if it can not be read."""
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def evict_models():
+    """Remove the least recently used models to make room for a new one."""
+    msg = ""
+    while transcription_models:
+        available_memory = get_available_memory()
+        if len(transcription_models) < TRANSCRIPTION_MODEL_CACHE_SIZE and (
+            available_memory is None
+            or available_memory >= TRANSCRIPTION_MODEL_CACHE_MIN_MEMORY
+        ):
+            break
+        key, model = transcription_models.popitem(last=False)
+        del model
+        gc.collect()
+        msg += "\nEvict transcription model %s (available memory: %s MB)." % (
+            key[2],
+            available_memory,
+        )
+    return msg
+
 
 def get_model(lang):
-    """Get model for STT or Vosk software to transcript audio."""
+    """
+    Get model for STT, Vosk or Whisper software to transcript audio.
+
+    The model is loaded once and kept in memory by the worker process,
+    up to TRANSCRIPTION_MODEL_CACHE_SIZE models.
+
+    Returns:
+        tuple: the model and a message with the cache and load time metrics.
+    """
+    key = get_model_key(lang)
+    with transcription_models_lock:
+        if key in transcription_models:
+            transcription_models.move_to_end(key)
+            transcription_models_stats["hits"] += 1
+            msg = "\nTranscription model %s: cache hit" % key[2]
+            return transcription_models[key], msg + get_model_stats()
+        transcription_models_stats["misses"] += 1
+        msg = evict_models()
+        model_load_start = timer()
+        transript_model = load_model(lang)
+        model_load_end = timer() - model_load_start
+        msg += "\nTranscription model %s: cache miss, loaded in %0.3fs" % (
+            key[2],
+            model_load_end,
+        )
+        if TRANSCRIPTION_MODEL_CACHE_SIZE > 0:
+            transcription_models[key] = transript_model
+        return transript_model, msg + get_model_stats()
+
+
+def get_model_stats():
+    """Get the cache metrics of the models of this process."""
+    return " (hits: %s, misses: %s, models in cache: %s)." % (
+        transcription_models_stats["hits"],
+        transcription_models_stats["misses"],
+        len(transcription_models),
+    )
+
+
+def warm_up_models():
+    """Load the models of the langs set in TRANSCRIPTION_MODEL_PARAM."""
+    langs = list(TRANSCRIPTION_MODEL_PARAM[TRANSCRIPTION_TYPE])
+    for lang in langs[:TRANSCRIPTION_MODEL_CACHE_SIZE]:
+        try:
+            transript_model, msg = get_model(lang)
+            log.info(msg)
+        except Exception as exc:
+            log.error("Unable to load transcription model of %s: %s" % (lang, exc))
+
+
+def start_warm_up_models():
+    """Load the transcription models in background when a worker process starts."""
+    if USE_TRANSCRIPTION and TRANSCRIPTION_MODEL_WARM_UP:
+        # a task waits on the lock of get_model until its model is loaded
+        threading.Thread(target=warm_up_models, daemon=True).start()
+
+
+def load_model(lang):
+    """Load model for STT, Vosk or Whisper software to transcript audio."""
+    if TRANSCRIPTION_TYPE == "WHISPER":
+        return whisper.load_model(
+            TRANSCRIPTION_MODEL_PARAM[TRANSCRIPTION_TYPE][lang]["model"],
+            download_root=TRANSCRIPTION_MODEL_PARAM[TRANSCRIPTION_TYPE][lang][
+                "download_root"
+            ],
+        )
     transript_model = Model(TRANSCRIPTION_MODEL_PARAM[TRANSCRIPTION_TYPE][lang]["model"])
     if TRANSCRIPTION_TYPE == "STT":
         if TRANSCRIPTION_MODEL_PARAM[TRANSCRIPTION_TYPE][lang].get("beam_width"):
@@ -93,13 +221,20 @@ def start_transcripting(mp3filepath, duration, lang):
     """
     if TRANSCRIPTION_NORMALIZE:
         mp3filepath = normalize_mp3(mp3filepath)
-    if TRANSCRIPTION_TYPE == "WHISPER":
-        msg, webvtt, all_text = main_whisper_transcript(mp3filepath, duration, lang)
+    if TRANSCRIPTION_WORKERS > 1 and TRANSCRIPTION_TYPE in ("VOSK", "WHISPER"):
+        # the models are loaded by the worker processes
+        msg, webvtt, all_text = main_parallel_transcript(mp3filepath, lang)
     else:
-        transript_model = get_model(lang)
-        msg, webvtt, all_text = start_main_transcript(
-            mp3filepath, duration, transript_model
-        )
+        transript_model, msg = get_model(lang)
+        if TRANSCRIPTION_TYPE == "WHISPER":
+            msg_transcript, webvtt, all_text = main_whisper_transcript(
+                mp3filepath, duration, transript_model, lang
+            )
+        else:
+            msg_transcript, webvtt, all_text = start_main_transcript(
+                mp3filepath, duration, transript_model
+            )
+        msg += msg_transcript
     if DEBUG:
         print(msg)
         print(webvtt)
@@ -121,19 +256,26 @@ def start_main_transcript(mp3filepath, duration, transript_model):
     return msg, webvtt, all_text
 
 
-def convert_samplerate(audio_path, desired_sample_rate, trim_start, duration):
-    """Convert audio to subaudio and add good sample rate."""
-    sox_cmd = "sox {} --type raw --bits 16 --channels 1 --rate {} ".format(
+def get_audio_windows(audio_path, desired_sample_rate, window_duration, overlap=0):
+    """
+    Decode the audio once and yield it by windows of window_duration seconds.
+
+    Each window also contains the overlap seconds of audio following it.
+
+    Yields:
+        tuple: the start time in seconds and the 16-bit PCM samples of the window.
+    """
+    # -V1: only the errors are written on stderr
+    sox_cmd = "sox -V1 {} --type raw --bits 16 --channels 1 --rate {} ".format(
         quote(audio_path), desired_sample_rate
     )
     sox_cmd += "--encoding signed-integer --endian little --compression 0.0 "
-    sox_cmd += "--no-dither - trim {} {}".format(trim_start, duration)
+    sox_cmd += "--no-dither -"
 
     try:
-        output = subprocess.check_output(shlex.split(sox_cmd), stderr=subprocess.PIPE)
-
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError("SoX returned non-zero status: {}".format(e.stderr))
+        process = subprocess.Popen(
+            shlex.split(sox_cmd), stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
     except OSError as e:
         raise OSError(
             e.errno,
@@ -141,11 +283,22 @@ def convert_samplerate(audio_path, desired_sample_rate, trim_start, duration):
                 desired_sample_rate, e.strerror
             ),
         )
-
-    if TRANSCRIPTION_TYPE == "WHISPER":
-        return np.frombuffer(output, np.int16).flatten().astype(np.float32) / 32768.0
-    else:
-        return np.frombuffer(output, np.int16)
+    # 2 bytes by sample
+    window_size = int(window_duration * desired_sample_rate) * 2
+    overlap_size = int(overlap * desired_sample_rate) * 2
+    with process:
+        start_time = 0
+        data = process.stdout.read(window_size + overlap_size)
+        while len(data) > 1:
+            yield start_time, np.frombuffer(data[: len(data) // 2 * 2], np.int16)
+            more_data = process.stdout.read(window_size)
+            if len(data) < window_size + overlap_size or len(more_data) == 0:
+                break
+            data = data[window_size:] + more_data
+            start_time += window_duration
+        errors = process.stderr.read()
+    if process.returncode != 0:
+        raise RuntimeError("SoX returned non-zero status: {}".format(errors))
 
 
 def normalize_mp3(mp3filepath):
@@ -177,36 +330,11 @@ def normalize_mp3(mp3filepath):
 # #################################
 
 
-def convert_vosk_samplerate(audio_path, desired_sample_rate, trim_start, duration):
-    """Convert audio to the good sample rate."""
-    sox_cmd = "sox {} --type raw --bits 16 --channels 1 --rate {} ".format(
-        quote(audio_path), desired_sample_rate
-    )
-    sox_cmd += "--encoding signed-integer --endian little --compression 0.0 "
-    sox_cmd += "--no-dither - trim {} {}".format(trim_start, duration)
-
-    try:
-        output = subprocess.Popen(shlex.split(sox_cmd), stdout=subprocess.PIPE)
-
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError("SoX returned non-zero status: {}".format(e.stderr))
-    except OSError as e:
-        raise OSError(
-            e.errno,
-            "SoX not found, use {}hz files or install it: {}".format(
-                desired_sample_rate, e.strerror
-            ),
-        )
-    return output
-
-
 def get_word_result_from_data(results, audio, rec):
-    """Get subsound from audio and add transcription to result parameter."""
-    while True:
-        data = audio.stdout.read(4000)
-        if len(data) == 0:
-            break
-        if rec.AcceptWaveform(data):
+    """Give the audio samples to the recognizer and add its results to results."""
+    data = audio.tobytes()
+    for index in range(0, len(data), 4000):
+        if rec.AcceptWaveform(data[index : index + 4000]):
             results.append(rec.Result())
     results.append(rec.Result())
 
@@ -285,6 +413,29 @@ def words_to_vtt(
     return all_text, webvtt
 
 
+def get_vosk_window_captions(transript_model, start_trim, audio):
+    """
+    Vosk transcription of an audio window.
+
+    Returns:
+        list: the (start, end, text) captions of the window, times in seconds.
+    """
+    rec = KaldiRecognizer(transript_model, 16000)
+    rec.SetWords(True)
+    results = []
+    get_word_result_from_data(results, audio, rec)
+    captions = []
+    for res in results:
+        words = json.loads(res).get("result")
+        text = json.loads(res).get("text")
+        if not words:
+            continue
+        captions.append(
+            (start_trim + words[0]["start"], start_trim + words[-1]["end"], text)
+        )
+    return captions
+
+
 def main_vosk_transcript(norm_mp3_file, duration, transript_model):
     """Vosk transcription."""
     msg = ""
@@ -292,49 +443,14 @@ def main_vosk_transcript(norm_mp3_file, duration, transript_model):
     msg += "\nInference start %0.3fs." % inference_start
     desired_sample_rate = 16000
 
-    rec = KaldiRecognizer(transript_model, desired_sample_rate)
-    rec.SetWords(True)
-
     webvtt = WebVTT()
     all_text = ""
-    for start_trim in range(0, duration, TRANSCRIPTION_AUDIO_SPLIT_TIME):
-        audio = convert_vosk_samplerate(
-            norm_mp3_file,
-            desired_sample_rate,
-            start_trim,
-            TRANSCRIPTION_AUDIO_SPLIT_TIME,  # dur
-        )
+    for start_trim, audio in get_audio_windows(
+        norm_mp3_file, desired_sample_rate, TRANSCRIPTION_AUDIO_SPLIT_TIME
+    ):
         msg += "\nRunning inference."
-        results = []
-        get_word_result_from_data(results, audio, rec)
-        for res in results:
-            words = json.loads(res).get("result")
-            text = json.loads(res).get("text")
-            if not words:
-                continue
-            start_caption = words[0]["start"]
-            stop_caption = words[-1]["end"]
-            caption = Caption(
-                sec_to_timestamp(start_caption),
-                sec_to_timestamp(stop_caption),
-                text,
-            )
-            webvtt.captions.append(caption)
-            """
-            text_caption = []
-            is_first_caption = True
-            all_text, webvtt = words_to_vtt(
-                words,
-                start_trim,
-                duration,
-                is_first_caption,
-                text_caption,
-                start_caption,
-                last_word_added,
-                all_text,
-                webvtt,
-            )
-            """
+        captions = get_vosk_window_captions(transript_model, start_trim, audio)
+        all_text = add_window_captions(webvtt, captions, all_text)
     inference_end = timer() - inference_start
 
     msg += "\nInference took %0.3fs." % inference_end
@@ -351,33 +467,15 @@ def main_stt_transcript(norm_mp3_file, duration, transript_model):
     last_word_added = ""
     metadata = None
     all_text = ""
-    for start_trim in range(0, duration, TRANSCRIPTION_AUDIO_SPLIT_TIME):
-        end_trim = (
-            duration
-            if start_trim + TRANSCRIPTION_AUDIO_SPLIT_TIME > duration
-            else (
-                start_trim
-                + TRANSCRIPTION_AUDIO_SPLIT_TIME
-                + TRANSCRIPTION_STT_SENTENCE_MAX_LENGTH
-            )
-        )
-
-        dur = (
-            (TRANSCRIPTION_AUDIO_SPLIT_TIME + TRANSCRIPTION_STT_SENTENCE_MAX_LENGTH)
-            if (
-                (
-                    start_trim
-                    + TRANSCRIPTION_AUDIO_SPLIT_TIME
-                    + TRANSCRIPTION_STT_SENTENCE_MAX_LENGTH
-                )
-                < duration
-            )
-            else (duration - start_trim)
-        )
-
+    for start_trim, audio in get_audio_windows(
+        norm_mp3_file,
+        desired_sample_rate,
+        TRANSCRIPTION_AUDIO_SPLIT_TIME,
+        TRANSCRIPTION_STT_SENTENCE_MAX_LENGTH,
+    ):
+        dur = len(audio) / desired_sample_rate
+        end_trim = start_trim + dur
         msg += "\ntake audio from %s to %s - %s" % (start_trim, end_trim, dur)
-
-        audio = convert_samplerate(norm_mp3_file, desired_sample_rate, start_trim, dur)
         msg += "\nRunning inference."
 
         metadata = transript_model.sttWithMetadata(audio)
@@ -405,7 +503,22 @@ def main_stt_transcript(norm_mp3_file, duration, transript_model):
     return msg, webvtt, all_text
 
 
-def main_whisper_transcript(norm_mp3_file, duration, lang):
+def get_whisper_window_captions(model, start_trim, audio, lang):
+    """
+    Whisper transcription of an audio window.
+
+    Returns:
+        list: the (start, end, text) captions of the window, times in seconds.
+    """
+    audio = audio.astype(np.float32) / 32768.0
+    transcription = model.transcribe(audio, language=lang)
+    return [
+        (segment["start"] + start_trim, segment["end"] + start_trim, segment["text"])
+        for segment in transcription["segments"]
+    ]
+
+
+def main_whisper_transcript(norm_mp3_file, duration, model, lang):
     """Whisper transcription."""
     msg = ""
     all_text = ""
@@ -414,36 +527,84 @@ def main_whisper_transcript(norm_mp3_file, duration, lang):
     desired_sample_rate = 16000
     msg += "\nInference start %0.3fs." % inference_start
 
-    model = whisper.load_model(
-        TRANSCRIPTION_MODEL_PARAM[TRANSCRIPTION_TYPE][lang]["model"],
-        download_root=TRANSCRIPTION_MODEL_PARAM[TRANSCRIPTION_TYPE][lang][
-            "download_root"
-        ],
-    )
-
-    for start_trim in range(0, duration, TRANSCRIPTION_AUDIO_SPLIT_TIME):
+    for start_trim, audio in get_audio_windows(
+        norm_mp3_file, desired_sample_rate, TRANSCRIPTION_AUDIO_SPLIT_TIME
+    ):
         log.info("start_trim: " + str(start_trim))
-        audio = convert_samplerate(
-            norm_mp3_file,
-            desired_sample_rate,
-            start_trim,
-            TRANSCRIPTION_AUDIO_SPLIT_TIME,  # dur
-        )
-        transcription = model.transcribe(audio, language=lang)
+        captions = get_whisper_window_captions(model, start_trim, audio, lang)
         msg += "\nRunning inference."
-        for segment in transcription["segments"]:
-            caption = Caption(
-                sec_to_timestamp(segment["start"] + start_trim),
-                sec_to_timestamp(segment["end"] + start_trim),
-                segment["text"],
-            )
-            webvtt.captions.append(caption)
+        all_text = add_window_captions(webvtt, captions, all_text)
 
     inference_end = timer() - inference_start
     msg += "\nInference took %0.3fs." % inference_end
     return msg, webvtt, all_text
 
 
+def init_transcription_worker(lang):
+    """Load the model of the lang when a transcription worker process starts."""
+    get_model(lang)
+
+
+def transcript_window(lang, start_trim, audio):
+    """Transcript an audio window in a transcription worker process."""
+    transript_model, msg = get_model(lang)
+    if TRANSCRIPTION_TYPE == "WHISPER":
+        return get_whisper_window_captions(transript_model, start_trim, audio, lang)
+    return get_vosk_window_captions(transript_model, start_trim, audio)
+
+
+def main_parallel_transcript(norm_mp3_file, lang):
+    """
+    Vosk or Whisper transcription of the audio windows in parallel.
+
+    Each of the TRANSCRIPTION_WORKERS processes loads its own model,
+    the captions are added in the order of the windows.
+    """
+    msg = ""
+    all_text = ""
+    webvtt = WebVTT()
+    inference_start = timer()
+    desired_sample_rate = 16000
+    msg += "\nInference start %0.3fs." % inference_start
+    msg += "\nRunning inference on %s workers." % TRANSCRIPTION_WORKERS
+
+    # billiard pools can be started by the daemon processes of Celery workers.
+    # The workers are spawned: a fork would copy the locks held by the threads
+    # of this process (model warm up, index updates) and could wait on them forever.
+    with get_context("spawn").Pool(
+        TRANSCRIPTION_WORKERS, initializer=init_transcription_worker, initargs=(lang,)
+    ) as pool:
+        # only a few windows are decoded in advance to bound the memory used
+        pending = deque()
+        for start_trim, audio in get_audio_windows(
+            norm_mp3_file, desired_sample_rate, TRANSCRIPTION_AUDIO_SPLIT_TIME
+        ):
+            pending.append(pool.apply_async(transcript_window, (lang, start_trim, audio)))
+            if len(pending) > TRANSCRIPTION_WORKERS:
+                all_text = add_window_captions(webvtt, pending.popleft().get(), all_text)
+        while pending:
+            all_text = add_window_captions(webvtt, pending.popleft().get(), all_text)
+
+    inference_end = timer() - inference_start
+    msg += "\nInference took %0.3fs." % inference_end
+    return msg, webvtt, all_text
+
+
+def add_window_captions(webvtt, captions, all_text):
+    """Add the captions of a window to webvtt, avoiding overlaps with the previous."""
+    for start_caption, stop_caption, text in captions:
+        change_previous_end_caption(webvtt, start_caption)
+        webvtt.captions.append(
+            Caption(
+                sec_to_timestamp(start_caption),
+                sec_to_timestamp(stop_caption),
+                text,
+            )
+        )
+        all_text += text + " "
+    return all_text
+
+
 def change_previous_end_caption(webvtt, start_caption):
     """Change the end time for caption."""
     if len(webvtt.captions) > 0:
@@ -2,6 +2,7 @@
 # pip3 install webvtt-py
 # pip3 install redis==4.5.4
 from celery import Celery
+from celery.signals import worker_process_init
 from tempfile import NamedTemporaryFile
 import logging
 import os
@@ -28,6 +29,14 @@ transcripting_app.conf.task_routes = {
 transcripting_app.autodiscover_tasks(packages=None, related_name="", force=False)
 
 
+@worker_process_init.connect
+def warm_up_transcription_models(**kwargs):
+    """Load the transcription models when a worker process starts."""
+    from .transcript_model import start_warm_up_models
+
+    start_warm_up_models()
+
+
 # celery \
 # -A pod.video_encode_transcript.transcripting_tasks worker \
 # -l INFO -Q transcripting
@@ -5,15 +5,15 @@ from django.utils import translation
 from pod.video.models import Video
 from django.conf import settings
 from pod.video.context_processors import get_available_videos
-from pod.video_search.utils import index_es, delete_es
-from pod.video_search.utils import delete_index_es, create_index_es
+from pod.video_search.utils import index_es, delete_es, reindex_es
+from pod.video_search.utils import pop_retry_ids, update_index_es
 import time
 
 
 class Command(BaseCommand):
     """Indexes all or specified video in Elasticsearch."""
 
-    args = "--all or -id <video_id video_id ...>"
+    args = "--all or --retry or -id <video_id video_id ...>"
     help = "Indexes the specified video in Elasticsearch."
 
     def add_arguments(self, parser):
@@ -25,22 +25,20 @@ class Command(BaseCommand):
             dest="all",
             help="index all video",
         )
+        parser.add_argument(
+            "--retry",
+            action="store_true",
+            dest="retry",
+            help="update the videos whose index update failed",
+        )
 
     def handle(self, *args, **options):
         """Handle an index_videos command call."""
         translation.activate(settings.LANGUAGE_CODE)
         if options["all"]:
-            delete_index_es()
-            time.sleep(10)
-            create_index_es()
-            time.sleep(10)
-            iteration = 0
-            videos = get_available_videos()
-            for video in videos:
-                if iteration % 1000 == 0:
-                    time.sleep(10)
-                iteration += 1
-                index_es(video)
+            self.index_all()
+        elif options["retry"]:
+            self.retry()
         elif options["video_id"]:
             for video_id in options["video_id"]:
                 self.manage_es(video_id)
@@ -52,6 +50,36 @@ class Command(BaseCommand):
             )
         translation.deactivate()
 
+    def index_all(self):
+        """Index all available videos in a new index replacing the current one."""
+        start = time.perf_counter()
+        result = reindex_es(get_available_videos())
+        if result is None:
+            self.stdout.write(self.style.ERROR("Unable to create the new index"))
+            return
+        nb_indexed, nb_errors = result
+        duration = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                "%s videos indexed in %.1fs (%.1f documents/s)"
+                % (nb_indexed, duration, nb_indexed / duration)
+            )
+        )
+        if nb_errors:
+            self.stdout.write(self.style.ERROR("%s videos not indexed" % nb_errors))
+
+    def retry(self):
+        """Update the videos of the retry file in ES."""
+        video_ids = pop_retry_ids()
+        failed_ids = update_index_es(video_ids, []) if video_ids else []
+        self.stdout.write(
+            self.style.SUCCESS("%s videos updated" % (len(video_ids) - len(failed_ids)))
+        )
+        if failed_ids:
+            self.stdout.write(
+                self.style.ERROR("%s videos to update again" % len(failed_ids))
+            )
+
     def manage_es(self, video_id):
         """Index or delete a video in ES."""
         try:
@@ -0,0 +1,172 @@
+"""Unit tests for Esup-Pod video_search utils."""
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
+
+from pod.chapter.models import Chapter
+from pod.completion.models import Contributor
+from pod.video.models import Channel, Discipline, Theme, Type, Video
+from pod.video_search import utils
+from pod.video_search.utils import get_videos_to_index, reindex_es
+from pod.video_search.utils import queue_index_es, flush_index_queue
+from pod.video_search.utils import update_index_es, pop_retry_ids
+
+import json
+import os
+import tempfile
+
+
+class BulkIndexTestCase(TestCase):
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def setUp(self):
+        """Create videos with the relations sent to the index."""
+        user = User.objects.create(username="pod")
+        channel = Channel.objects.create(title="ChannelTest1")
+        theme = Theme.objects.create(title="Theme1", slug="blabla", channel=channel)
+        discipline = Discipline.objects.create(title="Discipline1")
+        for index in range(6):
+            video = Video.objects.create(
+                title="Video%s" % index,
+                owner=user,
+                video="test%s.mp4" % index,
+                type=Type.objects.get(id=1),
+                duration=20,
+                tags="tag%s common" % index,
+            )
+            video.channel.add(channel)
+            video.theme.add(theme)
+            video.discipline.add(discipline)
+            Contributor.objects.create(video=video, name="contributor", role="actor")
+            Chapter.objects.create(video=video, title="Chapter", time_start=1)
+
+    def get_documents(self, videos):
+        """Get the documents of the videos and the number of queries."""
+        with CaptureQueriesContext(connection) as queries:
+            documents = {
+                video.id: json.loads(video.get_json_to_index(tags))
+                for video, tags in get_videos_to_index(videos)
+            }
+        return documents, len(queries)
+
+    def test_get_videos_to_index(self):
+        """Test that the documents are the same, read in a constant number of queries."""
+        documents, nb_queries = self.get_documents(Video.objects.all())
+        self.assertEqual(len(documents), 6)
+        for video in Video.objects.all():
+            self.assertEqual(documents[video.id], json.loads(video.get_json_to_index()))
+        self.assertEqual(documents[video.id]["tags"][0]["slug"], "common")
+        small_documents, small_nb_queries = self.get_documents(
+            Video.objects.filter(title__in=["Video1", "Video2"])
+        )
+        self.assertEqual(len(small_documents), 2)
+        self.assertEqual(nb_queries, small_nb_queries)
+        with mock.patch.object(utils, "ES_BULK_CHUNK_SIZE", 4):
+            documents, chunk_nb_queries = self.get_documents(Video.objects.all())
+        self.assertEqual(len(documents), 6)
+        self.assertLess(chunk_nb_queries, 2 * nb_queries)
+        print(" --->  test_get_videos_to_index of BulkIndexTestCase: OK!")
+
+    @mock.patch.object(utils, "ES_BULK_CHUNK_SIZE", 4)
+    @mock.patch.object(utils, "get_es_client")
+    @mock.patch.object(utils, "create_index_es", return_value={"acknowledged": True})
+    @mock.patch.object(
+        utils, "bulk", side_effect=lambda es, actions, **kwargs: (len(actions), [])
+    )
+    def test_reindex(self, bulk, create_index_es, get_es_client):
+        """Test that the videos are indexed in a new index replacing the old one."""
+        es = get_es_client.return_value
+        es.indices.exists_alias.return_value = True
+        es.indices.get_alias.return_value = {"pod_20230101000000": {}}
+        self.assertEqual(reindex_es(Video.objects.all()), (6, 0))
+        self.assertEqual(bulk.call_count, 2)
+        index = create_index_es.call_args[0][0]
+        self.assertTrue(index.startswith("pod_"))
+        es.indices.refresh.assert_called_once_with(index=index)
+        es.indices.update_aliases.assert_called_once_with(
+            body={
+                "actions": [
+                    {"remove": {"index": "pod_20230101000000", "alias": "pod"}},
+                    {"add": {"index": index, "alias": "pod"}},
+                ]
+            }
+        )
+        es.indices.delete.assert_called_once_with(
+            index="pod_20230101000000", ignore=[404]
+        )
+        print(" --->  test_reindex of BulkIndexTestCase: OK!")
+
+
+class IndexQueueTestCase(TestCase):
+    fixtures = [
+        "initial_data.json",
+    ]
+
+    def setUp(self):
+        """Create a published video and a draft video."""
+        user = User.objects.create(username="pod")
+        self.video = Video.objects.create(
+            title="Video1",
+            owner=user,
+            video="test1.mp4",
+            type=Type.objects.get(id=1),
+            is_draft=False,
+        )
+        self.draft = Video.objects.create(
+            title="Video2", owner=user, video="test2.mp4", type=Type.objects.get(id=1)
+        )
+        flush_timer = utils.index_queue_timer
+        if flush_timer:
+            flush_timer.cancel()
+        utils.index_queue_timer = None
+        utils.index_queue.clear()
+
+    @mock.patch.object(utils, "update_index_es")
+    @mock.patch.object(utils.threading, "Timer")
+    def test_queue_coalescing(self, timer, update_index_es):
+        """Test that the saves of a video are sent in one update."""
+        for i in range(3):
+            queue_index_es(self.video.id)
+        queue_index_es(self.draft.id)
+        queue_index_es(self.draft.id, delete=True)
+        timer.assert_called_once()
+        flush_index_queue()
+        update_index_es.assert_called_once_with([self.video.id], [self.draft.id])
+        self.assertIsNone(utils.index_queue_timer)
+        print(" --->  test_queue_coalescing of IndexQueueTestCase: OK!")
+
+    @mock.patch.object(utils, "get_es_client")
+    @mock.patch.object(utils, "bulk")
+    def test_update_index(self, bulk, get_es_client):
+        """Test the bulk actions and that failed updates are saved."""
+        bulk.return_value = (
+            1,
+            [
+                {"index": {"_id": str(self.video.id), "status": 429}},
+                {"delete": {"_id": "1000", "status": 404}},
+            ],
+        )
+        with tempfile.TemporaryDirectory() as retry_dir:
+            retry_file = os.path.join(retry_dir, "es_retry.log")
+            with mock.patch.object(utils, "ES_RETRY_FILE", retry_file):
+                update_index_es([self.video.id, self.draft.id], [1000])
+                actions = bulk.call_args[0][1]
+                self.assertEqual(
+                    sorted(
+                        (action["_id"], action.get("_op_type", "index"))
+                        for action in actions
+                    ),
+                    [
+                        (self.video.id, "index"),
+                        (self.draft.id, "delete"),
+                        (1000, "delete"),
+                    ],
+                )
+                self.assertEqual(pop_retry_ids(), [self.video.id])
+                self.assertEqual(pop_retry_ids(), [])
+        print(" --->  test_update_index of IndexQueueTestCase: OK!")
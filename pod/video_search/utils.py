@@ -1,10 +1,18 @@
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, DatabaseError
 from elasticsearch import Elasticsearch
 from elasticsearch.exceptions import TransportError
-from django.utils import translation
+from elasticsearch.helpers import bulk
+from django.utils import timezone, translation
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from itertools import islice
 
 import json
 import logging
+import os
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -16,91 +24,113 @@ ES_TIMEOUT = getattr(settings, "ES_TIMEOUT", 30)
 ES_MAX_RETRIES = getattr(settings, "ES_MAX_RETRIES", 10)
 ES_VERSION = getattr(settings, "ES_VERSION", 6)
 ES_OPTIONS = getattr(settings, "ES_OPTIONS", {})
+# number of videos read from the database and sent in each bulk request
+ES_BULK_CHUNK_SIZE = getattr(settings, "ES_BULK_CHUNK_SIZE", 500)
+# number of bulk requests sent in parallel
+ES_BULK_THREADS = getattr(settings, "ES_BULK_THREADS", 4)
+# the saves of a video during this number of seconds are sent in one update
+ES_INDEX_DELAY = getattr(settings, "ES_INDEX_DELAY", 2)
+# send the updates of the index with a Celery task
+CELERY_TO_INDEX = getattr(settings, "CELERY_TO_INDEX", False)
+# the id of the videos whose update failed, read by index_videos --retry
+ES_RETRY_FILE = getattr(
+    settings,
+    "ES_RETRY_FILE",
+    os.path.join(getattr(settings, "LOG_DIRECTORY", ""), "es_retry.log"),
+)
 
+es_client = None
+es_client_lock = threading.Lock()
 
-def index_es(video):
-    translation.activate(settings.LANGUAGE_CODE)
-    es = Elasticsearch(
-        ES_URL,
-        timeout=ES_TIMEOUT,
-        max_retries=ES_MAX_RETRIES,
-        retry_on_timeout=True,
-        **ES_OPTIONS,
-    )
-    if es.ping():
-        try:
-            data = video.get_json_to_index()
-            if data != "{}":
-                if ES_VERSION in [7, 8]:
-                    res = es.index(index=ES_INDEX, id=video.id, body=data, refresh=True)
-                else:
-                    res = es.index(
-                        index=ES_INDEX,
-                        id=video.id,
-                        doc_type="pod",
-                        body=data,
-                        refresh=True,
-                    )
-                if DEBUG:
-                    logger.info(res)
-                return res
-        except TransportError as e:
-            logger.error(
-                "An error occured during index creation: %s-%s : %s"
-                % (e.status_code, e.error, e.info)
+# video id: True to index the video, False to delete it
+index_queue = {}
+index_queue_lock = threading.Lock()
+index_queue_timer = None
+
+
+def get_es_client():
+    """Get the Elasticsearch client of the process, its connections are pooled."""
+    global es_client
+    with es_client_lock:
+        if es_client is None:
+            es_client = Elasticsearch(
+                ES_URL,
+                timeout=ES_TIMEOUT,
+                max_retries=ES_MAX_RETRIES,
+                retry_on_timeout=True,
+                **ES_OPTIONS,
             )
-    translation.deactivate()
+        return es_client
 
 
-def delete_es(video):
-    """Delete an Elasticsearch entry."""
-    es = Elasticsearch(
-        ES_URL,
-        timeout=ES_TIMEOUT,
-        max_retries=ES_MAX_RETRIES,
-        retry_on_timeout=True,
-        **ES_OPTIONS,
-    )
-    if es.ping():
-        try:
+def index_es(video):
+    translation.activate(settings.LANGUAGE_CODE)
+    es = get_es_client()
+    try:
+        data = video.get_json_to_index()
+        if data != "{}":
             if ES_VERSION in [7, 8]:
-                delete = es.delete(
-                    index=ES_INDEX, id=video.id, refresh=True, ignore=[400, 404]
-                )
+                res = es.index(index=ES_INDEX, id=video.id, body=data, refresh=True)
             else:
-                delete = es.delete(
+                res = es.index(
                     index=ES_INDEX,
-                    doc_type="pod",
                     id=video.id,
+                    doc_type="pod",
+                    body=data,
                     refresh=True,
-                    ignore=[400, 404],
                 )
             if DEBUG:
-                logger.info(delete)
-            return delete
-        except TransportError as e:
-            logger.error(
-                "An error occured during delete video : %s-%s : %s"
-                % (e.status_code, e.error, e.info)
+                logger.info(res)
+            return res
+    except TransportError as e:
+        logger.error(
+            "An error occured during index creation: %s-%s : %s"
+            % (e.status_code, e.error, e.info)
+        )
+    translation.deactivate()
+
+
+def delete_es(video):
+    """Delete an Elasticsearch entry."""
+    es = get_es_client()
+    try:
+        if ES_VERSION in [7, 8]:
+            delete = es.delete(
+                index=ES_INDEX, id=video.id, refresh=True, ignore=[400, 404]
+            )
+        else:
+            delete = es.delete(
+                index=ES_INDEX,
+                doc_type="pod",
+                id=video.id,
+                refresh=True,
+                ignore=[400, 404],
             )
+        if DEBUG:
+            logger.info(delete)
+        return delete
+    except TransportError as e:
+        logger.error(
+            "An error occured during delete video : %s-%s : %s"
+            % (e.status_code, e.error, e.info)
+        )
 
 
-def create_index_es():
-    es = Elasticsearch(
-        ES_URL,
-        timeout=ES_TIMEOUT,
-        max_retries=ES_MAX_RETRIES,
-        retry_on_timeout=True,
-        **ES_OPTIONS,
-    )
+def get_index_template():
+    """Get the mapping and settings of the Pod index."""
     if ES_VERSION in [7, 8]:
         template_file = "pod/video_search/search_template7.json"
     else:
         template_file = "pod/video_search/search_template.json"
-    json_data = open(template_file)
-    es_template = json.load(json_data)
+    with open(template_file) as json_data:
+        return json.load(json_data)
+
+
+def create_index_es(index=ES_INDEX):
+    es = get_es_client()
+    es_template = get_index_template()
     try:
-        create = es.indices.create(index=ES_INDEX, body=es_template)  # ignore=[400, 404]
+        create = es.indices.create(index=index, body=es_template)  # ignore=[400, 404]
         logger.info(create)
         return create
     except TransportError as e:
@@ -116,15 +146,13 @@ def create_index_es():
 
 
 def delete_index_es():
-    es = Elasticsearch(
-        ES_URL,
-        timeout=ES_TIMEOUT,
-        max_retries=ES_MAX_RETRIES,
-        retry_on_timeout=True,
-        **ES_OPTIONS,
-    )
+    es = get_es_client()
     try:
-        delete = es.indices.delete(index=ES_INDEX)
+        index = ES_INDEX
+        if es.indices.exists_alias(name=ES_INDEX):
+            # ES_INDEX is the alias set by reindex_es
+            index = ",".join(es.indices.get_alias(name=ES_INDEX))
+        delete = es.indices.delete(index=index)
         logger.info(delete)
         return delete
     except TransportError as e:
@@ -133,3 +161,274 @@ def delete_index_es():
             " index video deletion: %s-%s : %s"
             % (e.status_code, e.error, e.info["error"]["reason"])
         )
+
+
+def get_tags_by_video(video_ids):
+    """Get the tag names of each video, sorted as by Tag.objects.get_for_object."""
+    from pod.video.models import Video
+    from tagging.models import TaggedItem
+
+    tags = {}
+    tagged_items = (
+        TaggedItem.objects.filter(
+            content_type=ContentType.objects.get_for_model(Video),
+            object_id__in=video_ids,
+        )
+        .order_by("tag__name")
+        .values_list("object_id", "tag__name")
+    )
+    for object_id, name in tagged_items:
+        tags.setdefault(object_id, []).append(name)
+    return tags
+
+
+def get_videos_to_index(videos):
+    """
+    Read the videos by chunks of ES_BULK_CHUNK_SIZE.
+
+    The relations used by get_json_to_index are read with a few queries by chunk.
+
+    Yields:
+        tuple: the video and the list of its tag names.
+    """
+    from pod.video.models import Video
+
+    video_ids = (
+        videos.order_by("id")
+        .values_list("id", flat=True)
+        .iterator(chunk_size=ES_BULK_CHUNK_SIZE)
+    )
+    # iterator() does not prefetch in Django 3.2, the chunks are read one by one
+    for chunk in iter(lambda: list(islice(video_ids, ES_BULK_CHUNK_SIZE)), []):
+        tags = get_tags_by_video(chunk)
+        chunk_videos = (
+            Video.objects.filter(id__in=chunk)
+            .select_related("owner", "type", "thumbnail")
+            .prefetch_related(
+                "discipline",
+                "channel",
+                "theme",
+                "contributor_set",
+                "chapter_set",
+                "overlay_set",
+            )
+        )
+        for video in chunk_videos:
+            yield video, tags.get(video.id, [])
+
+
+def get_index_actions(index, videos):
+    """Get the bulk actions indexing the videos, by chunks of ES_BULK_CHUNK_SIZE."""
+    actions = []
+    for video, tags in get_videos_to_index(videos):
+        data = video.get_json_to_index(tags)
+        if data == "{}":
+            continue
+        action = {"_index": index, "_id": video.id, "_source": data}
+        if ES_VERSION not in [7, 8]:
+            action["_type"] = "pod"
+        actions.append(action)
+        if len(actions) == ES_BULK_CHUNK_SIZE:
+            yield actions
+            actions = []
+    if actions:
+        yield actions
+
+
+def bulk_index_es(es, index, videos):
+    """
+    Index the videos with ES_BULK_THREADS bulk requests in parallel.
+
+    Returns:
+        tuple: the number of indexed videos and the number of errors.
+    """
+    nb_indexed = 0
+    nb_errors = 0
+
+    def get_result(future):
+        success, errors = future.result()
+        for error in errors:
+            logger.error("An error occured during bulk indexing: %s" % error)
+        return success, len(errors)
+
+    with ThreadPoolExecutor(max_workers=ES_BULK_THREADS) as executor:
+        # the database is read in this thread while the requests are sent
+        pending = deque()
+        for actions in get_index_actions(index, videos):
+            pending.append(
+                executor.submit(
+                    bulk, es, actions, raise_on_error=False, chunk_size=len(actions)
+                )
+            )
+            if len(pending) > ES_BULK_THREADS:
+                success, errors = get_result(pending.popleft())
+                nb_indexed += success
+                nb_errors += errors
+        while pending:
+            success, errors = get_result(pending.popleft())
+            nb_indexed += success
+            nb_errors += errors
+    return nb_indexed, nb_errors
+
+
+def swap_index_alias(es, index):
+    """Point the ES_INDEX alias on index in one request and delete the old indices."""
+    actions = [{"add": {"index": index, "alias": ES_INDEX}}]
+    old_indices = []
+    if es.indices.exists_alias(name=ES_INDEX):
+        old_indices = list(es.indices.get_alias(name=ES_INDEX))
+        actions = [
+            {"remove": {"index": old_index, "alias": ES_INDEX}}
+            for old_index in old_indices
+        ] + actions
+    elif es.indices.exists(index=ES_INDEX):
+        # index created by create_pod_index, replaced by the alias
+        actions.insert(0, {"remove_index": {"index": ES_INDEX}})
+    es.indices.update_aliases(body={"actions": actions})
+    for old_index in old_indices:
+        es.indices.delete(index=old_index, ignore=[404])
+
+
+def reindex_es(videos):
+    """
+    Index the videos in a new index then swap the ES_INDEX alias on it.
+
+    The search keeps using the previous index until the new one is complete.
+
+    Returns:
+        tuple: the number of indexed videos and the number of errors,
+        None if the new index can not be created.
+    """
+    es = get_es_client()
+    index = "%s_%s" % (ES_INDEX, timezone.now().strftime("%Y%m%d%H%M%S"))
+    if create_index_es(index) is None:
+        return None
+    # no refresh while indexing, only one at the end
+    es.indices.put_settings(index=index, body={"index": {"refresh_interval": "-1"}})
+    nb_indexed, nb_errors = bulk_index_es(es, index, videos)
+    es.indices.put_settings(index=index, body={"index": {"refresh_interval": None}})
+    es.indices.refresh(index=index)
+    swap_index_alias(es, index)
+    return nb_indexed, nb_errors
+
+
+def queue_index_es(video_id, delete=False):
+    """
+    Add a video in the queue of the index updates.
+
+    The queue is sent ES_INDEX_DELAY seconds after the first video is added,
+    a video saved several times in the meantime is updated once.
+    """
+    global index_queue_timer
+    with index_queue_lock:
+        index_queue[video_id] = not delete
+        if index_queue_timer is None:
+            index_queue_timer = threading.Timer(ES_INDEX_DELAY, flush_index_queue)
+            index_queue_timer.daemon = True
+            index_queue_timer.start()
+
+
+def flush_index_queue():
+    """Send the updates of the queue in a bulk request or a Celery task."""
+    global index_queue_timer
+    with index_queue_lock:
+        queue = dict(index_queue)
+        index_queue.clear()
+        index_queue_timer = None
+    index_ids = [video_id for video_id, index in queue.items() if index]
+    delete_ids = [video_id for video_id, index in queue.items() if not index]
+    if CELERY_TO_INDEX:
+        from pod.main.tasks import task_update_index
+
+        task_update_index.delay(index_ids, delete_ids)
+    else:
+        update_index_es(index_ids, delete_ids)
+        # this thread may have opened a database connection
+        connection.close()
+
+
+def get_delete_action(video_id):
+    """Get the bulk action deleting a video."""
+    action = {"_op_type": "delete", "_index": ES_INDEX, "_id": video_id}
+    if ES_VERSION not in [7, 8]:
+        action["_type"] = "pod"
+    return action
+
+
+def get_update_actions(index_ids, delete_ids):
+    """Get the bulk actions indexing or deleting the videos."""
+    from pod.video.models import Video
+
+    actions = [get_delete_action(video_id) for video_id in delete_ids]
+    found_ids = []
+    for video, tags in get_videos_to_index(Video.objects.filter(id__in=index_ids)):
+        found_ids.append(video.id)
+        data = video.get_json_to_index(tags)
+        if video.is_draft or video.encoding_in_progress or data == "{}":
+            actions.append(get_delete_action(video.id))
+            continue
+        action = {"_index": ES_INDEX, "_id": video.id, "_source": data}
+        if ES_VERSION not in [7, 8]:
+            action["_type"] = "pod"
+        actions.append(action)
+    # videos deleted since they were added in the queue
+    actions += [
+        get_delete_action(video_id) for video_id in index_ids if video_id not in found_ids
+    ]
+    return actions
+
+
+def update_index_es(index_ids, delete_ids):
+    """
+    Index or delete the videos in one bulk request.
+
+    The id of the videos that could not be updated are added to ES_RETRY_FILE.
+    """
+    translation.activate(settings.LANGUAGE_CODE)
+    failed_ids = []
+    try:
+        success, errors = bulk(
+            get_es_client(),
+            get_update_actions(index_ids, delete_ids),
+            raise_on_error=False,
+            refresh=True,
+        )
+        for error in errors:
+            op_type, result = list(error.items())[0]
+            # a deleted video may not be in the index
+            if op_type != "delete" or result.get("status") != 404:
+                logger.error("An error occured during index update: %s" % error)
+                failed_ids.append(result["_id"])
+    except TransportError as e:
+        logger.error(
+            "An error occured during index update: %s-%s : %s"
+            % (e.status_code, e.error, e.info)
+        )
+        failed_ids = index_ids + delete_ids
+    except DatabaseError as e:
+        logger.error("An error occured reading the videos to index: %s" % e)
+        failed_ids = index_ids + delete_ids
+    translation.deactivate()
+    if failed_ids:
+        add_retry_ids(failed_ids)
+    return failed_ids
+
+
+def add_retry_ids(video_ids):
+    """Add the id of the videos to update again in ES_RETRY_FILE."""
+    try:
+        with open(ES_RETRY_FILE, "a") as retry_file:
+            retry_file.write("".join("%s\n" % video_id for video_id in video_ids))
+    except OSError as e:
+        logger.error("Unable to save the videos %s to index again: %s" % (video_ids, e))
+
+
+def pop_retry_ids():
+    """Get the id of the videos to update again and empty ES_RETRY_FILE."""
+    try:
+        with open(ES_RETRY_FILE, "r+") as retry_file:
+            video_ids = {int(line) for line in retry_file if line.strip().isdigit()}
+            retry_file.truncate(0)
+        return sorted(video_ids)
+    except FileNotFoundError:
+        return []
@@ -1,8 +1,8 @@
 """Pod video_search views."""
 
 from django.shortcuts import render
-from elasticsearch import Elasticsearch
 from pod.video_search.forms import SearchForm
+from pod.video_search.utils import get_es_client
 from django.conf import settings
 from django.contrib import messages
 from pod.video.models import Video
@@ -11,12 +11,8 @@ from django.utils.html import strip_tags
 
 # import json
 
-ES_URL = getattr(settings, "ES_URL", ["http://127.0.0.1:9200/"])
 ES_INDEX = getattr(settings, "ES_INDEX", "pod")
-ES_TIMEOUT = getattr(settings, "ES_TIMEOUT", 30)
-ES_MAX_RETRIES = getattr(settings, "ES_MAX_RETRIES", 10)
 ES_VERSION = getattr(settings, "ES_VERSION", 6)
-ES_OPTIONS = getattr(settings, "ES_OPTIONS", {})
 
 
 def get_filter_search(selected_facets, start_date, end_date):
@@ -99,13 +95,7 @@ def get_search_page(request):
 
 def search_videos(request):
     """Send a search request to ES."""
-    es = Elasticsearch(
-        ES_URL,
-        timeout=ES_TIMEOUT,
-        max_retries=ES_MAX_RETRIES,
-        retry_on_timeout=True,
-        **ES_OPTIONS,
-    )
+    es = get_es_client()
     aggsAttrs = [
         "owner_full_name",
         "type.title",